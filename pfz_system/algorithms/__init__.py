@@ -22,7 +22,8 @@ try:
         PFZCalculator,
         PFZScore,
         PFZPrediction,
-        calculate_pfz
+        calculate_pfz,
+        get_calculator
     )
 except ImportError:
     from fronts import (
@@ -42,7 +43,8 @@ except ImportError:
         PFZCalculator,
         PFZScore,
         PFZPrediction,
-        calculate_pfz
+        calculate_pfz,
+        get_calculator
     )
 
 __all__ = [
@@ -62,4 +64,5 @@ __all__ = [
     "PFZScore",
     "PFZPrediction",
     "calculate_pfz",
+    "get_calculator",
 ]
@@ -12,15 +12,30 @@
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime
 from enum import Enum
 import logging
 
 import numpy as np
-import pandas as pd
 from scipy import ndimage
-from scipy.interpolate import griddata
+
+try:
+    from .kernels import (
+        bilinear_grid, normalize_grid, regular_grid,
+        haversine_km, haversine_a_rad, a_to_km, km_to_a,
+        label_regions, top_k_order, GRID_DTYPE
+    )
+except ImportError:
+    from kernels import (
+        bilinear_grid, normalize_grid, regular_grid,
+        haversine_km, haversine_a_rad, a_to_km, km_to_a,
+        label_regions, top_k_order, GRID_DTYPE
+    )
+
+# pandas 僅用於型別標註，執行時不需載入
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -90,11 +105,38 @@ class Eddy:
 
 @dataclass
 class EddyDetectionResult:
-    """渦旋檢測結果"""
+    """
+    渦旋檢測結果
+    
+    除 eddies 列表外，另以 SoA 陣列保存各渦旋屬性供批次評分。
+    """
     eddies: List[Eddy]
     sla_field: np.ndarray
     detection_time: datetime = field(default_factory=datetime.utcnow)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    center_lats: np.ndarray = field(init=False, repr=False, compare=False)
+    center_lons: np.ndarray = field(init=False, repr=False, compare=False)
+    radii_km: np.ndarray = field(init=False, repr=False, compare=False)
+    intensities: np.ndarray = field(init=False, repr=False, compare=False)
+    is_cyclonic: np.ndarray = field(init=False, repr=False, compare=False)
+    center_lats_rad: np.ndarray = field(init=False, repr=False, compare=False)
+    center_lons_rad: np.ndarray = field(init=False, repr=False, compare=False)
+    cos_center_lats: np.ndarray = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """建立 SoA 陣列"""
+        count = len(self.eddies)
+        
+        self.center_lats = np.fromiter((e.center_lat for e in self.eddies), float, count)
+        self.center_lons = np.fromiter((e.center_lon for e in self.eddies), float, count)
+        self.radii_km = np.fromiter((e.radius_km for e in self.eddies), float, count)
+        self.intensities = np.fromiter((e.intensity for e in self.eddies), float, count)
+        self.is_cyclonic = np.fromiter((e.is_cyclonic for e in self.eddies), bool, count)
+        
+        # 預先計算中心點三角函數，供重複評分使用
+        self.center_lats_rad = np.radians(self.center_lats)
+        self.center_lons_rad = np.radians(self.center_lons)
+        self.cos_center_lats = np.cos(self.center_lats_rad)
     
     @property
     def cyclonic_count(self) -> int:
@@ -131,7 +173,8 @@ class EddyDetector:
         ssh_threshold: float = 0.05,
         min_radius_km: float = 50.0,
         max_radius_km: float = 300.0,
-        resolution_km: float = 10.0
+        resolution_km: float = 10.0,
+        top_k: Optional[int] = None
     ):
         """
         初始化渦旋檢測器
@@ -141,15 +184,17 @@ class EddyDetector:
             min_radius_km: 最小渦旋半徑 (km)
             max_radius_km: 最大渦旋半徑 (km)
             resolution_km: 數據分辨率 (km)
+            top_k: 只保留強度最高的前 K 個渦旋，None 表示全部保留
         """
         self.ssh_threshold = ssh_threshold
         self.min_radius_km = min_radius_km
         self.max_radius_km = max_radius_km
         self.resolution_km = resolution_km
+        self.top_k = top_k
     
     def detect_from_dataframe(
         self,
-        ssh_data: pd.DataFrame,
+        ssh_data: "pd.DataFrame",
         lat_col: str = "lat",
         lon_col: str = "lon",
         ssh_col: str = "ssh"
@@ -160,30 +205,33 @@ class EddyDetector:
         Args:
             ssh_data: SSH 數據 DataFrame
             lat_col, lon_col, ssh_col: 列名
-            
+        
         Returns:
             EddyDetectionResult
         """
         if ssh_data.empty:
             return EddyDetectionResult(eddies=[], sla_field=np.array([]))
         
-        df = ssh_data.copy()
+        lat = ssh_data[lat_col].to_numpy(dtype=np.float64)
+        lon = ssh_data[lon_col].to_numpy(dtype=np.float64)
+        ssh = ssh_data[ssh_col].to_numpy(dtype=GRID_DTYPE)
         
-        # 計算 SLA
-        mean_ssh = df[ssh_col].mean()
-        df["sla"] = df[ssh_col] - mean_ssh
+        # 計算 SLA (忽略缺值樣本)
+        valid = ~np.isnan(ssh)
+        sla = ssh[valid] - ssh[valid].mean()
         
         # 創建規則網格
-        lats = np.sort(df[lat_col].unique())
-        lons = np.sort(df[lon_col].unique())
+        lats = np.unique(lat)
+        lons = np.unique(lon)
         
-        grid_lat, grid_lon = np.meshgrid(lats, lons, indexing='ij')
+        # 已是完整規則網格時直接重排
+        sla_grid = regular_grid(lat[valid], lon[valid], sla, lats, lons)
         
-        points = df[[lat_col, lon_col]].values
-        values = df["sla"].values
-        
-        sla_grid = griddata(points, values, (grid_lat, grid_lon), method='linear')
-        sla_grid = np.nan_to_num(sla_grid, nan=0)
+        if sla_grid is None:
+            sla_sum, wsum = bilinear_grid(lat[valid], lon[valid], sla, lats, lons)
+            
+            # 無樣本格點填 0
+            sla_grid = normalize_grid(sla_sum, wsum, fill_value=0.0)
         
         lat_range = (lats.min(), lats.max())
         lon_range = (lons.min(), lons.max())
@@ -203,10 +251,12 @@ class EddyDetector:
             sla_grid: 2D SLA 網格
             lat_range: 緯度範圍
             lon_range: 經度範圍
-            
+        
         Returns:
             EddyDetectionResult
         """
+        sla_grid = np.asarray(sla_grid, dtype=GRID_DTYPE)
+        
         eddies = []
         nrows, ncols = sla_grid.shape
         
@@ -217,45 +267,35 @@ class EddyDetector:
         lon_step = (lon_range[1] - lon_range[0]) / max(1, ncols - 1)
         
         # 檢測反氣旋渦旋 (正 SLA)
-        anticyclonic_mask = sla_grid > self.ssh_threshold
-        labeled_ac, num_ac = ndimage.label(anticyclonic_mask)
-        
-        for label_id in range(1, num_ac + 1):
-            eddy = self._extract_eddy(
-                sla_grid, labeled_ac == label_id,
-                lat_range, lon_range, lat_step, lon_step,
-                EddyType.ANTICYCLONIC
-            )
-            if eddy:
-                eddies.append(eddy)
+        eddies.extend(self._extract_eddies(
+            sla_grid, sla_grid > self.ssh_threshold,
+            lat_range, lon_range, lat_step, lon_step,
+            EddyType.ANTICYCLONIC
+        ))
         
         # 檢測氣旋渦旋 (負 SLA)
-        cyclonic_mask = sla_grid < -self.ssh_threshold
-        labeled_c, num_c = ndimage.label(cyclonic_mask)
-        
-        for label_id in range(1, num_c + 1):
-            eddy = self._extract_eddy(
-                sla_grid, labeled_c == label_id,
-                lat_range, lon_range, lat_step, lon_step,
-                EddyType.CYCLONIC
-            )
-            if eddy:
-                eddies.append(eddy)
+        eddies.extend(self._extract_eddies(
+            sla_grid, sla_grid < -self.ssh_threshold,
+            lat_range, lon_range, lat_step, lon_step,
+            EddyType.CYCLONIC
+        ))
         
-        # 按強度排序
-        eddies.sort(key=lambda e: e.intensity, reverse=True)
+        # 按強度排序並保留前 K 個
+        intensities = np.fromiter((e.intensity for e in eddies), float, len(eddies))
+        order = top_k_order(intensities, self.top_k)
         
         return EddyDetectionResult(
-            eddies=eddies,
+            eddies=[eddies[i] for i in order],
             sla_field=sla_grid,
             metadata={
                 "threshold_m": self.ssh_threshold,
+                "detected_count": len(eddies),
                 "lat_range": lat_range,
                 "lon_range": lon_range
             }
         )
     
-    def _extract_eddy(
+    def _extract_eddies(
         self,
         sla_grid: np.ndarray,
         mask: np.ndarray,
@@ -264,129 +304,158 @@ class EddyDetector:
         lat_step: float,
         lon_step: float,
         eddy_type: EddyType
-    ) -> Optional[Eddy]:
+    ) -> List[Eddy]:
         """
         從標記區域提取渦旋信息
+        
+        以標記統計一次取得所有區域的面積、質心與極值，
+        避免逐一建立區域遮罩；遮罩全為 False 時直接返回。
         """
-        coords = np.argwhere(mask)
+        # 無候選像素時略過標記
+        if not mask.any():
+            return []
         
-        if len(coords) < 4:  # 太小
-            return None
+        # 標記並取得面積與質心
+        labeled, num_labels, area_pixels, centers = label_regions(mask)
         
-        # 計算中心 (質心)
-        center_row = coords[:, 0].mean()
-        center_col = coords[:, 1].mean()
+        if num_labels == 0:
+            return []
         
-        center_lat = lat_range[0] + center_row * lat_step
-        center_lon = lon_range[0] + center_col * lon_step
+        index = np.arange(1, num_labels + 1)
         
         # 估算半徑
-        area_pixels = len(coords)
         pixel_area = lat_step * lon_step * 111**2  # 約 km²
-        area_km2 = area_pixels * pixel_area
-        radius_km = np.sqrt(area_km2 / np.pi)
-        
-        if radius_km < self.min_radius_km or radius_km > self.max_radius_km:
-            return None
-        
-        # 提取 SLA 值
-        sla_values = sla_grid[mask]
+        radii_km = np.sqrt(area_pixels * pixel_area / np.pi)
         
+        # 提取 SLA 極值
         if eddy_type == EddyType.ANTICYCLONIC:
-            ssh_anomaly = float(np.max(sla_values))
+            anomalies = ndimage.maximum(sla_grid, labeled, index)
         else:
-            ssh_anomaly = float(np.min(sla_values))
-        
-        # 計算強度 (基於 SLA 和大小)
-        intensity = min(100, abs(ssh_anomaly) * 500 + radius_km * 0.2)
-        
-        return Eddy(
-            eddy_type=eddy_type,
-            center_lat=center_lat,
-            center_lon=center_lon,
-            radius_km=radius_km,
-            ssh_anomaly=ssh_anomaly,
-            intensity=intensity
+            anomalies = ndimage.minimum(sla_grid, labeled, index)
+        
+        # 過濾太小或超出半徑範圍的區域
+        keep = (
+            (area_pixels >= 4)
+            & (radii_km >= self.min_radius_km)
+            & (radii_km <= self.max_radius_km)
         )
+        
+        eddies = []
+        
+        for (center_row, center_col), radius_km, ssh_anomaly in zip(
+            centers[keep], radii_km[keep], anomalies[keep]
+        ):
+            # 計算強度 (基於 SLA 和大小)
+            intensity = min(100.0, abs(ssh_anomaly) * 500 + radius_km * 0.2)
+            
+            eddies.append(Eddy(
+                eddy_type=eddy_type,
+                center_lat=float(lat_range[0] + center_row * lat_step),
+                center_lon=float(lon_range[0] + center_col * lon_step),
+                radius_km=float(radius_km),
+                ssh_anomaly=float(ssh_anomaly),
+                intensity=float(intensity)
+            ))
+        
+        return eddies
     
     def get_eddy_score(
         self,
-        lat: float,
-        lon: float,
-        eddies: List[Eddy],
+        lat: Union[float, np.ndarray],
+        lon: Union[float, np.ndarray],
+        eddies: Union[List[Eddy], EddyDetectionResult],
         fishing_preference: str = "edge"
-    ) -> float:
+    ) -> Union[float, np.ndarray]:
         """
         計算位置的渦旋分數
         
         Args:
-            lat, lon: 位置座標
-            eddies: 渦旋列表
+            lat, lon: 位置座標 (可傳入陣列批次計算)
+            eddies: 渦旋列表，或 EddyDetectionResult (直接使用其 SoA 陣列)
             fishing_preference: 偏好位置
                 - "edge": 渦旋邊緣 (鋒面、餌料)
                 - "center": 渦旋中心 (大型魚)
                 - "cyclonic": 氣旋渦旋優先
                 - "anticyclonic": 反氣旋優先
-                
+        
         Returns:
-            渦旋分數 (0-100)
+            渦旋分數 (0-100)，陣列輸入時回傳同形狀陣列
         """
-        if not eddies:
-            return 0.0
+        query_lat = np.asarray(lat, dtype=np.float64)
+        query_lon = np.asarray(lon, dtype=np.float64)
+        
+        if not isinstance(eddies, EddyDetectionResult):
+            eddies = EddyDetectionResult(eddies=eddies, sla_field=np.array([]))
+        
+        if len(eddies.radii_km) == 0:
+            return 0.0 if query_lat.ndim == 0 else np.zeros(query_lat.shape)
+        
+        radii = eddies.radii_km
+        intensities = eddies.intensities
+        is_cyclonic = eddies.is_cyclonic
+        
+        # 查詢點三角函數每批次只算一次
+        query_lat_rad = np.radians(query_lat)[..., None]
+        query_lon_rad = np.radians(query_lon)[..., None]
         
-        best_score = 0.0
+        # 計算到各渦旋中心的 Haversine 中間量 (查詢點 x 渦旋)
+        a = haversine_a_rad(
+            query_lat_rad, query_lon_rad, np.cos(query_lat_rad),
+            eddies.center_lats_rad, eddies.center_lons_rad,
+            eddies.cos_center_lats
+        )
         
-        for eddy in eddies:
-            # 計算到渦旋中心的距離
-            dist_km = self._haversine(
-                lat, lon,
-                eddy.center_lat, eddy.center_lon
+        # 超出影響範圍 (中心偏好 1 倍半徑，其餘 2 倍) 的分數必為 0，
+        # 以 a 預先排除，距離視為 inf
+        influence = 1.0 if fishing_preference == "center" else 2.0
+        effective_radii = np.maximum(1, radii)
+        dist_km = a_to_km(a, where=a < km_to_a(influence * effective_radii))
+        
+        # 計算相對距離 (距離/半徑)
+        relative_dist = dist_km / effective_radii
+        
+        # 根據偏好計算分數
+        eligible = np.ones(len(radii), dtype=bool)
+        
+        if fishing_preference == "edge":
+            # 邊緣最佳 (相對距離 0.7-1.3)
+            position_score = np.select(
+                [
+                    (relative_dist >= 0.7) & (relative_dist <= 1.3),
+                    relative_dist < 0.7,
+                    relative_dist < 2.0
+                ],
+                [
+                    100.0,
+                    relative_dist / 0.7 * 70,
+                    (2.0 - relative_dist) / 0.7 * 70
+                ],
+                default=0.0
             )
-            
-            # 計算相對距離 (距離/半徑)
-            relative_dist = dist_km / max(1, eddy.radius_km)
-            
-            # 根據偏好計算分數
-            if fishing_preference == "edge":
-                # 邊緣最佳 (相對距離 0.7-1.3)
-                if 0.7 <= relative_dist <= 1.3:
-                    position_score = 100
-                elif relative_dist < 0.7:
-                    position_score = relative_dist / 0.7 * 70
-                elif relative_dist < 2.0:
-                    position_score = (2.0 - relative_dist) / 0.7 * 70
-                else:
-                    position_score = 0
-                    
-            elif fishing_preference == "center":
-                # 中心最佳
-                if relative_dist <= 0.5:
-                    position_score = 100
-                elif relative_dist <= 1.0:
-                    position_score = (1.0 - relative_dist) * 2 * 100
-                else:
-                    position_score = 0
-                    
-            elif fishing_preference == "cyclonic":
-                if not eddy.is_cyclonic:
-                    continue
-                position_score = max(0, 100 - relative_dist * 50)
-                
+        
+        elif fishing_preference == "center":
+            # 中心最佳
+            position_score = np.select(
+                [relative_dist <= 0.5, relative_dist <= 1.0],
+                [100.0, (1.0 - relative_dist) * 2 * 100],
+                default=0.0
+            )
+        
+        else:
+            if fishing_preference == "cyclonic":
+                eligible = is_cyclonic
             elif fishing_preference == "anticyclonic":
-                if eddy.is_cyclonic:
-                    continue
-                position_score = max(0, 100 - relative_dist * 50)
-                
-            else:
-                position_score = max(0, 100 - relative_dist * 50)
-            
-            # 渦旋強度加成
-            intensity_factor = eddy.intensity / 100
-            score = position_score * (0.5 + 0.5 * intensity_factor)
+                eligible = ~is_cyclonic
             
-            best_score = max(best_score, score)
+            position_score = np.maximum(0, 100 - relative_dist * 50)
         
-        return best_score
+        # 渦旋強度加成
+        intensity_factor = intensities / 100
+        scores = position_score * (0.5 + 0.5 * intensity_factor)
+        
+        best_score = np.where(eligible, scores, 0.0).max(axis=-1)
+        
+        return float(best_score) if best_score.ndim == 0 else best_score
     
     def _haversine(
         self,
@@ -394,21 +463,11 @@ class EddyDetector:
         lat2: float, lon2: float
     ) -> float:
         """計算兩點距離 (km)"""
-        R = 6371.0
-        
-        lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-        
-        return R * c
+        return float(haversine_km(lat1, lon1, lat2, lon2))
 
 
 def detect_eddies(
-    ssh_data: pd.DataFrame,
+    ssh_data: "pd.DataFrame",
     ssh_threshold: float = 0.05
 ) -> EddyDetectionResult:
     """
@@ -417,7 +476,7 @@ def detect_eddies(
     Args:
         ssh_data: SSH 數據 DataFrame
         ssh_threshold: SLA 閾值 (m)
-        
+    
     Returns:
         EddyDetectionResult
     """
@@ -13,14 +13,31 @@
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime
 import logging
 
 import numpy as np
-import pandas as pd
 from scipy import ndimage
-from scipy.interpolate import griddata
+
+try:
+    from .kernels import (
+        bilinear_grid, normalize_grid, regular_grid,
+        sobel_gradient, sobel_gradient_mask,
+        haversine_a_rad, a_to_km, km_to_a, label_regions, top_k_order,
+        EARTH_RADIUS_KM, GRID_DTYPE
+    )
+except ImportError:
+    from kernels import (
+        bilinear_grid, normalize_grid, regular_grid,
+        sobel_gradient, sobel_gradient_mask,
+        haversine_a_rad, a_to_km, km_to_a, label_regions, top_k_order,
+        EARTH_RADIUS_KM, GRID_DTYPE
+    )
+
+# pandas 僅用於型別標註，執行時不需載入
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -46,11 +63,40 @@ class FrontSegment:
 
 @dataclass
 class FrontDetectionResult:
-    """鋒面檢測結果"""
+    """
+    鋒面檢測結果
+    
+    除 fronts 列表外，另以 SoA 形式保存所有鋒面頂點供批次評分：
+    vertex_coords 為展平的 (lat, lon) 陣列，第 i 條鋒面的頂點為
+    vertex_coords[segment_offsets[i]:segment_offsets[i + 1]]。
+    """
     fronts: List[FrontSegment]
     gradient_field: np.ndarray
     detection_time: datetime = field(default_factory=datetime.utcnow)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    vertex_coords: np.ndarray = field(init=False, repr=False, compare=False)
+    segment_offsets: np.ndarray = field(init=False, repr=False, compare=False)
+    gradient_maxes: np.ndarray = field(init=False, repr=False, compare=False)
+    _vertex_index: Optional["FrontVertexIndex"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        """建立頂點 SoA 陣列"""
+        lengths = [len(f.coordinates) for f in self.fronts]
+        
+        self.segment_offsets = np.zeros(len(lengths) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=self.segment_offsets[1:])
+        
+        self.vertex_coords = np.empty((self.segment_offsets[-1], 2))
+        for front, start, end in zip(
+            self.fronts, self.segment_offsets[:-1], self.segment_offsets[1:]
+        ):
+            self.vertex_coords[start:end] = front.coordinates
+        
+        self.gradient_maxes = np.fromiter(
+            (f.gradient_max for f in self.fronts), float, len(self.fronts)
+        )
     
     @property
     def front_count(self) -> int:
@@ -61,6 +107,103 @@ class FrontDetectionResult:
     def total_length_km(self) -> float:
         """總長度 (km)"""
         return sum(f.length_km for f in self.fronts)
+    
+    @property
+    def vertex_index(self) -> "FrontVertexIndex":
+        """鋒面頂點空間索引 (首次使用時建立)"""
+        if self._vertex_index is None:
+            self._vertex_index = FrontVertexIndex(
+                self.vertex_coords[:, 0],
+                self.vertex_coords[:, 1],
+                np.repeat(self.gradient_maxes, np.diff(self.segment_offsets))
+            )
+        return self._vertex_index
+
+
+class FrontVertexIndex:
+    """
+    鋒面頂點最近鄰索引
+    
+    以平均緯度為中心做等距圓柱投影，在投影平面建立 cKDTree，
+    查詢時取數個候選頂點後以大圓距離校正。
+    """
+    
+    # 校正投影誤差的候選頂點數
+    CANDIDATES = 4
+    
+    def __init__(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        gradients: np.ndarray
+    ):
+        """
+        建立索引
+        
+        Args:
+            lats, lons: 頂點座標
+            gradients: 各頂點所屬鋒面的最大梯度
+        """
+        self.lats = lats
+        self.lons = lons
+        self.gradients = gradients
+        
+        # 預先計算頂點三角函數
+        self.lats_rad = np.radians(lats)
+        self.lons_rad = np.radians(lons)
+        self.cos_lats = np.cos(self.lats_rad)
+        
+        # 僅在評分時才需要空間索引，延遲載入 scipy.spatial
+        from scipy.spatial import cKDTree
+        
+        self._cos_lat0 = np.cos(self.lats_rad.mean())
+        self._tree = cKDTree(self._project(self.lats_rad, self.lons_rad))
+    
+    def _project(self, lats_rad: np.ndarray, lons_rad: np.ndarray) -> np.ndarray:
+        """等距圓柱投影 (km)"""
+        return np.stack([
+            lats_rad * EARTH_RADIUS_KM,
+            lons_rad * EARTH_RADIUS_KM * self._cos_lat0
+        ], axis=-1)
+    
+    def nearest(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        max_distance_km: float = np.inf
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        查詢最近鋒面頂點
+        
+        Args:
+            lats, lons: 查詢座標陣列
+            max_distance_km: 距離上限，超過者距離回傳 inf
+        
+        Returns:
+            (大圓距離 km, 最近頂點所屬鋒面最大梯度)
+        """
+        lats_rad = np.radians(lats)
+        lons_rad = np.radians(lons)
+        
+        k = min(self.CANDIDATES, len(self.lats))
+        _, candidates = self._tree.query(self._project(lats_rad, lons_rad), k=k)
+        candidates = np.reshape(candidates, lats.shape + (k,))
+        
+        # 以 Haversine 中間量 a 比較遠近，避免對每個候選計算 arcsin
+        a = haversine_a_rad(
+            lats_rad[..., None], lons_rad[..., None], np.cos(lats_rad)[..., None],
+            self.lats_rad[candidates], self.lons_rad[candidates],
+            self.cos_lats[candidates]
+        )
+        best = np.argmin(a, axis=-1)[..., None]
+        
+        nearest_vertex = np.take_along_axis(candidates, best, axis=-1)[..., 0]
+        min_a = np.take_along_axis(a, best, axis=-1)[..., 0]
+        
+        # 僅對距離上限內的點換算距離
+        min_distance = a_to_km(min_a, where=min_a <= km_to_a(max_distance_km))
+        
+        return min_distance, self.gradients[nearest_vertex]
 
 
 class FrontDetector:
@@ -84,7 +227,8 @@ class FrontDetector:
         self,
         gradient_threshold: float = 0.5,
         min_length_km: float = 10.0,
-        resolution_km: float = 4.0
+        resolution_km: float = 4.0,
+        top_k: Optional[int] = None
     ):
         """
         初始化鋒面檢測器
@@ -93,14 +237,16 @@ class FrontDetector:
             gradient_threshold: 梯度閾值 (°C/km)，超過此值視為鋒面
             min_length_km: 最短鋒面長度 (km)
             resolution_km: 數據分辨率 (km)
+            top_k: 只保留最大梯度最高的前 K 條鋒面，None 表示全部保留
         """
         self.gradient_threshold = gradient_threshold
         self.min_length_km = min_length_km
         self.resolution_km = resolution_km
+        self.top_k = top_k
     
     def detect_from_dataframe(
         self,
-        sst_data: pd.DataFrame,
+        sst_data: "pd.DataFrame",
         lat_col: str = "lat",
         lon_col: str = "lon",
         sst_col: str = "sst"
@@ -111,29 +257,35 @@ class FrontDetector:
         Args:
             sst_data: SST 數據 DataFrame
             lat_col, lon_col, sst_col: 列名
-            
+        
         Returns:
             FrontDetectionResult
         """
         if sst_data.empty:
             return FrontDetectionResult(fronts=[], gradient_field=np.array([]))
         
-        df = sst_data.copy()
+        lat = sst_data[lat_col].to_numpy(dtype=np.float64)
+        lon = sst_data[lon_col].to_numpy(dtype=np.float64)
+        sst = sst_data[sst_col].to_numpy(dtype=GRID_DTYPE)
         
         # 創建規則網格
-        lats = np.sort(df[lat_col].unique())
-        lons = np.sort(df[lon_col].unique())
+        lats = np.unique(lat)
+        lons = np.unique(lon)
         
-        # 插值到規則網格
-        grid_lat, grid_lon = np.meshgrid(lats, lons, indexing='ij')
+        # 忽略缺值樣本
+        valid = ~np.isnan(sst)
         
-        points = df[[lat_col, lon_col]].values
-        values = df[sst_col].values
+        # 已是完整規則網格時直接重排
+        sst_grid = regular_grid(lat[valid], lon[valid], sst[valid], lats, lons)
         
-        sst_grid = griddata(points, values, (grid_lat, grid_lon), method='linear')
-        
-        # 填充 NaN
-        sst_grid = np.nan_to_num(sst_grid, nan=np.nanmean(values))
+        if sst_grid is None:
+            # 雙線性分配到規則網格
+            sst_sum, wsum = bilinear_grid(
+                lat[valid], lon[valid], sst[valid], lats, lons
+            )
+            
+            # 無樣本格點填有效格點的加權平均
+            sst_grid = normalize_grid(sst_sum, wsum)
         
         lat_range = (lats.min(), lats.max())
         lon_range = (lons.min(), lons.max())
@@ -153,76 +305,126 @@ class FrontDetector:
             sst_grid: 2D SST 網格 (lat x lon)
             lat_range: 緯度範圍 (min, max)
             lon_range: 經度範圍 (min, max)
-            
+        
         Returns:
             FrontDetectionResult
         """
         if sst_grid.size == 0:
             return FrontDetectionResult(fronts=[], gradient_field=np.array([]))
         
-        # 計算梯度
-        gradient_field = self._calculate_gradient(sst_grid)
+        sst_grid = np.asarray(sst_grid, dtype=GRID_DTYPE)
         
-        # 識別鋒面像素
-        front_mask = gradient_field > self.gradient_threshold
-        
-        # 連通區域標記
-        labeled, num_features = ndimage.label(front_mask)
+        # 計算梯度並識別鋒面像素
+        gradient_field, front_mask = sobel_gradient_mask(
+            sst_grid, self.resolution_km, self.gradient_threshold
+        )
         
         # 提取鋒面線段
-        fronts = []
-        nrows, ncols = sst_grid.shape
-        
-        for label_id in range(1, num_features + 1):
-            region_mask = labeled == label_id
-            
-            # 獲取區域坐標
-            coords = np.argwhere(region_mask)
-            
-            if len(coords) < 3:
-                continue
-            
-            # 轉換為地理坐標
-            lat_step = (lat_range[1] - lat_range[0]) / max(1, nrows - 1)
-            lon_step = (lon_range[1] - lon_range[0]) / max(1, ncols - 1)
-            
-            geo_coords = [
-                (lat_range[0] + r * lat_step, lon_range[0] + c * lon_step)
-                for r, c in coords
-            ]
-            
-            # 計算長度
-            length_km = self._calculate_length(geo_coords)
-            
-            if length_km < self.min_length_km:
-                continue
-            
-            # 提取梯度統計
-            region_gradients = gradient_field[region_mask]
-            
-            front = FrontSegment(
-                coordinates=geo_coords,
-                gradient_mean=float(np.mean(region_gradients)),
-                gradient_max=float(np.max(region_gradients)),
-                length_km=length_km
-            )
-            
-            fronts.append(front)
+        fronts = self._extract_fronts(gradient_field, front_mask, lat_range, lon_range)
         
-        # 按梯度排序
-        fronts.sort(key=lambda f: f.gradient_max, reverse=True)
+        # 按梯度排序並保留前 K 條
+        gradient_maxes = np.fromiter((f.gradient_max for f in fronts), float, len(fronts))
+        order = top_k_order(gradient_maxes, self.top_k)
         
         return FrontDetectionResult(
-            fronts=fronts,
+            fronts=[fronts[i] for i in order],
             gradient_field=gradient_field,
             metadata={
                 "threshold": self.gradient_threshold,
+                "detected_count": len(fronts),
                 "resolution_km": self.resolution_km,
                 "lat_range": lat_range,
                 "lon_range": lon_range
             }
         )
     
+    def _extract_fronts(
+        self,
+        gradient_field: np.ndarray,
+        front_mask: np.ndarray,
+        lat_range: Tuple[float, float],
+        lon_range: Tuple[float, float]
+    ) -> List[FrontSegment]:
+        """
+        從鋒面遮罩提取所有鋒面線段
+        
+        遮罩全為 False 時直接返回，不進行連通區域標記。
+        """
+        if not front_mask.any():
+            return []
+        
+        # 連通區域標記
+        labeled, num_features, pixel_counts, _ = label_regions(front_mask)
+        
+        nrows, ncols = gradient_field.shape
+        
+        lat_step = (lat_range[1] - lat_range[0]) / max(1, nrows - 1)
+        lon_step = (lon_range[1] - lon_range[0]) / max(1, ncols - 1)
+        
+        # 一次掃描取得各區域梯度統計與邊界框
+        index = np.arange(1, num_features + 1)
+        slices = ndimage.find_objects(labeled, max_label=num_features)
+        gradient_means = ndimage.mean(gradient_field, labeled, index)
+        gradient_maxes = ndimage.maximum(gradient_field, labeled, index)
+        
+        candidates = zip(
+            index[pixel_counts >= 3],
+            gradient_means[pixel_counts >= 3],
+            gradient_maxes[pixel_counts >= 3]
+        )
+        
+        fronts = []
+        for label_id, gradient_mean, gradient_max in candidates:
+            front = self._extract_front(
+                labeled, slices[label_id - 1], label_id,
+                gradient_mean, gradient_max,
+                lat_range, lon_range, lat_step, lon_step
+            )
+            if front is not None:
+                fronts.append(front)
+        
+        return fronts
+    
+    def _extract_front(
+        self,
+        labeled: np.ndarray,
+        region: Tuple[slice, slice],
+        label_id: int,
+        gradient_mean: float,
+        gradient_max: float,
+        lat_range: Tuple[float, float],
+        lon_range: Tuple[float, float],
+        lat_step: float,
+        lon_step: float
+    ) -> Optional[FrontSegment]:
+        """
+        從標記區域提取鋒面線段
+        
+        Returns:
+            FrontSegment，長度不足時回傳 None
+        """
+        # 僅在邊界框內取得區域坐標
+        row_slice, col_slice = region
+        coords = np.argwhere(labeled[row_slice, col_slice] == label_id)
+        
+        # 轉換為地理坐標
+        lats = lat_range[0] + (coords[:, 0] + row_slice.start) * lat_step
+        lons = lon_range[0] + (coords[:, 1] + col_slice.start) * lon_step
+        geo_coords = list(zip(lats.tolist(), lons.tolist()))
+        
+        # 計算長度
+        length_km = self._calculate_length(geo_coords)
+        
+        if length_km < self.min_length_km:
+            return None
+        
+        return FrontSegment(
+            coordinates=geo_coords,
+            gradient_mean=float(gradient_mean),
+            gradient_max=float(gradient_max),
+            length_km=length_km
+        )
+    
     def _calculate_gradient(self, sst_grid: np.ndarray) -> np.ndarray:
         """
         計算 SST 梯度場
@@ -231,21 +433,12 @@ class FrontDetector:
         
         Args:
             sst_grid: SST 網格
-            
+        
         Returns:
             梯度場 (°C/km)
         """
-        # Sobel 算子計算梯度
-        dy = ndimage.sobel(sst_grid, axis=0, mode='constant')  # 緯度方向
-        dx = ndimage.sobel(sst_grid, axis=1, mode='constant')  # 經度方向
-        
-        # 計算梯度大小
-        gradient_magnitude = np.sqrt(dx**2 + dy**2)
-        
-        # 轉換為 °C/km
-        gradient_per_km = gradient_magnitude / self.resolution_km
-        
-        return gradient_per_km
+        # Sobel 算子計算梯度，並轉換為 °C/km
+        return sobel_gradient(sst_grid, self.resolution_km)
     
     def _calculate_length(
         self,
@@ -256,85 +449,74 @@ class FrontDetector:
         
         Args:
             coords: 地理坐標列表
-            
+        
         Returns:
             長度 (km)
         """
         if len(coords) < 2:
             return 0.0
         
-        total = 0.0
-        R = 6371.0  # 地球半徑 (km)
+        # 相鄰點對一次向量化計算
+        coords_rad = np.radians(np.asarray(coords, dtype=np.float64))
+        lats = coords_rad[:, 0]
+        lons = coords_rad[:, 1]
+        cos_lats = np.cos(lats)
         
-        for i in range(len(coords) - 1):
-            lat1, lon1 = np.radians(coords[i])
-            lat2, lon2 = np.radians(coords[i + 1])
-            
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            
-            a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-            c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-            
-            total += R * c
+        a = haversine_a_rad(
+            lats[:-1], lons[:-1], cos_lats[:-1],
+            lats[1:], lons[1:], cos_lats[1:]
+        )
         
-        return total
+        return float(a_to_km(a).sum())
     
     def get_front_score(
         self,
-        lat: float,
-        lon: float,
-        fronts: List[FrontSegment],
+        lat: Union[float, np.ndarray],
+        lon: Union[float, np.ndarray],
+        fronts: Union[List[FrontSegment], FrontDetectionResult],
         max_distance_km: float = 50.0
-    ) -> float:
+    ) -> Union[float, np.ndarray]:
         """
         計算位置的鋒面分數
         
         Args:
-            lat, lon: 位置座標
-            fronts: 鋒面列表
+            lat, lon: 位置座標 (可傳入陣列批次計算)
+            fronts: 鋒面列表，或 FrontDetectionResult (重複使用其頂點索引)
             max_distance_km: 最大影響距離
-            
+        
         Returns:
-            鋒面分數 (0-100)
+            鋒面分數 (0-100)，陣列輸入時回傳同形狀陣列
         """
-        if not fronts:
-            return 0.0
+        query_lat = np.asarray(lat, dtype=np.float64)
+        query_lon = np.asarray(lon, dtype=np.float64)
         
-        min_distance = float('inf')
-        max_gradient = 0.0
-        
-        R = 6371.0
-        
-        for front in fronts:
-            for front_lat, front_lon in front.coordinates:
-                # 簡化距離計算
-                dlat = np.radians(lat - front_lat)
-                dlon = np.radians(lon - front_lon)
-                lat1 = np.radians(lat)
-                lat2 = np.radians(front_lat)
-                
-                a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-                dist = 2 * R * np.arctan2(np.sqrt(a), np.sqrt(1-a))
-                
-                if dist < min_distance:
-                    min_distance = dist
-                    max_gradient = front.gradient_max
-        
-        if min_distance > max_distance_km:
-            return 0.0
+        if not isinstance(fronts, FrontDetectionResult):
+            fronts = FrontDetectionResult(fronts=fronts, gradient_field=np.array([]))
+        
+        if len(fronts.vertex_coords) == 0:
+            return 0.0 if query_lat.ndim == 0 else np.zeros(query_lat.shape)
+        
+        min_distance, max_gradient = fronts.vertex_index.nearest(
+            query_lat, query_lon, max_distance_km
+        )
         
         # 距離越近分數越高
         distance_score = 100 * (1 - min_distance / max_distance_km)
         
         # 梯度加成
-        gradient_bonus = min(20, max_gradient * 10)
+        gradient_bonus = np.minimum(20, max_gradient * 10)
         
-        return min(100, distance_score + gradient_bonus)
+        scores = np.where(
+            min_distance > max_distance_km,
+            0.0,
+            np.minimum(100, distance_score + gradient_bonus)
+        )
+        
+        return float(scores) if scores.ndim == 0 else scores
 
 
 def detect_fronts(
-    sst_data: pd.DataFrame,
+    sst_data: "pd.DataFrame",
     gradient_threshold: float = 0.5
 ) -> FrontDetectionResult:
     """
@@ -343,7 +525,7 @@ def detect_fronts(
     Args:
         sst_data: SST 數據 DataFrame (需有 lat, lon, sst 列)
         gradient_threshold: 梯度閾值 (°C/km)
-        
+    
     Returns:
         FrontDetectionResult
     """
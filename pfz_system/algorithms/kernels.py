@@ -0,0 +1,603 @@
+"""
+數值核心函數
+
+提供鋒面與渦旋檢測共用的網格化運算：
+- 規則網格資料直接重排
+- 散點資料反向雙線性網格化與缺值填補
+- Sobel 梯度大小與閾值遮罩
+- 向量化 Haversine 距離
+- 連通區域標記與統計
+- 前 K 名排序
+- 通用棲息地分數
+
+安裝 numba / OpenCV 時使用其原生實作，否則退回 NumPy/SciPy 實作。
+"""
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import ndimage
+
+# 嘗試載入 numba
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # 於匯入時 (通常為主執行緒) 啟動平行執行緒層；首次平行呼叫若發生在
+    # 工作執行緒 (predict_async、執行緒池)，TBB 執行緒層會使程序結束時卡住
+    numba.get_num_threads()
+
+# 嘗試載入 OpenCV
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# 網格數值型別 (SLA/SST/梯度場精度需求遠低於 float64)
+GRID_DTYPE = np.float32
+
+# 融合梯度核心的分塊大小 (格點)
+TILE_SIZE = 64
+
+# 地球半徑 (km)
+EARTH_RADIUS_KM = 6371.0
+
+
+def grid_axis(start: float, stop: float, step: float) -> np.ndarray:
+    """
+    建立含端點的等間距座標軸
+    
+    np.arange(start, stop + step, step) 受浮點誤差影響，可能多出一格
+    (例如 20→22、間距 0.1 得到 22 格且末端為 22.1)。此處先以容差計算
+    格數，軸長固定為 floor((stop - start) / step) + 1，間距維持 step。
+    
+    Args:
+        start, stop: 起訖座標 (stop 不在格點上時取至不超過 stop 的最後一格)
+        step: 間距
+    
+    Returns:
+        座標軸陣列
+    """
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + np.arange(max(count, 1)) * step
+
+
+def regular_grid(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    values: np.ndarray,
+    lat_axis: np.ndarray,
+    lon_axis: np.ndarray
+) -> Optional[np.ndarray]:
+    """
+    將已位於規則網格上的樣本直接重排為 2D 網格
+    
+    衛星 L4 產品通常每個格點恰有一筆樣本，此時不需插值。
+    
+    Args:
+        lat, lon: 樣本點座標
+        values: 樣本值
+        lat_axis, lon_axis: 已排序的網格座標軸
+    
+    Returns:
+        2D 網格；樣本未完整且唯一覆蓋所有格點時回傳 None
+    """
+    size = len(lat_axis) * len(lon_axis)
+    
+    if len(values) != size:
+        return None
+    
+    rows = np.searchsorted(lat_axis, lat)
+    cols = np.searchsorted(lon_axis, lon)
+    flat = rows * len(lon_axis) + cols
+    
+    covered = np.zeros(size, dtype=bool)
+    covered[flat] = True
+    
+    if not covered.all():
+        return None
+    
+    grid = np.empty(size, dtype=GRID_DTYPE)
+    grid[flat] = values
+    
+    return grid.reshape(len(lat_axis), len(lon_axis))
+
+
+def bilinear_grid(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    values: np.ndarray,
+    lat_axis: np.ndarray,
+    lon_axis: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    將散點資料以反向雙線性權重分配到規則網格
+    
+    每個樣本點依其在網格單元內的相對位置，將數值按權重分配給
+    周圍 4 個格點，取代 Delaunay 三角化插值。
+    
+    Args:
+        lat, lon: 樣本點座標
+        values: 樣本值
+        lat_axis, lon_axis: 已排序的網格座標軸
+    
+    Returns:
+        (累加值網格, 累加權重網格)，有效格點為 權重 > 0；
+        累加以 float64 進行，避免大量樣本的捨入誤差
+    """
+    nrows, ncols = len(lat_axis), len(lon_axis)
+    grid = np.zeros((nrows, ncols))
+    wsum = np.zeros((nrows, ncols))
+    
+    i0, fr = _axis_position(lat, lat_axis)
+    j0, fc = _axis_position(lon, lon_axis)
+    i1 = np.minimum(i0 + 1, nrows - 1)
+    j1 = np.minimum(j0 + 1, ncols - 1)
+    
+    if NUMBA_AVAILABLE:
+        _scatter_bilinear(i0, i1, fr, j0, j1, fc, values, grid, wsum)
+        return grid, wsum
+    
+    rows = np.concatenate([i0, i0, i1, i1])
+    cols = np.concatenate([j0, j1, j0, j1])
+    weights = np.concatenate([
+        (1 - fr) * (1 - fc),
+        (1 - fr) * fc,
+        fr * (1 - fc),
+        fr * fc
+    ])
+    
+    np.add.at(grid, (rows, cols), np.tile(values, 4) * weights)
+    np.add.at(wsum, (rows, cols), weights)
+    
+    return grid, wsum
+
+
+def normalize_grid(
+    grid_sum: np.ndarray,
+    wsum: np.ndarray,
+    fill_value: Optional[float] = None
+) -> np.ndarray:
+    """
+    將累加網格正規化為加權平均網格
+    
+    Args:
+        grid_sum: bilinear_grid 的累加值網格
+        wsum: bilinear_grid 的累加權重網格
+        fill_value: 無樣本格點填入值，None 表示使用有效格點的加權平均
+    
+    Returns:
+        GRID_DTYPE 網格，填值與除法在同一次輸出中完成，不產生 NaN
+    """
+    if fill_value is None:
+        total_weight = wsum.sum()
+        fill_value = grid_sum.sum() / total_weight if total_weight > 0 else 0.0
+    
+    grid = np.full(grid_sum.shape, fill_value, dtype=GRID_DTYPE)
+    np.divide(grid_sum, wsum, out=grid, where=wsum > 0, casting="unsafe")
+    
+    return grid
+
+
+def _axis_position(
+    coords: np.ndarray,
+    axis: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """計算座標在軸上的整數格點與小數偏移"""
+    if len(axis) < 2:
+        return np.zeros(len(coords), dtype=np.intp), np.zeros(len(coords))
+    
+    idx = np.searchsorted(axis, coords, side="right") - 1
+    idx = np.clip(idx, 0, len(axis) - 2)
+    
+    frac = (coords - axis[idx]) / (axis[idx + 1] - axis[idx])
+    return idx, np.clip(frac, 0.0, 1.0)
+
+
+def sobel_gradient(grid: np.ndarray, resolution_km: float) -> np.ndarray:
+    """
+    計算 Sobel 梯度大小
+    
+    邊界外視為 0 (等同 ndimage.sobel 的 mode='constant')。
+    
+    Args:
+        grid: 2D 網格
+        resolution_km: 網格分辨率 (km)
+    
+    Returns:
+        梯度場 (單位/km)
+    """
+    if NUMBA_AVAILABLE:
+        return _sobel_magnitude_per_km(
+            np.ascontiguousarray(grid, dtype=GRID_DTYPE), resolution_km
+        )
+    
+    # 補 0 邊界後取 3×3 視窗視圖，不複製資料
+    padded = np.pad(np.asarray(grid, dtype=GRID_DTYPE), 1, mode='constant')
+    w = sliding_window_view(padded, (3, 3))
+    
+    # 經度方向
+    dx = (
+        (w[..., 0, 2] - w[..., 0, 0])
+        + 2 * (w[..., 1, 2] - w[..., 1, 0])
+        + (w[..., 2, 2] - w[..., 2, 0])
+    )
+    # 緯度方向
+    dy = (
+        (w[..., 2, 0] - w[..., 0, 0])
+        + 2 * (w[..., 2, 1] - w[..., 0, 1])
+        + (w[..., 2, 2] - w[..., 0, 2])
+    )
+    
+    return np.sqrt(dx**2 + dy**2) / resolution_km
+
+
+def sobel_gradient_mask(
+    grid: np.ndarray,
+    resolution_km: float,
+    threshold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    計算 Sobel 梯度大小並同時產生閾值遮罩
+    
+    JIT 版本以分塊單次掃描輸出梯度與遮罩，並以梯度平方比較閾值，
+    不需要中間的 dx、dy 陣列。
+    
+    Args:
+        grid: 2D 網格
+        resolution_km: 網格分辨率 (km)
+        threshold: 梯度閾值 (單位/km)
+    
+    Returns:
+        (梯度場, 梯度 > 閾值 的布林遮罩)
+    """
+    if NUMBA_AVAILABLE:
+        threshold2 = (threshold * resolution_km) ** 2 if threshold >= 0 else -1.0
+        return _sobel_gradient_mask(
+            np.ascontiguousarray(grid, dtype=GRID_DTYPE), resolution_km, threshold2
+        )
+    
+    gradient = sobel_gradient(grid, resolution_km)
+    return gradient, gradient > threshold
+
+
+def haversine_km(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray
+) -> np.ndarray:
+    """
+    計算兩組座標間的大圓距離 (km)
+    
+    參數可為任意可廣播的陣列。
+    
+    Args:
+        lat1, lon1: 起點座標 (度)
+        lat2, lon2: 終點座標 (度)
+    
+    Returns:
+        距離陣列 (km)
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    
+    return haversine_km_rad(
+        lat1, lon1, np.cos(lat1),
+        lat2, lon2, np.cos(lat2)
+    )
+
+
+def haversine_km_rad(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    cos_lat1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+    cos_lat2: np.ndarray
+) -> np.ndarray:
+    """
+    以預先計算的弧度與 cos(緯度) 計算大圓距離 (km)
+    
+    重複評分時，固定端 (渦旋中心、鋒面頂點) 的三角函數只需計算一次。
+    
+    Args:
+        lat1, lon1: 起點座標 (弧度)
+        cos_lat1: cos(lat1)
+        lat2, lon2: 終點座標 (弧度)
+        cos_lat2: cos(lat2)
+    
+    Returns:
+        距離陣列 (km)
+    """
+    return a_to_km(haversine_a_rad(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2))
+
+
+def haversine_a_rad(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    cos_lat1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+    cos_lat2: np.ndarray
+) -> np.ndarray:
+    """
+    計算 Haversine 中間量 a = sin²(Δφ/2) + cosφ1·cosφ2·sin²(Δλ/2)
+    
+    a 隨距離單調遞增，只需比較遠近或與閾值比較時，
+    可直接使用 a 而省略 sqrt 與 arcsin。
+    
+    Args:
+        參數同 haversine_km_rad
+    
+    Returns:
+        a 陣列 (0-1)
+    """
+    a = (
+        np.sin((lat2 - lat1) * 0.5) ** 2
+        + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) * 0.5) ** 2
+    )
+    
+    return np.clip(a, 0.0, 1.0)
+
+
+def a_to_km(a: np.ndarray, where: Any = True) -> np.ndarray:
+    """
+    將 Haversine 中間量 a 轉換為距離 (km)
+    
+    Args:
+        a: haversine_a_rad 的結果
+        where: 需要轉換的元素遮罩，其餘元素回傳 inf
+    
+    Returns:
+        距離陣列 (km)
+    """
+    distance = np.full(np.shape(a), np.inf)
+    np.sqrt(a, out=distance, where=where)
+    np.arcsin(distance, out=distance, where=where)
+    
+    return 2 * EARTH_RADIUS_KM * distance
+
+
+def km_to_a(distance_km: Any) -> np.ndarray:
+    """
+    將距離 (km) 轉換為對應的 Haversine 中間量 a，供閾值比較使用
+    
+    Args:
+        distance_km: 距離 (km)，超過半個地球周長時視為 a = 1
+    
+    Returns:
+        a 閾值
+    """
+    half_angle = np.minimum(np.asarray(distance_km) / (2 * EARTH_RADIUS_KM), np.pi / 2)
+    return np.sin(half_angle) ** 2
+
+
+def top_k_order(values: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    取得由大到小排序的前 k 個索引
+    
+    以 argpartition 先選出前 k 個 (O(N))，只對選出的部分排序。
+    
+    Args:
+        values: 排序依據
+        k: 保留數量，None 表示全部
+    
+    Returns:
+        索引陣列，數值相同時維持原順序
+    """
+    values = np.asarray(values)
+    
+    if k is None or k >= len(values):
+        return np.argsort(-values, kind="stable")
+    
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    
+    top = np.argpartition(-values, k - 1)[:k]
+    top.sort()
+    
+    return top[np.argsort(-values[top], kind="stable")]
+
+
+def generic_habitat_score(sst: np.ndarray, chla: np.ndarray) -> np.ndarray:
+    """
+    通用棲息地分數 (陣列版)
+    
+    SST 最佳範圍 24-28°C (權重 70%)，Chl-a 最佳範圍 0.2-1.0 mg/m³
+    (權重 30%)；NaN 視為無數據，SST 無數據時基礎分為 50。
+    
+    Args:
+        sst: 海表溫度 (°C)
+        chla: 葉綠素濃度 (mg/m³)，形狀與 sst 相同
+    
+    Returns:
+        與輸入同形狀的分數陣列
+    """
+    sst = np.asarray(sst, dtype=np.float64)
+    chla = np.asarray(chla, dtype=np.float64)
+    
+    if NUMBA_AVAILABLE:
+        out = _generic_habitat_scores(
+            np.ascontiguousarray(sst).ravel(), np.ascontiguousarray(chla).ravel()
+        )
+        return out.reshape(sst.shape)
+    
+    # SST 分段線性以距 26°C 的偏差合併：±2°C 內 100 分，±6°C 內線性降至 50，
+    # 之外改以 50 - 5|d| 計 (下限 0)；單次 abs 後僅兩個分支
+    deviation = np.abs(sst - 26)
+    sst_score = np.where(
+        deviation <= 6,
+        100 - np.maximum(deviation - 2, 0) * 12.5,
+        np.maximum(50 - deviation * 5, 0)
+    )
+    score = np.where(np.isnan(sst), 50.0, sst_score * 0.7)
+    
+    chla_score = np.select(
+        [chla < 0.2, chla <= 1.0],
+        [chla * (80 / 0.2), 100.0],
+        default=np.maximum(100 - (chla - 1.0) * 20, 0)
+    )
+    
+    return np.where(np.isnan(chla), score, score + chla_score * 0.3)
+
+
+def label_regions(
+    mask: np.ndarray
+) -> Tuple[np.ndarray, int, np.ndarray, np.ndarray]:
+    """
+    標記 4-連通區域並計算各區域面積與質心
+    
+    安裝 OpenCV 時以 connectedComponentsWithStats 一次取得標記與統計。
+    
+    Args:
+        mask: 2D 布林遮罩
+    
+    Returns:
+        (標記陣列, 區域數, 各區域像素數, 各區域質心 (row, col))
+    """
+    if CV2_AVAILABLE:
+        num_labels, labeled, stats, centroids = cv2.connectedComponentsWithStats(
+            mask.astype(np.uint8), connectivity=4, ltype=cv2.CV_32S
+        )
+        # 標記 0 為背景；OpenCV 質心為 (x, y)
+        return (
+            labeled,
+            num_labels - 1,
+            stats[1:, cv2.CC_STAT_AREA].astype(np.float64),
+            centroids[1:, ::-1]
+        )
+    
+    labeled, num_labels = ndimage.label(mask)
+    index = np.arange(1, num_labels + 1)
+    
+    areas = ndimage.sum_labels(mask, labeled, index)
+    centers = np.asarray(
+        ndimage.center_of_mass(mask, labeled, index), dtype=np.float64
+    ).reshape(-1, 2)
+    
+    return labeled, num_labels, areas, centers
+
+
+if NUMBA_AVAILABLE:
+    
+    @njit(cache=True)
+    def _scatter_bilinear(i0, i1, fr, j0, j1, fc, values, grid, wsum):
+        """逐點累加 4 個鄰近格點的權重與加權值"""
+        for k in range(values.shape[0]):
+            w00 = (1.0 - fr[k]) * (1.0 - fc[k])
+            w01 = (1.0 - fr[k]) * fc[k]
+            w10 = fr[k] * (1.0 - fc[k])
+            w11 = fr[k] * fc[k]
+            
+            grid[i0[k], j0[k]] += values[k] * w00
+            grid[i0[k], j1[k]] += values[k] * w01
+            grid[i1[k], j0[k]] += values[k] * w10
+            grid[i1[k], j1[k]] += values[k] * w11
+            
+            wsum[i0[k], j0[k]] += w00
+            wsum[i0[k], j1[k]] += w01
+            wsum[i1[k], j0[k]] += w10
+            wsum[i1[k], j1[k]] += w11
+    
+    @njit(cache=True, inline="always")
+    def _at(grid, i, j):
+        """讀取格點值，邊界外為 0"""
+        if i < 0 or j < 0 or i >= grid.shape[0] or j >= grid.shape[1]:
+            return 0.0
+        return grid[i, j]
+    
+    @njit(cache=True, inline="always")
+    def _sobel_g2(grid, i, j):
+        """單一格點兩個方向 Sobel 的平方和"""
+        nw = _at(grid, i - 1, j - 1)
+        n = _at(grid, i - 1, j)
+        ne = _at(grid, i - 1, j + 1)
+        w = _at(grid, i, j - 1)
+        e = _at(grid, i, j + 1)
+        sw = _at(grid, i + 1, j - 1)
+        s = _at(grid, i + 1, j)
+        se = _at(grid, i + 1, j + 1)
+        
+        dy = (sw + 2.0 * s + se) - (nw + 2.0 * n + ne)
+        dx = (ne + 2.0 * e + se) - (nw + 2.0 * w + sw)
+        
+        return dx * dx + dy * dy
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sobel_magnitude_per_km(grid, resolution_km):
+        """單次掃描完成兩個方向的 Sobel 與梯度大小"""
+        nrows, ncols = grid.shape
+        out = np.empty((nrows, ncols), dtype=np.float32)
+        
+        for i in prange(nrows):
+            for j in range(ncols):
+                out[i, j] = np.sqrt(_sobel_g2(grid, i, j)) / resolution_km
+        
+        return out
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sobel_gradient_mask(grid, resolution_km, threshold2):
+        """分塊掃描，同時寫出梯度大小與閾值遮罩"""
+        nrows, ncols = grid.shape
+        out = np.empty((nrows, ncols), dtype=np.float32)
+        mask = np.empty((nrows, ncols), dtype=np.bool_)
+        
+        tile_rows = (nrows + TILE_SIZE - 1) // TILE_SIZE
+        tile_cols = (ncols + TILE_SIZE - 1) // TILE_SIZE
+        
+        for tile in prange(tile_rows * tile_cols):
+            row0 = (tile // tile_cols) * TILE_SIZE
+            col0 = (tile % tile_cols) * TILE_SIZE
+            
+            for i in range(row0, min(row0 + TILE_SIZE, nrows)):
+                for j in range(col0, min(col0 + TILE_SIZE, ncols)):
+                    g2 = _sobel_g2(grid, i, j)
+                    out[i, j] = np.sqrt(g2) / resolution_km
+                    mask[i, j] = g2 > threshold2
+        
+        return out, mask
+    
+    @njit(cache=True)
+    def _generic_habitat(sst, chla):
+        """單點通用棲息地分數，NaN 視為無數據"""
+        score = 50.0
+        
+        if not np.isnan(sst):
+            if 24.0 <= sst <= 28.0:
+                sst_score = 100.0
+            elif 20.0 <= sst < 24.0:
+                sst_score = 50.0 + (sst - 20.0) * 12.5
+            elif 28.0 < sst <= 32.0:
+                sst_score = 100.0 - (sst - 28.0) * 12.5
+            else:
+                sst_score = max(0.0, 50.0 - abs(sst - 26.0) * 5.0)
+            
+            score = sst_score * 0.7
+        
+        if not np.isnan(chla):
+            if 0.2 <= chla <= 1.0:
+                chla_score = 100.0
+            elif chla < 0.2:
+                chla_score = chla / 0.2 * 80.0
+            else:
+                chla_score = max(0.0, 100.0 - (chla - 1.0) * 20.0)
+            
+            score += chla_score * 0.3
+        
+        return score
+    
+    @njit(parallel=True, cache=True)
+    def _generic_habitat_scores(sst, chla):
+        """逐點計算通用棲息地分數"""
+        out = np.empty(sst.shape[0], dtype=np.float64)
+        
+        for k in prange(sst.shape[0]):
+            out[k] = _generic_habitat(sst[k], chla[k])
+        
+        return out
@@ -11,13 +11,23 @@
 輸出：PFZ 分數 (0-100) 與作業建議
 """
 
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from itertools import product
+import asyncio
 import logging
+import threading
+import time
 
 import numpy as np
 import pandas as pd
+from scipy import ndimage
 
 try:
     from ..config import get_settings, get_species, Species
@@ -25,6 +35,9 @@ try:
     from ..weather import GlobalWeatherFetcher, OperabilityCalculator, VesselType, TyphoonMonitor
     from .fronts import FrontDetector, FrontDetectionResult
     from .eddies import EddyDetector, EddyDetectionResult
+    from .kernels import (
+        bilinear_grid, normalize_grid, regular_grid, grid_axis, generic_habitat_score
+    )
 except ImportError:
     import sys
     import os
@@ -41,9 +54,78 @@ except ImportError:
     from weather import GlobalWeatherFetcher, OperabilityCalculator, VesselType, TyphoonMonitor
     from fronts import FrontDetector, FrontDetectionResult
     from eddies import EddyDetector, EddyDetectionResult
+    from kernels import (
+        bilinear_grid, normalize_grid, regular_grid, grid_axis, generic_habitat_score
+    )
 
 logger = logging.getLogger(__name__)
 
+# 分數等級門檻 (由低到高) 與對應等級、顏色
+LEVEL_THRESHOLDS = np.array([20.0, 40.0, 60.0, 80.0])
+LEVEL_NAMES = np.array(["不佳", "較差", "中等", "良好", "極佳"])
+LEVEL_COLORS = np.array(["#dc3545", "#fd7e14", "#ffc107", "#17a2b8", "#28a745"])
+# 網格預測輸出欄位 (predict_grid 與 predict_grid_vectorized 共用)
+GRID_RECORD_DTYPE = np.dtype([
+    ("lat", "f8"),
+    ("lon", "f8"),
+    ("pfz_score", "f8"),
+    ("level", "U8"),
+    ("color", "U7"),
+    ("habitat", "f8"),
+    ("front", "f8"),
+    ("eddy", "f8"),
+    ("weather", "f8"),
+    ("confidence", "f8")
+])
+LEVEL_RECOMMENDATIONS = (
+    "❌ 不建議作業，考慮其他漁場。",
+    "⚡ 條件較差，建議觀望或轉場。",
+    "⚠️ 中等條件，可嘗試作業。",
+    "✅ 良好條件，適合作業。",
+    "🎯 極佳漁場！建議優先作業。"
+)
+
+# 單一分數查表用 (bisect 於 Python 序列上比 NumPy 純量呼叫快)
+_LEVEL_BOUNDS = tuple(LEVEL_THRESHOLDS.tolist())
+_LEVEL_NAMES = tuple(LEVEL_NAMES.tolist())
+_LEVEL_COLORS = tuple(LEVEL_COLORS.tolist())
+
+
+def level_index(score: float) -> int:
+    """分數所屬等級索引 (0 = 不佳 … 4 = 極佳)，與 np.digitize 一致"""
+    return bisect_right(_LEVEL_BOUNDS, score)
+
+# 颱風風險扣分
+TYPHOON_RISK_PENALTY = {
+    "none": 0,
+    "low": 10,
+    "moderate": 30,
+    "high": 60,
+    "extreme": 100
+}
+
+
+def _first_value(
+    df: pd.DataFrame,
+    column: str,
+    default: Any,
+    missing: Any = None
+) -> Any:
+    """
+    取得欄位第一列的純量值
+    
+    Args:
+        df: 資料表
+        column: 欄位名稱
+        default: 欄位不存在時的值
+        missing: 值為 NaN 時的值
+    """
+    if column not in df.columns:
+        return default
+    
+    value = df[column].iat[0]
+    return missing if pd.isna(value) else value
+
 
 @dataclass
 class PFZScore:
@@ -73,30 +155,12 @@ class PFZScore:
     @property
     def level(self) -> str:
         """分數等級"""
-        if self.total_score >= 80:
-            return "極佳"
-        elif self.total_score >= 60:
-            return "良好"
-        elif self.total_score >= 40:
-            return "中等"
-        elif self.total_score >= 20:
-            return "較差"
-        else:
-            return "不佳"
+        return _LEVEL_NAMES[level_index(self.total_score)]
     
     @property
     def color(self) -> str:
         """等級顏色 (hex)"""
-        if self.total_score >= 80:
-            return "#28a745"  # 綠
-        elif self.total_score >= 60:
-            return "#17a2b8"  # 青
-        elif self.total_score >= 40:
-            return "#ffc107"  # 黃
-        elif self.total_score >= 20:
-            return "#fd7e14"  # 橙
-        else:
-            return "#dc3545"  # 紅
+        return _LEVEL_COLORS[level_index(self.total_score)]
 
 
 @dataclass
@@ -135,6 +199,128 @@ class PFZPrediction:
         }
 
 
+class SpatialPrefetchCache:
+    """
+    空間預取快取
+    
+    以 (數據種類, 緯度, 經度) 為鍵的記憶體 LRU 快取，座標取至 0.1°；
+    條目超過存活時間後視為失效。可於背景執行緒中預取，存取以鎖保護。
+    
+    Example:
+        >>> cache = SpatialPrefetchCache(maxsize=4096, ttl_seconds=900)
+        >>> sst = cache.get_or_compute("sst", 22.5, 121.0, lambda: fetch_sst())
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl_seconds: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(kind: str, lat: float, lon: float) -> Tuple[str, float, float]:
+        """建立快取鍵"""
+        return (kind, round(lat, 1), round(lon, 1))
+    
+    def contains(self, kind: str, lat: float, lon: float) -> bool:
+        """是否有未過期的條目"""
+        key = self.make_key(kind, lat, lon)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[0] < self.ttl_seconds
+    
+    def get_or_compute(
+        self,
+        kind: str,
+        lat: float,
+        lon: float,
+        compute: Callable[[], Any]
+    ) -> Any:
+        """
+        取得快取值，未命中或過期時計算並存入
+        
+        Args:
+            kind: 數據種類
+            lat, lon: 位置
+            compute: 未命中時的計算函數
+        
+        Returns:
+            快取或新計算的值
+        """
+        key = self.make_key(kind, lat, lon)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return entry[1]
+        
+        value = compute()
+        if value is None:
+            # 獲取失敗不快取，下次重新嘗試
+            return value
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        
+        return value
+    
+    def clear(self) -> None:
+        """清除所有條目"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 颱風影響檢查結果 (颱風資料數分鐘才更新，各計算器共用)
+TYPHOON_IMPACT_TTL_S = 300.0
+_typhoon_impact_cache = SpatialPrefetchCache(maxsize=2048, ttl_seconds=TYPHOON_IMPACT_TTL_S)
+
+
+class FetchContext:
+    """
+    單次預測內的數據獲取去重
+    
+    以 (獲取器, 邊界框) 為鍵保存 fetch 結果；並發的評分任務請求
+    同一區域時只會實際獲取一次，其餘等待並共用結果。
+    """
+    
+    def __init__(self):
+        self._results: Dict[Tuple, Any] = {}
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(fetcher: Any, bbox: BoundingBox) -> Tuple:
+        """建立去重鍵"""
+        return (
+            id(fetcher),
+            round(bbox.lat_min, 4), round(bbox.lat_max, 4),
+            round(bbox.lon_min, 4), round(bbox.lon_max, 4)
+        )
+    
+    def fetch(self, fetcher: Any, bbox: BoundingBox) -> Any:
+        """獲取區域數據，同一鍵只呼叫一次 fetcher.fetch"""
+        key = self.make_key(fetcher, bbox)
+        
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            if key not in self._results:
+                self._results[key] = fetcher.fetch(bbox)
+            return self._results[key]
+
+
+# 目前預測的獲取上下文 (於各評分任務間共用)
+_fetch_context: ContextVar[Optional[FetchContext]] = ContextVar(
+    "pfz_fetch_context", default=None
+)
+
+
 class PFZCalculator:
     """
     PFZ 計算器
@@ -152,6 +338,10 @@ class PFZCalculator:
         >>> print(f"PFZ Score: {prediction.score.total_score}")
     """
     
+    # 鋒面與渦旋搜尋半徑 (度)
+    FRONT_RADIUS_DEG = 2.0
+    EDDY_RADIUS_DEG = 3.0
+    
     def __init__(
         self,
         target_species: Optional[str] = None,
@@ -202,6 +392,15 @@ class PFZCalculator:
         self.eddy_detector = EddyDetector()
         self.operability_calculator = OperabilityCalculator(self.vessel_type)
         self.typhoon_monitor = TyphoonMonitor()
+        
+        # 單點海洋數據快取 (供鄰近格點預取)
+        self.prefetch_cache = SpatialPrefetchCache(
+            maxsize=self.settings.algorithm.prefetch_cache_size,
+            ttl_seconds=self.settings.algorithm.prefetch_cache_ttl_s
+        )
+        # 進行中的預取 (避免重複預取同一位置)
+        self._prefetching: set = set()
+        self._prefetch_lock = threading.Lock()
     
     def predict(
         self,
@@ -216,17 +415,89 @@ class PFZCalculator:
             lat: 緯度
             lon: 經度
             forecast_days: 預報天數
-            
+        
         Returns:
             PFZPrediction
         """
         logger.info(f"Calculating PFZ for ({lat}, {lon})")
         
-        scores = {}
-        confidence_factors = []
-        details = {}
+        return self._predict_in_context(FetchContext(), lat, lon, forecast_days)
+    
+    def _predict_in_context(
+        self,
+        context: FetchContext,
+        lat: float,
+        lon: float,
+        forecast_days: int
+    ) -> PFZPrediction:
+        """在指定獲取上下文中依序計算各因子並組合預測"""
+        token = _fetch_context.set(context)
+        try:
+            results = [
+                task(*args) for task, args in self._scoring_tasks(lat, lon, forecast_days)
+            ]
+        finally:
+            _fetch_context.reset(token)
         
-        # 1. 棲息地指數 (SST + Chl-a)
+        return self._build_prediction(lat, lon, *results)
+    
+    async def predict_async(
+        self,
+        lat: float,
+        lon: float,
+        forecast_days: int = 3
+    ) -> PFZPrediction:
+        """
+        非同步計算單點 PFZ 預測
+        
+        各因子的數據獲取互相獨立，於執行緒池中同時進行，
+        總耗時約為最慢一項而非各項相加。
+        
+        Args:
+            lat: 緯度
+            lon: 經度
+            forecast_days: 預報天數
+        
+        Returns:
+            PFZPrediction
+        """
+        logger.info(f"Calculating PFZ for ({lat}, {lon})")
+        
+        loop = asyncio.get_running_loop()
+        
+        # 各任務在同一獲取上下文中執行，共用重疊區域的數據
+        token = _fetch_context.set(FetchContext())
+        try:
+            calls = [
+                partial(copy_context().run, task, *args)
+                for task, args in self._scoring_tasks(lat, lon, forecast_days)
+            ]
+        finally:
+            _fetch_context.reset(token)
+        
+        results = await asyncio.gather(*(
+            loop.run_in_executor(None, call) for call in calls
+        ))
+        
+        return self._build_prediction(lat, lon, *results)
+    
+    def _scoring_tasks(
+        self,
+        lat: float,
+        lon: float,
+        forecast_days: int
+    ) -> List[Tuple[Any, Tuple]]:
+        """各因子評分函數與參數，順序對應 _build_prediction"""
+        return [
+            (self._habitat_task, (lat, lon)),
+            (self._front_task, (lat, lon)),
+            (self._eddy_task, (lat, lon)),
+            (self._weather_task, (lat, lon, forecast_days)),
+            (self._typhoon_task, (lat, lon))
+        ]
+    
+    def _habitat_task(self, lat: float, lon: float) -> Tuple[float, float, Dict[str, Any]]:
+        """棲息地指數 (SST + Chl-a)，返回 (分數, 信心度, 細節)"""
         try:
             sst = self._get_sst(lat, lon)
             chla = self._get_chla(lat, lon)
@@ -237,98 +508,110 @@ class PFZCalculator:
                 # 通用評估
                 habitat_score = self._calculate_generic_habitat(sst, chla)
             
-            scores["habitat"] = habitat_score
-            confidence_factors.append(0.9 if sst else 0.5)
-            details["sst"] = sst
-            details["chla"] = chla
-            
+            return habitat_score, 0.9 if sst else 0.5, {"sst": sst, "chla": chla}
+        
         except Exception as e:
             logger.warning(f"Habitat calculation failed: {e}")
-            scores["habitat"] = 50.0
-            confidence_factors.append(0.3)
-        
-        # 2. 鋒面分數
+            return 50.0, 0.3, {}
+    
+    def _front_task(self, lat: float, lon: float) -> Tuple[float, float, Dict[str, Any]]:
+        """鋒面分數，返回 (分數, 信心度, 細節)"""
         try:
             front_result = self._detect_fronts(lat, lon)
             front_score = self.front_detector.get_front_score(
-                lat, lon, front_result.fronts
+                lat, lon, front_result
             )
-            scores["front"] = front_score
-            confidence_factors.append(0.8)
-            details["front_count"] = front_result.front_count
-            
+            return front_score, 0.8, {"front_count": front_result.front_count}
+        
         except Exception as e:
             logger.warning(f"Front detection failed: {e}")
-            scores["front"] = 0.0
-            confidence_factors.append(0.3)
-        
-        # 3. 渦旋分數
+            return 0.0, 0.3, {}
+    
+    def _eddy_task(self, lat: float, lon: float) -> Tuple[float, float, Dict[str, Any]]:
+        """渦旋分數，返回 (分數, 信心度, 細節)"""
         try:
             eddy_result = self._detect_eddies(lat, lon)
             eddy_score = self.eddy_detector.get_eddy_score(
-                lat, lon, eddy_result.eddies,
+                lat, lon, eddy_result,
                 fishing_preference="edge"
             )
-            scores["eddy"] = eddy_score
-            confidence_factors.append(0.8)
-            details["eddy_count"] = len(eddy_result.eddies)
-            
+            return eddy_score, 0.8, {"eddy_count": len(eddy_result.eddies)}
+        
         except Exception as e:
             logger.warning(f"Eddy detection failed: {e}")
-            scores["eddy"] = 0.0
-            confidence_factors.append(0.3)
-        
-        # 4. 氣象適宜度
+            return 0.0, 0.3, {}
+    
+    def _weather_task(
+        self,
+        lat: float,
+        lon: float,
+        forecast_days: int
+    ) -> Tuple[float, float, Dict[str, Any]]:
+        """氣象適宜度，返回 (分數, 信心度, 細節)"""
         try:
             weather = self._get_weather(lat, lon, forecast_days)
+            weather_score, weather_confidence, operability = self._score_weather(weather)
             
-            if not weather.empty:
-                wind = weather.get("wind_speed_10m_mean", pd.Series([10])).iloc[0]
-                wave = weather.get("wave_height", pd.Series([1.5])).iloc[0]
-                vis = weather.get("visibility_mean", pd.Series([10000])).iloc[0]
-                precip = weather.get("precipitation_mean", pd.Series([0])).iloc[0]
-                
-                op_result = self.operability_calculator.calculate(
-                    wind_speed=wind if pd.notna(wind) else 10,
-                    wave_height=wave if pd.notna(wave) else None,
-                    visibility=vis if pd.notna(vis) else None,
-                    precipitation=precip if pd.notna(precip) else None
-                )
-                
-                scores["weather"] = op_result.score
-                confidence_factors.append(0.9)
-                details["operability"] = op_result.level.value
-            else:
-                scores["weather"] = 70.0
-                confidence_factors.append(0.5)
-                
+            details = {"operability": operability} if operability is not None else {}
+            return weather_score, weather_confidence, details
+        
         except Exception as e:
             logger.warning(f"Weather calculation failed: {e}")
-            scores["weather"] = 70.0
-            confidence_factors.append(0.4)
-        
-        # 5. 趨勢分數 (簡化版，基於當前數據的穩定性)
-        scores["trend"] = 60.0  # 默認中等
-        confidence_factors.append(0.6)
-        
-        # 6. 颱風風險檢查
+            return 70.0, 0.4, {}
+    
+    def _typhoon_task(self, lat: float, lon: float) -> Optional[str]:
+        """颱風風險檢查，返回最高風險等級 (無影響時為 None)"""
         try:
-            typhoon_impact = self.typhoon_monitor.check_typhoon_impact(lat, lon)
+            typhoon_impact = self._check_typhoon_impact(lat, lon)
             if typhoon_impact["has_impact"]:
-                # 降低分數
-                risk_penalty = {
-                    "none": 0,
-                    "low": 10,
-                    "moderate": 30,
-                    "high": 60,
-                    "extreme": 100
-                }
-                penalty = risk_penalty.get(typhoon_impact["max_risk_level"], 0)
-                scores["weather"] = max(0, scores["weather"] - penalty)
-                details["typhoon_risk"] = typhoon_impact["max_risk_level"]
+                return typhoon_impact["max_risk_level"]
         except Exception as e:
             logger.debug(f"Typhoon check failed: {e}")
         
+        return None
+    
+    def _check_typhoon_impact(self, lat: float, lon: float) -> Dict[str, Any]:
+        """颱風影響檢查 (以 0.1° 格點快取 5 分鐘)"""
+        return _typhoon_impact_cache.get_or_compute(
+            "typhoon", lat, lon,
+            lambda: self.typhoon_monitor.check_typhoon_impact(lat, lon)
+        )
+    
+    def _build_prediction(
+        self,
+        lat: float,
+        lon: float,
+        habitat: Tuple[float, float, Dict[str, Any]],
+        front: Tuple[float, float, Dict[str, Any]],
+        eddy: Tuple[float, float, Dict[str, Any]],
+        weather: Tuple[float, float, Dict[str, Any]],
+        typhoon_risk: Optional[str]
+    ) -> PFZPrediction:
+        """由各因子結果組合總分、信心度與建議"""
+        scores = {}
+        confidence_factors = []
+        details = {}
+        
+        for key, (score, confidence, factor_details) in (
+            ("habitat", habitat),
+            ("front", front),
+            ("eddy", eddy),
+            ("weather", weather)
+        ):
+            scores[key] = score
+            confidence_factors.append(confidence)
+            details.update(factor_details)
+        
+        # 趨勢分數 (簡化版，基於當前數據的穩定性)
+        scores["trend"] = 60.0  # 默認中等
+        confidence_factors.append(0.6)
+        
+        # 颱風風險降低氣象分數
+        if typhoon_risk is not None:
+            penalty = TYPHOON_RISK_PENALTY.get(typhoon_risk, 0)
+            scores["weather"] = max(0, scores["weather"] - penalty)
+            details["typhoon_risk"] = typhoon_risk
+        
         # 計算總分
         total_score = sum(
             scores.get(key, 0) * weight
@@ -382,85 +665,505 @@ class PFZCalculator:
             bbox: 區域邊界
             resolution: 網格分辨率 (度)
             forecast_days: 預報天數
+        
+        Returns:
+            包含各點 PFZ 分數的 DataFrame，共 n_lat × n_lon 列 (緯度優先)，
+            n = floor(範圍 / 分辨率) + 1
+        """
+        lats = grid_axis(bbox.lat_min, bbox.lat_max, resolution)
+        lons = grid_axis(bbox.lon_min, bbox.lon_max, resolution)
+        
+        out = np.empty(len(lats) * len(lons), dtype=GRID_RECORD_DTYPE)
+        
+        # 各點預測以網路 I/O 為主，以執行緒池重疊等待時間
+        with ThreadPoolExecutor(max_workers=self.settings.algorithm.grid_workers) as executor:
+            rows = executor.map(
+                lambda point: self._grid_point(*point, forecast_days),
+                product(lats, lons)
+            )
+            for i, row in enumerate(rows):
+                out[i] = row
+        
+        return pd.DataFrame(out)
+    
+    def _grid_point(self, lat: float, lon: float, forecast_days: int) -> Tuple:
+        """計算單一網格點，返回 GRID_RECORD_DTYPE 欄位順序的列 (失敗時為 N/A 列)"""
+        try:
+            score = self.predict(lat, lon, forecast_days).score
+            return (
+                lat, lon, score.total_score, score.level, score.color,
+                score.habitat_score, score.front_score, score.eddy_score,
+                score.weather_score, score.confidence
+            )
+        except Exception as e:
+            logger.warning(f"Grid point ({lat}, {lon}) failed: {e}")
+            return (
+                lat, lon, 0.0, "N/A", "#999999",
+                np.nan, np.nan, np.nan, np.nan, np.nan
+            )
+    
+    def predict_grid_vectorized(
+        self,
+        bbox: BoundingBox,
+        resolution: float = 0.5,
+        forecast_days: int = 3
+    ) -> pd.DataFrame:
+        """
+        以批次管線計算區域網格 PFZ 預測
+        
+        SST、Chl-a、SSH 對 (含鄰近範圍的) 整個區域各獲取一次，
+        鋒面與渦旋只檢測一次，再以陣列運算計算所有格點分數；
+        氣象以區域中心點預報代表整個區域。
+        
+        Args:
+            bbox: 區域邊界
+            resolution: 網格分辨率 (度)
+            forecast_days: 預報天數
+        
+        Returns:
+            與 predict_grid 欄位、列數及順序相同的 DataFrame
+        """
+        lats = grid_axis(bbox.lat_min, bbox.lat_max, resolution)
+        lons = grid_axis(bbox.lon_min, bbox.lon_max, resolution)
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+        lat_flat = lat_grid.ravel()
+        lon_flat = lon_grid.ravel()
+        
+        scores, confidence, _ = self._score_points(
+            lat_flat, lon_flat, bbox, forecast_days
+        )
+        
+        # 各欄位直接四捨五入寫入輸出陣列
+        out = np.empty(lat_flat.size, dtype=GRID_RECORD_DTYPE)
+        out["lat"] = lat_flat
+        out["lon"] = lon_flat
+        np.round(scores["total"], 1, out=out["pfz_score"])
+        for column in ("habitat", "front", "eddy", "weather"):
+            np.round(scores[column], 1, out=out[column])
+        np.round(confidence, 2, out=out["confidence"])
+        
+        level_index = np.digitize(out["pfz_score"], LEVEL_THRESHOLDS)
+        out["level"] = LEVEL_NAMES[level_index]
+        out["color"] = LEVEL_COLORS[level_index]
+        
+        return pd.DataFrame(out)
+    
+    def predict_batch(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        forecast_days: int = 3
+    ) -> List[PFZPrediction]:
+        """
+        批次計算多個位置的 PFZ 預測
+        
+        各位置與 predict 以相同方式逐點計算，分數與單獨預測一致；
+        位置於執行緒池中並行，並共用一個獲取上下文，相同座標
+        與相同區域只計算、獲取一次。
+        
+        Args:
+            lats, lons: 位置座標
+            forecast_days: 預報天數
+        
+        Returns:
+            與輸入順序相同的 PFZPrediction 列表
+        """
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        
+        if lats.size == 0:
+            return []
+        
+        points = list(zip(lats.tolist(), lons.tolist()))
+        unique = list(dict.fromkeys(points))
+        context = FetchContext()
+        
+        with ThreadPoolExecutor(
+            max_workers=min(len(unique), self.settings.algorithm.grid_workers)
+        ) as executor:
+            results = dict(zip(unique, executor.map(
+                lambda point: self._predict_in_context(context, *point, forecast_days),
+                unique
+            )))
+        
+        return [results[point] for point in points]
+    
+    def _score_points(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        bbox: BoundingBox,
+        forecast_days: int
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, Dict[str, List[Any]]]:
+        """
+        批次計算多個位置的各因子分數
+        
+        海洋數據對整個區域各獲取一次並取樣至各位置，氣象以區域
+        中心點代表，結果為網格近似值 (與逐點 predict 不完全相同)。
+        
+        Args:
+            lats, lons: 一維位置座標
+            bbox: 涵蓋所有位置的區域
+            forecast_days: 預報天數
+        
+        Returns:
+            (各因子與總分陣列, 信心度陣列, 逐點細節)
+        """
+        n = lats.size
+        scores = {}
+        confidence_factors = []
+        details = {
+            "sst": [None] * n,
+            "chla": [None] * n,
+            "operability": [None] * n,
+            "typhoon_risk": [None] * n
+        }
+        
+        # 含鋒面/渦旋搜尋範圍的擴展區域
+        fetch_bbox = bbox.expand(max(self.FRONT_RADIUS_DEG, self.EDDY_RADIUS_DEG))
+        
+        # 1. 棲息地指數 (SST + Chl-a)
+        sst_data = None
+        try:
+            sst_data = self.sst_fetcher.fetch(fetch_bbox).data
+            sst = self._sample_field(sst_data, "sst", lats, lons)
+            chla = self._sample_field(
+                self.chla_fetcher.fetch(fetch_bbox).data, "chla", lats, lons
+            )
+            
+            has_sst = ~np.isnan(sst)
+            
+            if self.species:
+                habitat = np.where(
+                    has_sst, self.species.get_habitat_scores(sst, chla), 50.0
+                )
+                habitat_confidence = np.where(has_sst, 0.9, 0.3)
+            else:
+                habitat = generic_habitat_score(sst, chla)
+                habitat_confidence = np.where(has_sst, 0.9, 0.5)
+            
+            scores["habitat"] = habitat
+            confidence_factors.append(habitat_confidence)
+            details["sst"] = [None if np.isnan(v) else float(v) for v in sst]
+            details["chla"] = [None if np.isnan(v) else float(v) for v in chla]
+        
+        except Exception as e:
+            logger.warning(f"Habitat calculation failed: {e}")
+            scores["habitat"] = np.full(n, 50.0)
+            confidence_factors.append(0.3)
+        
+        # 2. 鋒面分數
+        try:
+            if sst_data is None:
+                sst_data = self.sst_fetcher.fetch(fetch_bbox).data
+            
+            if sst_data is not None and not sst_data.empty:
+                front_result = self.front_detector.detect_from_dataframe(sst_data)
+            else:
+                front_result = FrontDetectionResult(fronts=[], gradient_field=np.array([]))
+            
+            scores["front"] = np.broadcast_to(
+                self.front_detector.get_front_score(lats, lons, front_result), (n,)
+            )
+            confidence_factors.append(0.8)
+            details["front_count"] = [front_result.front_count] * n
+        
+        except Exception as e:
+            logger.warning(f"Front detection failed: {e}")
+            scores["front"] = np.zeros(n)
+            confidence_factors.append(0.3)
+        
+        # 3. 渦旋分數
+        try:
+            ssh_data = self.ssh_fetcher.fetch(fetch_bbox).data
+            
+            if ssh_data is not None and not ssh_data.empty:
+                eddy_result = self.eddy_detector.detect_from_dataframe(ssh_data)
+            else:
+                eddy_result = EddyDetectionResult(eddies=[], sla_field=np.array([]))
             
+            scores["eddy"] = np.broadcast_to(
+                self.eddy_detector.get_eddy_score(
+                    lats, lons, eddy_result,
+                    fishing_preference="edge"
+                ),
+                (n,)
+            )
+            confidence_factors.append(0.8)
+            details["eddy_count"] = [len(eddy_result.eddies)] * n
+        
+        except Exception as e:
+            logger.warning(f"Eddy detection failed: {e}")
+            scores["eddy"] = np.zeros(n)
+            confidence_factors.append(0.3)
+        
+        # 4. 氣象適宜度 (區域中心點)
+        try:
+            center = bbox.center()
+            weather_result = self._score_weather(
+                self._get_weather(center[0], center[1], forecast_days)
+            )
+        except Exception as e:
+            logger.warning(f"Weather calculation failed: {e}")
+            weather_result = (70.0, 0.4, None)
+        
+        weather_scores = np.full(n, weather_result[0])
+        details["operability"] = [weather_result[2]] * n
+        
+        scores["weather"] = weather_scores
+        confidence_factors.append(weather_result[1])
+        
+        # 5. 趨勢分數
+        scores["trend"] = np.full(n, 60.0)
+        confidence_factors.append(0.6)
+        
+        # 6. 颱風風險 (僅在有活躍颱風時逐點檢查)
+        try:
+            if self.typhoon_monitor.get_active_typhoons():
+                for i, (lat, lon) in enumerate(zip(lats, lons)):
+                    impact = self._check_typhoon_impact(lat, lon)
+                    if impact["has_impact"]:
+                        penalty = TYPHOON_RISK_PENALTY.get(impact["max_risk_level"], 0)
+                        weather_scores[i] = max(0, weather_scores[i] - penalty)
+                        details["typhoon_risk"][i] = impact["max_risk_level"]
+        except Exception as e:
+            logger.debug(f"Typhoon check failed: {e}")
+        
+        # 計算總分與信心度
+        scores["total"] = sum(
+            scores[key] * weight
+            for key, weight in self.weights.items()
+            if key in scores
+        )
+        confidence = np.broadcast_to(
+            sum(confidence_factors) / len(confidence_factors), (n,)
+        )
+        
+        return scores, confidence, details
+    
+    @staticmethod
+    def _sample_field(
+        data: Optional[pd.DataFrame],
+        column: str,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> np.ndarray:
+        """
+        將散點資料網格化後以雙線性插值取樣至指定位置
+        
+        Args:
+            data: 含 lat、lon 與數值欄位的 DataFrame
+            column: 數值欄位
+            lats, lons: 取樣位置
+        
+        Returns:
+            取樣值陣列，無資料處為 NaN
+        """
+        if data is None or data.empty or column not in data.columns:
+            return np.full(lats.shape, np.nan)
+        
+        lat = data["lat"].to_numpy(dtype=np.float64)
+        lon = data["lon"].to_numpy(dtype=np.float64)
+        values = data[column].to_numpy(dtype=np.float64)
+        
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return np.full(lats.shape, np.nan)
+        
+        lat_axis = np.unique(lat[valid])
+        lon_axis = np.unique(lon[valid])
+        
+        field = regular_grid(lat[valid], lon[valid], values[valid], lat_axis, lon_axis)
+        if field is None:
+            grid_sum, wsum = bilinear_grid(
+                lat[valid], lon[valid], values[valid], lat_axis, lon_axis
+            )
+            field = normalize_grid(grid_sum, wsum, fill_value=np.nan)
+        
+        # 以座標軸換算分數索引，超出範圍取邊界值
+        rows = np.interp(lats, lat_axis, np.arange(len(lat_axis)))
+        cols = np.interp(lons, lon_axis, np.arange(len(lon_axis)))
+        
+        return ndimage.map_coordinates(
+            np.asarray(field, dtype=np.float64), [rows, cols],
+            order=1, mode="nearest"
+        )
+    
+    def prefetch_neighbors(
+        self,
+        lat: float,
+        lon: float,
+        resolution: Optional[float] = None,
+        expansion_radius: Optional[int] = None
+    ) -> int:
+        """
+        預取鄰近格點的海洋數據
+        
+        對 (lat, lon) 周圍 expansion_radius 圈、間距 resolution 的格點，
+        預先獲取 SST、Chl-a、鋒面與渦旋並存入 prefetch_cache；
+        已快取的格點略過。適合在回應請求後於背景執行。
+        
+        相同位置的預取正在進行，或進行中的預取已達
+        prefetch_max_concurrent 時直接略過，限制對上游的額外負載。
+        
+        Args:
+            lat, lon: 中心位置
+            resolution: 格點間距 (度)，默認取設定值
+            expansion_radius: 預取圈數，默認取設定值
+        
         Returns:
-            包含各點 PFZ 分數的 DataFrame
+            實際預取的格點數
         """
-        lats = np.arange(bbox.lat_min, bbox.lat_max + resolution, resolution)
-        lons = np.arange(bbox.lon_min, bbox.lon_max + resolution, resolution)
+        config = self.settings.algorithm
+        resolution = resolution or config.prefetch_resolution_deg
+        if expansion_radius is None:
+            expansion_radius = config.prefetch_expansion_radius
+        
+        key = (*SpatialPrefetchCache.make_key("prefetch", lat, lon), resolution, expansion_radius)
+        with self._prefetch_lock:
+            if key in self._prefetching or len(self._prefetching) >= config.prefetch_max_concurrent:
+                return 0
+            self._prefetching.add(key)
+        
+        try:
+            return self._prefetch_cells(lat, lon, resolution, expansion_radius)
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.discard(key)
+    
+    def _prefetch_cells(
+        self,
+        lat: float,
+        lon: float,
+        resolution: float,
+        expansion_radius: int
+    ) -> int:
+        """逐一預取鄰近格點，返回實際預取的格點數"""
+        warmers = [
+            ("sst", self._get_sst),
+            ("chla", self._get_chla),
+            ("fronts", self._detect_fronts),
+            ("eddies", self._detect_eddies)
+        ]
         
-        results = []
+        prefetched = 0
+        steps = range(-expansion_radius, expansion_radius + 1)
         
-        for lat in lats:
-            for lon in lons:
+        for i in steps:
+            for j in steps:
+                if i == 0 and j == 0:
+                    continue
+                
+                n_lat = lat + i * resolution
+                n_lon = lon + j * resolution
+                if not (-90 <= n_lat <= 90 and -180 <= n_lon <= 180):
+                    continue
+                
+                missing = [
+                    warm for kind, warm in warmers
+                    if not self.prefetch_cache.contains(kind, n_lat, n_lon)
+                ]
+                if not missing:
+                    continue
+                
+                # 與 predict 相同，在獲取上下文中共用 SST 與鋒面的區域數據
+                token = _fetch_context.set(FetchContext())
                 try:
-                    pred = self.predict(lat, lon, forecast_days)
-                    results.append({
-                        "lat": lat,
-                        "lon": lon,
-                        "pfz_score": pred.score.total_score,
-                        "level": pred.score.level,
-                        "color": pred.score.color,
-                        "habitat": pred.score.habitat_score,
-                        "front": pred.score.front_score,
-                        "eddy": pred.score.eddy_score,
-                        "weather": pred.score.weather_score,
-                        "confidence": pred.score.confidence
-                    })
-                except Exception as e:
-                    logger.warning(f"Grid point ({lat}, {lon}) failed: {e}")
-                    results.append({
-                        "lat": lat,
-                        "lon": lon,
-                        "pfz_score": 0,
-                        "level": "N/A",
-                        "color": "#999999"
-                    })
-        
-        return pd.DataFrame(results)
+                    for warm in missing:
+                        try:
+                            warm(n_lat, n_lon)
+                        except Exception as e:
+                            logger.debug(f"Prefetch ({n_lat}, {n_lon}) failed: {e}")
+                finally:
+                    _fetch_context.reset(token)
+                
+                prefetched += 1
+        
+        return prefetched
+    
+    @staticmethod
+    def _around(lat: float, lon: float, radius: float) -> BoundingBox:
+        """以位置為中心的邊界框"""
+        return BoundingBox(lat - radius, lat + radius, lon - radius, lon + radius)
+    
+    def _fetch(self, fetcher: Any, bbox: BoundingBox) -> Any:
+        """獲取區域數據，於預測中時經由獲取上下文去重"""
+        context = _fetch_context.get()
+        if context is None:
+            return fetcher.fetch(bbox)
+        return context.fetch(fetcher, bbox)
     
     def _get_sst(self, lat: float, lon: float) -> Optional[float]:
-        """獲取 SST"""
-        return self.sst_fetcher.get_latest_sst(lat, lon)
+        """
+        獲取 SST
+        
+        優先自鋒面檢測所用的區域 SST 取樣 (預測中經由獲取上下文共用)，
+        無區域數據時才查詢單點 SST；不論是否在預測中，同一位置的
+        結果來源相同，可安全共用快取。
+        """
+        def fetch() -> Optional[float]:
+            try:
+                sst_result = self._fetch(
+                    self.sst_fetcher, self._around(lat, lon, self.FRONT_RADIUS_DEG)
+                )
+                sst = self._sample_field(
+                    sst_result.data, "sst", np.array([lat]), np.array([lon])
+                )[0]
+                if not np.isnan(sst):
+                    return float(sst)
+            except Exception as e:
+                logger.warning(f"Regional SST sampling failed: {e}")
+            
+            return self.sst_fetcher.get_latest_sst(lat, lon)
+        
+        return self.prefetch_cache.get_or_compute("sst", lat, lon, fetch)
     
     def _get_chla(self, lat: float, lon: float) -> Optional[float]:
         """獲取 Chl-a"""
-        bbox = BoundingBox(lat - 0.5, lat + 0.5, lon - 0.5, lon + 0.5)
-        result = self.chla_fetcher.fetch(bbox)
+        def fetch() -> Optional[float]:
+            result = self._fetch(self.chla_fetcher, self._around(lat, lon, 0.5))
+            
+            if result.data is not None and not result.data.empty:
+                return result.data["chla"].mean()
+            return None
         
-        if result.data is not None and not result.data.empty:
-            return result.data["chla"].mean()
-        return None
+        return self.prefetch_cache.get_or_compute("chla", lat, lon, fetch)
     
     def _detect_fronts(
         self,
         lat: float,
         lon: float,
-        radius: float = 2.0
+        radius: float = FRONT_RADIUS_DEG
     ) -> FrontDetectionResult:
         """檢測周邊鋒面"""
-        bbox = BoundingBox(lat - radius, lat + radius, lon - radius, lon + radius)
-        sst_result = self.sst_fetcher.fetch(bbox)
-        
-        if sst_result.data is not None and not sst_result.data.empty:
-            return self.front_detector.detect_from_dataframe(sst_result.data)
+        def detect() -> FrontDetectionResult:
+            sst_result = self._fetch(self.sst_fetcher, self._around(lat, lon, radius))
+            
+            if sst_result.data is not None and not sst_result.data.empty:
+                return self.front_detector.detect_from_dataframe(sst_result.data)
+            
+            return FrontDetectionResult(fronts=[], gradient_field=np.array([]))
         
-        return FrontDetectionResult(fronts=[], gradient_field=np.array([]))
+        kind = "fronts" if radius == self.FRONT_RADIUS_DEG else f"fronts:{radius}"
+        return self.prefetch_cache.get_or_compute(kind, lat, lon, detect)
     
     def _detect_eddies(
         self,
         lat: float,
         lon: float,
-        radius: float = 3.0
+        radius: float = EDDY_RADIUS_DEG
     ) -> EddyDetectionResult:
         """檢測周邊渦旋"""
-        bbox = BoundingBox(lat - radius, lat + radius, lon - radius, lon + radius)
-        ssh_result = self.ssh_fetcher.fetch(bbox)
-        
-        if ssh_result.data is not None and not ssh_result.data.empty:
-            return self.eddy_detector.detect_from_dataframe(ssh_result.data)
+        def detect() -> EddyDetectionResult:
+            ssh_result = self._fetch(self.ssh_fetcher, self._around(lat, lon, radius))
+            
+            if ssh_result.data is not None and not ssh_result.data.empty:
+                return self.eddy_detector.detect_from_dataframe(ssh_result.data)
+            
+            return EddyDetectionResult(eddies=[], sla_field=np.array([]))
         
-        return EddyDetectionResult(eddies=[], sla_field=np.array([]))
+        kind = "eddies" if radius == self.EDDY_RADIUS_DEG else f"eddies:{radius}"
+        return self.prefetch_cache.get_or_compute(kind, lat, lon, detect)
     
     def _get_weather(
         self,
@@ -468,12 +1171,48 @@ class PFZCalculator:
         lon: float,
         forecast_days: int
     ) -> pd.DataFrame:
-        """獲取氣象預報"""
-        return self.weather_fetcher.fetch_ensemble(
-            lat, lon,
-            forecast_days=forecast_days,
-            include_marine=True
+        """
+        獲取氣象預報
+        
+        僅氣象依賴預報天數，快取鍵含天數；海洋數據快取鍵則不含，
+        不同天數的請求共用 SST/Chl-a/鋒面/渦旋結果。模型選擇隨預報
+        時長而異，較長預報不能截取替代，故各天數分別快取。
+        """
+        def fetch() -> Optional[pd.DataFrame]:
+            weather = self.weather_fetcher.fetch_ensemble(
+                lat, lon,
+                forecast_days=forecast_days,
+                include_marine=True
+            )
+            # 空結果 (獲取失敗) 不快取
+            return None if weather.empty else weather
+        
+        weather = self.prefetch_cache.get_or_compute(
+            f"weather:{forecast_days}", lat, lon, fetch
+        )
+        return pd.DataFrame() if weather is None else weather
+    
+    def _score_weather(
+        self,
+        weather: pd.DataFrame
+    ) -> Tuple[float, float, Optional[str]]:
+        """
+        由氣象預報計算作業適宜度
+        
+        Returns:
+            (分數, 信心度, 適宜度等級)，無預報時為預設值
+        """
+        if weather.empty:
+            return 70.0, 0.5, None
+        
+        op_result = self.operability_calculator.calculate(
+            wind_speed=_first_value(weather, "wind_speed_10m_mean", 10, 10),
+            wave_height=_first_value(weather, "wave_height", 1.5),
+            visibility=_first_value(weather, "visibility_mean", 10000),
+            precipitation=_first_value(weather, "precipitation_mean", 0)
         )
+        
+        return op_result.score, 0.9, op_result.level.value
     
     def _calculate_generic_habitat(
         self,
@@ -516,37 +1255,53 @@ class PFZCalculator:
         details: Dict[str, Any]
     ) -> str:
         """生成作業建議"""
-        if total_score >= 80:
-            base = "🎯 極佳漁場！建議優先作業。"
-        elif total_score >= 60:
-            base = "✅ 良好條件，適合作業。"
-        elif total_score >= 40:
-            base = "⚠️ 中等條件，可嘗試作業。"
-        elif total_score >= 20:
-            base = "⚡ 條件較差，建議觀望或轉場。"
-        else:
-            base = "❌ 不建議作業，考慮其他漁場。"
+        base = LEVEL_RECOMMENDATIONS[level_index(total_score)]
+        
+        near_front = scores.get("front", 0) >= 50
+        in_eddy = scores.get("eddy", 0) >= 50
+        poor_weather = scores.get("weather", 0) < 50
+        typhoon_risk = details.get("typhoon_risk")
+        
+        # 多數格點無具體建議，直接返回
+        if not (near_front or in_eddy or poor_weather or typhoon_risk):
+            return base
         
         # 添加具體建議
         tips = []
         
-        if scores.get("front", 0) >= 50:
+        if near_front:
             tips.append("附近有鋒面，餌料魚可能聚集")
         
-        if scores.get("eddy", 0) >= 50:
+        if in_eddy:
             tips.append("渦旋區域，注意流向")
         
-        if scores.get("weather", 0) < 50:
-            operability = details.get("operability", "")
-            tips.append(f"氣象條件一般 ({operability})")
-        
-        if details.get("typhoon_risk"):
-            tips.append(f"⚠️ 颱風風險：{details['typhoon_risk']}")
+        if poor_weather:
+            tips.append(f"氣象條件一般 ({details.get('operability', '')})")
         
-        if tips:
-            return base + " " + "、".join(tips) + "。"
+        if typhoon_risk:
+            tips.append(f"⚠️ 颱風風險：{typhoon_risk}")
         
-        return base
+        return f"{base} {'、'.join(tips)}。"
+
+
+@lru_cache(maxsize=32)
+def get_calculator(
+    target_species: Optional[str] = None,
+    vessel_type: str = "longline"
+) -> PFZCalculator:
+    """
+    取得共用的 PFZ 計算器
+    
+    依 (魚種, 漁法) 快取實例，重複使用其數據獲取器與 HTTP 連線。
+    
+    Args:
+        target_species: 目標魚種 ID
+        vessel_type: 漁法類型
+    
+    Returns:
+        PFZCalculator (預設權重)
+    """
+    return PFZCalculator(target_species=target_species, vessel_type=vessel_type)
 
 
 def calculate_pfz(
@@ -561,9 +1316,8 @@ def calculate_pfz(
         lat: 緯度
         lon: 經度
         target_species: 目標魚種
-        
+    
     Returns:
         PFZPrediction
     """
-    calc = PFZCalculator(target_species=target_species)
-    return calc.predict(lat, lon)
+    return get_calculator(target_species).predict(lat, lon)
@@ -6,23 +6,30 @@ PFZ System REST API
 啟動方式：
     uvicorn api:app --reload --port 8000
 
+正式環境 (安裝 uvloop 與 httptools 後)：
+    uvicorn api:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --workers 4
+
 API 文檔：
     http://localhost:8000/docs (Swagger UI)
     http://localhost:8000/redoc (ReDoc)
 """
 
+import asyncio
+import json
 import logging
 import sys
 import os
+from collections import defaultdict
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from contextlib import asynccontextmanager
 
 # 確保可以導入主模組
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+    from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Depends
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.responses import JSONResponse
     from pydantic import BaseModel, Field
@@ -31,16 +38,73 @@ except ImportError:
         "FastAPI is required. Install with: pip install fastapi uvicorn"
     )
 
-from algorithms.pfz import PFZCalculator, calculate_pfz
+# 嘗試載入 uvloop (由 uvicorn 啟用，此處僅用於選擇事件迴圈)
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# 嘗試載入 orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from algorithms.pfz import PFZCalculator, PFZPrediction, calculate_pfz, get_calculator
 from weather import (
     get_weather_forecast,
     get_operability_forecast,
     TyphoonMonitor
 )
 from business.roi import ROICalculator, calculate_roi, VesselSpecs
+from config import get_settings
 
 logger = logging.getLogger(__name__)
 
+
+# ============================================
+# Responses
+# ============================================
+
+class OrjsonResponse(JSONResponse):
+    """
+    以 orjson 序列化的 JSON 響應 (支援 NumPy 數值與 dataclass)
+    
+    用於未宣告 response_model 的端點、錯誤處理，以及直接回傳響應以略過
+    Pydantic 驗證的端點；其餘有 response_model 的端點由 FastAPI 以
+    Pydantic 直接序列化，指定為 response_class 反而較慢。
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+
+def _json_default(obj: Any) -> Any:
+    """標準 json 後備：dataclass 轉為 dict (orjson 原生支援，不需此函數)"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class StdJSONResponse(JSONResponse):
+    """未安裝 orjson 時的後備響應，額外支援 dataclass"""
+    
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_json_default
+        ).encode("utf-8")
+
+
+FastJSONResponse = OrjsonResponse if ORJSON_AVAILABLE else StdJSONResponse
+
 # ============================================
 # Pydantic Models
 # ============================================
@@ -141,15 +205,206 @@ class ErrorResponse(BaseModel):
     timestamp: str
 
 
+# ============================================
+# Request Batching
+# ============================================
+
+class AsyncPFZBatcher:
+    """
+    PFZ 預測請求合併器
+    
+    在短時間窗口內收集並發請求，依 (魚種, 預報天數, 區塊) 分組後
+    以 PFZCalculator.predict_batch 計算，共用獲取上下文；單獨的請求
+    則以 predict_async 計算。兩者逐點計算方式相同，分數不受合併影響。
+    
+    Attributes:
+        max_batch: 單批最大請求數
+        max_wait_ms: 收集請求的最長等待時間 (毫秒)
+        tile_deg: 分組區塊大小 (度)，避免相距過遠的位置合併獲取
+    """
+    
+    def __init__(
+        self,
+        max_batch: int = 64,
+        max_wait_ms: float = 50.0,
+        tile_deg: float = 5.0
+    ):
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.tile_deg = tile_deg
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # 計算中的分組任務 (保留參考，避免任務被回收)
+        self._tasks: Dict[asyncio.Task, List[Tuple]] = {}
+    
+    async def start(self) -> None:
+        """啟動背景批次處理"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        停止背景批次處理
+        
+        排隊中與計算中的請求皆以 RuntimeError 結束，不會無限等待。
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        tasks = list(self._tasks)
+        pending = [item for items in self._tasks.values() for item in items]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        
+        self._fail(pending, RuntimeError("PFZ batcher stopped"))
+    
+    @staticmethod
+    def _fail(items: List[Tuple], error: Exception) -> None:
+        """以例外結束尚未完成的請求"""
+        for item in items:
+            if not item[4].done():
+                item[4].set_exception(error)
+    
+    async def process(
+        self,
+        lat: float,
+        lon: float,
+        species: Optional[str] = None,
+        forecast_days: int = 3
+    ) -> PFZPrediction:
+        """
+        提交單點預測請求並等待所屬批次完成
+        
+        Returns:
+            PFZPrediction
+        """
+        if self._worker is None:
+            await self.start()
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((lat, lon, species, forecast_days, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """
+        收集請求直到批次已滿或等待逾時，再分組計算
+        
+        各分組以獨立任務計算，不等待完成即繼續收集下一批，
+        單一緩慢的分組不會延誤其他請求。
+        """
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("PFZ batcher stopped"))
+                raise
+            
+            groups: Dict[Tuple, List[Tuple]] = defaultdict(list)
+            for item in batch:
+                lat, lon, species, forecast_days, _ = item
+                tile = (lat // self.tile_deg, lon // self.tile_deg)
+                groups[(species, forecast_days, tile)].append(item)
+            
+            for (species, forecast_days, _), items in groups.items():
+                task = asyncio.create_task(self._dispatch(species, forecast_days, items))
+                self._tasks[task] = items
+                task.add_done_callback(self._discard_task)
+    
+    def _discard_task(self, task: asyncio.Task) -> None:
+        """分組任務結束後移除參考"""
+        self._tasks.pop(task, None)
+    
+    async def _dispatch(
+        self,
+        species: Optional[str],
+        forecast_days: int,
+        items: List[Tuple]
+    ) -> None:
+        """
+        計算一組請求並設定各自的結果
+        
+        單一請求以 predict_async 同時獲取各因子數據；
+        多個請求在執行緒中以 predict_batch 計算，相同座標與區域只獲取一次。
+        """
+        lats = [item[0] for item in items]
+        lons = [item[1] for item in items]
+        
+        try:
+            calculator = get_calculator(species)
+            
+            if len(items) == 1:
+                predictions = [
+                    await calculator.predict_async(lats[0], lons[0], forecast_days)
+                ]
+            else:
+                predictions = await asyncio.to_thread(
+                    calculator.predict_batch, lats, lons, forecast_days
+                )
+        except Exception as e:
+            for item in items:
+                if not item[4].done():
+                    item[4].set_exception(e)
+            return
+        
+        for item, prediction in zip(items, predictions):
+            if not item[4].done():
+                item[4].set_result(prediction)
+
+
+pfz_batcher = AsyncPFZBatcher()
+
+
+# ============================================
+# Dependencies
+# ============================================
+
+async def request_timestamp() -> str:
+    """請求時間戳 (每個請求取一次，供回應共用)"""
+    return datetime.now().isoformat()
+
+
 # ============================================
 # Application Setup
 # ============================================
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """應用程式生命週期管理"""
-    logger.info("PFZ API starting up...")
+    """
+    應用程式生命週期管理
+    
+    批次器與背景預取皆在事件迴圈中執行；正式環境應以 uvloop 啟動
+    (uvicorn --loop uvloop)，降低事件迴圈本身的開銷。
+    """
+    logger.info(
+        f"PFZ API starting up (event loop: {type(asyncio.get_running_loop()).__module__})..."
+    )
+    await pfz_batcher.start()
     yield
+    await pfz_batcher.stop()
     logger.info("PFZ API shutting down...")
 
 
@@ -192,7 +447,7 @@ app.add_middleware(
 # Endpoints
 # ============================================
 
-@app.get("/", tags=["Root"])
+@app.get("/", tags=["Root"], response_class=FastJSONResponse)
 async def root():
     """API 根路徑"""
     return {
@@ -204,12 +459,12 @@ async def root():
 
 
 @app.get("/api/v1/health", response_model=HealthResponse, tags=["Health"])
-async def health_check():
+async def health_check(timestamp: str = Depends(request_timestamp)):
     """健康檢查"""
     return HealthResponse(
         status="healthy",
         version="1.0.0",
-        timestamp=datetime.now().isoformat()
+        timestamp=timestamp
     )
 
 
@@ -218,21 +473,30 @@ async def get_pfz_prediction(
     lat: float = Query(..., ge=-90, le=90, description="緯度"),
     lon: float = Query(..., ge=-180, le=180, description="經度"),
     species: Optional[str] = Query(None, description="目標魚種"),
-    forecast_days: int = Query(3, ge=1, le=7, description="預報天數")
+    forecast_days: int = Query(3, ge=1, le=7, description="預報天數"),
+    background_tasks: BackgroundTasks = None,
+    timestamp: str = Depends(request_timestamp)
 ):
     """
     獲取 PFZ 預測
     
-    根據座標和目標魚種計算潛在漁場分數。
+    根據座標和目標魚種計算潛在漁場分數；並發請求會合併批次計算。
+    啟用 prefetch_enabled (PFZ_PREFETCH_NEIGHBORS) 時，回應後於背景
+    預取鄰近格點數據。
     """
     try:
-        calculator = PFZCalculator(target_species=species)
-        prediction = calculator.predict(
+        prediction = await pfz_batcher.process(
             lat=lat,
             lon=lon,
+            species=species,
             forecast_days=forecast_days
         )
         
+        if background_tasks is not None and get_settings().algorithm.prefetch_enabled:
+            background_tasks.add_task(
+                get_calculator(species).prefetch_neighbors, lat, lon
+            )
+        
         return PFZResponse(
             lat=lat,
             lon=lon,
@@ -248,9 +512,9 @@ async def get_pfz_prediction(
                 "level": prediction.score.level,
                 "recommendation": prediction.score.recommendation
             },
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp
         )
-        
+    
     except Exception as e:
         logger.error(f"PFZ prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -260,7 +524,8 @@ async def get_pfz_prediction(
 async def get_weather(
     lat: float = Query(..., ge=-90, le=90, description="緯度"),
     lon: float = Query(..., ge=-180, le=180, description="經度"),
-    days: int = Query(3, ge=1, le=16, description="預報天數")
+    days: int = Query(3, ge=1, le=16, description="預報天數"),
+    timestamp: str = Depends(request_timestamp)
 ):
     """
     獲取氣象預報
@@ -281,9 +546,9 @@ async def get_weather(
             lon=lon,
             forecast=forecast_data,
             model="GFS",
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp
         )
-        
+    
     except Exception as e:
         logger.error(f"Weather forecast error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -294,7 +559,8 @@ async def get_operability(
     lat: float = Query(..., ge=-90, le=90, description="緯度"),
     lon: float = Query(..., ge=-180, le=180, description="經度"),
     vessel_type: str = Query("longline", description="漁法類型"),
-    days: int = Query(3, ge=1, le=7, description="預報天數")
+    days: int = Query(3, ge=1, le=7, description="預報天數"),
+    timestamp: str = Depends(request_timestamp)
 ):
     """
     獲取作業適宜度
@@ -320,9 +586,9 @@ async def get_operability(
             lon=lon,
             vessel_type=vessel_type,
             operability=operability_data,
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp
         )
-        
+    
     except Exception as e:
         logger.error(f"Operability calculation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -331,7 +597,8 @@ async def get_operability(
 @app.get("/api/v1/typhoon", response_model=TyphoonResponse, tags=["Typhoon"])
 async def get_typhoon_status(
     lat: Optional[float] = Query(None, ge=-90, le=90, description="監測位置緯度"),
-    lon: Optional[float] = Query(None, ge=-180, le=180, description="監測位置經度")
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="監測位置經度"),
+    timestamp: str = Depends(request_timestamp)
 ):
     """
     獲取颱風狀態
@@ -357,9 +624,9 @@ async def get_typhoon_status(
         return TyphoonResponse(
             active_typhoons=typhoon_data,
             warnings=warnings,
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp
         )
-        
+    
     except Exception as e:
         logger.error(f"Typhoon monitoring error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -385,27 +652,28 @@ async def calculate_roi_analysis(request: ROIRequest):
             operation_days=request.operation_days
         )
         
-        return ROIResponse(
-            expected_revenue=result.expected_revenue,
-            total_cost=result.total_cost,
-            net_profit=result.net_profit,
-            roi_percentage=result.roi_percentage,
-            break_even_catch_kg=result.break_even_catch_kg,
-            is_profitable=result.is_profitable,
-            recommendation=result.recommendation,
-            details={
-                "fuel_cost": result.fuel_cost.to_dict(),
-                "expected_catches": [c.to_dict() for c in result.expected_catches],
+        # 直接輸出 dataclass，省去 to_dict 與 Pydantic 模型的中間轉換
+        return FastJSONResponse(content={
+            "expected_revenue": result.expected_revenue,
+            "total_cost": result.total_cost,
+            "net_profit": result.net_profit,
+            "roi_percentage": result.roi_percentage,
+            "break_even_catch_kg": result.break_even_catch_kg,
+            "is_profitable": result.is_profitable,
+            "recommendation": result.recommendation,
+            "details": {
+                "fuel_cost": result.fuel_cost,
+                "expected_catches": result.expected_catches,
                 **result.details
             }
-        )
-        
+        })
+    
     except Exception as e:
         logger.error(f"ROI calculation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/v1/species", tags=["Reference"])
+@app.get("/api/v1/species", tags=["Reference"], response_class=FastJSONResponse)
 async def list_species():
     """列出支援的魚種"""
     from config.species import SPECIES_CONFIG
@@ -422,7 +690,7 @@ async def list_species():
     return {"species": species_list}
 
 
-@app.get("/api/v1/regions", tags=["Reference"])
+@app.get("/api/v1/regions", tags=["Reference"], response_class=FastJSONResponse)
 async def list_regions():
     """列出支援的漁場區域"""
     from config.regions import REGIONS
@@ -442,28 +710,29 @@ async def list_regions():
 # Error Handlers
 # ============================================
 
+def _error_content(error: str, detail: Any) -> Dict[str, Any]:
+    """錯誤響應內容 (欄位同 ErrorResponse，直接組成字典不經模型驗證)"""
+    return {
+        "error": error,
+        "detail": detail,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            error=f"HTTP {exc.status_code}",
-            detail=exc.detail,
-            timestamp=datetime.now().isoformat()
-        ).dict()
+        content=_error_content(f"HTTP {exc.status_code}", exc.detail)
     )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.exception(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
-        content=ErrorResponse(
-            error="Internal Server Error",
-            detail=str(exc),
-            timestamp=datetime.now().isoformat()
-        ).dict()
+        content=_error_content("Internal Server Error", str(exc))
     )
 
 
@@ -479,9 +748,19 @@ if __name__ == "__main__":
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     
+    from config.settings import Environment
+    
+    # 僅開發環境啟用 reload (檔案監看與重啟程序，且與多 worker 互斥)；
+    # 其餘環境以 PFZ_API_WORKERS / WEB_CONCURRENCY 指定的 worker 數執行
+    development = get_settings().environment == Environment.DEVELOPMENT
+    workers = int(os.getenv("PFZ_API_WORKERS", os.getenv("WEB_CONCURRENCY", "2")))
+    
     uvicorn.run(
         "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="auto",  # 安裝 httptools 時自動採用
+        workers=1 if development else workers,
+        reload=development
     )
@@ -0,0 +1,131 @@
+"""
+ROI 批次數值核心
+
+將候選漁場的航程、燃油、營運成本與預期收入融合為單次逐點計算，
+供大量候選目的地評分使用。
+
+安裝 numba 時以 JIT 編譯的平行迴圈執行，否則退回 NumPy 實作。
+"""
+
+from typing import Tuple, Union
+
+import numpy as np
+
+# 嘗試載入 numba
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # 在主執行緒啟動平行執行緒層 (避免 TBB 層於程序結束時卡住)
+    numba.get_num_threads()
+
+try:
+    from .roi import EARTH_RADIUS_NM
+except ImportError:
+    from roi import EARTH_RADIUS_NM
+
+
+def score_destinations(
+    lat0: float,
+    lon0: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    pfz_scores: np.ndarray,
+    variability: np.ndarray,
+    fuel_per_nm: float,
+    fuel_price: float,
+    operating_cost: float,
+    catch_kg_per_trip: Union[float, np.ndarray],
+    price_avg: Union[float, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批次計算候選目的地的航程、總成本與預期收入
+    
+    Args:
+        lat0, lon0: 出發點
+        lats, lons: 目的地座標
+        pfz_scores: 各目的地 PFZ 分數 (0-100)
+        variability: 各目的地漁獲隨機變異係數
+        fuel_per_nm: 每海里燃油消耗 (L)
+        fuel_price: 燃油單價 (USD/L)
+        operating_cost: 整趟營運成本 (USD)
+        catch_kg_per_trip: 基礎 CPUE × 作業天數 (kg)，純量或各目的地陣列
+        price_avg: 平均魚價 (USD/kg)，純量或各目的地陣列
+    
+    Returns:
+        (單程距離 nm, 總成本 USD, 預期收入 USD)，皆未四捨五入
+    """
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lons = np.ascontiguousarray(lons, dtype=np.float64)
+    pfz_scores = np.ascontiguousarray(pfz_scores, dtype=np.float64)
+    variability = np.ascontiguousarray(variability, dtype=np.float64)
+    n = lats.shape[0]
+    catch_kg_per_trip = np.ascontiguousarray(
+        np.broadcast_to(np.asarray(catch_kg_per_trip, dtype=np.float64), (n,))
+    )
+    price_avg = np.ascontiguousarray(
+        np.broadcast_to(np.asarray(price_avg, dtype=np.float64), (n,))
+    )
+    
+    if NUMBA_AVAILABLE:
+        return _score_destinations(
+            lat0, lon0, lats, lons, pfz_scores, variability,
+            fuel_per_nm, fuel_price, operating_cost, catch_kg_per_trip, price_avg
+        )
+    
+    lat1, lon1 = np.radians(lat0), np.radians(lon0)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    distance = EARTH_RADIUS_NM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    total_cost = distance * 2 * fuel_per_nm * fuel_price + operating_cost
+    revenue = catch_kg_per_trip * (0.5 + pfz_scores / 100) * variability * price_avg
+    
+    return distance, total_cost, revenue
+
+
+# ============================================
+# Numba 核心
+# ============================================
+
+if NUMBA_AVAILABLE:
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_destinations(
+        lat0, lon0, lats, lons, pfz_scores, variability,
+        fuel_per_nm, fuel_price, operating_cost, catch_kg_per_trip, price_avg
+    ):
+        """逐目的地融合計算距離、成本與收入"""
+        n = lats.shape[0]
+        distance = np.empty(n, dtype=np.float64)
+        total_cost = np.empty(n, dtype=np.float64)
+        revenue = np.empty(n, dtype=np.float64)
+        
+        lat1 = np.radians(lat0)
+        lon1 = np.radians(lon0)
+        cos_lat1 = np.cos(lat1)
+        fuel_cost_per_nm = 2.0 * fuel_per_nm * fuel_price  # 來回
+        
+        for k in prange(n):
+            lat2 = np.radians(lats[k])
+            dlat = lat2 - lat1
+            dlon = np.radians(lons[k]) - lon1
+            
+            a = np.sin(dlat / 2) ** 2 + cos_lat1 * np.cos(lat2) * np.sin(dlon / 2) ** 2
+            d = EARTH_RADIUS_NM * 2.0 * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+            
+            distance[k] = d
+            total_cost[k] = d * fuel_cost_per_nm + operating_cost
+            revenue[k] = (
+                catch_kg_per_trip[k] * (0.5 + pfz_scores[k] / 100.0)
+                * variability[k] * price_avg[k]
+            )
+        
+        return distance, total_cost, revenue
@@ -8,17 +8,29 @@ ROI (投資報酬率) 計算模組
 - 整體 ROI 分析
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Any, Union
 from datetime import datetime, timedelta
+from math import atan2, cos, pi, sin, sqrt
+from bisect import bisect_right
+from functools import lru_cache
 import logging
+import random
 
-import numpy as np
+# NumPy (與 numba 批次核心) 僅批次路徑需要，於首次呼叫時才載入以縮短冷啟動
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# 地球半徑 (海里)
+EARTH_RADIUS_NM = 3440.065
 
-@dataclass
+# 度 → 弧度 (以乘法取代 math.radians 呼叫)
+_DEG2RAD = pi / 180.0
+
+
+@dataclass(slots=True)
 class FuelCost:
     """燃油成本"""
     distance_nm: float           # 航程 (海里)
@@ -35,7 +47,7 @@ class FuelCost:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExpectedCatch:
     """預期漁獲"""
     species: str
@@ -54,7 +66,7 @@ class ExpectedCatch:
         }
 
 
-@dataclass 
+@dataclass(slots=True)
 class ROIResult:
     """
     ROI 分析結果
@@ -96,7 +108,7 @@ class ROIResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class VesselSpecs:
     """船舶規格"""
     name: str
@@ -174,6 +186,62 @@ MARKET_PRICES: Dict[str, Dict[str, float]] = {
 }
 
 
+# 各魚種平均價格 (USD/kg)，由 MARKET_PRICES 展平供單層查詢
+DEFAULT_PRICE = 5.0
+AVG_PRICES: Dict[str, float] = {
+    species: prices.get("price_avg", DEFAULT_PRICE)
+    for species, prices in MARKET_PRICES.items()
+}
+
+# 各魚種基礎 CPUE (kg/天)
+BASE_CPUE: Dict[str, float] = {
+    "bluefin_tuna": 30,
+    "yellowfin_tuna": 80,
+    "bigeye_tuna": 50,
+    "skipjack": 500,
+    "albacore": 100,
+    "swordfish": 40,
+    "mahi_mahi": 60
+}
+
+# 魚種整數編號 (依 MARKET_PRICES 順序)，未知魚種對應末尾的預設值
+SPECIES_IDS: Dict[str, int] = {species: i for i, species in enumerate(MARKET_PRICES)}
+_DEFAULT_SPECIES_ID = len(SPECIES_IDS)
+
+# 依魚種編號排列的平行價格欄 (USD/kg) 與 CPUE 欄 (kg/天)，末尾為預設值
+_PRICE_COLUMNS: Dict[str, Tuple[float, ...]] = {
+    price_type: tuple(
+        MARKET_PRICES[species].get(price_type, DEFAULT_PRICE) for species in SPECIES_IDS
+    ) + (DEFAULT_PRICE,)
+    for price_type in ("price_low", "price_avg", "price_high")
+}
+_CPUE_COLUMN: Tuple[float, ...] = tuple(
+    BASE_CPUE.get(species, 50) for species in SPECIES_IDS
+) + (50,)
+
+# ROI 建議分級 (bisect 查表，門檻由低至高)
+_ROI_BOUNDS = (0, 20, 50, 100)
+_ROI_RECOMMENDATIONS = (
+    "❌ 不建議。預期虧損，考慮其他漁場。",
+    "⚡ 邊際投資。可能接近損益平衡。",
+    "⚠️ 中等投資。利潤有限，需評估風險。",
+    "✅ 良好投資。預期有合理回報。",
+    "💰 極佳投資！預期回報優異，強烈建議出航。",
+)
+
+# 額外建議條件：航程過遠 (nm) 與 PFZ 分數偏低
+_FAR_DISTANCE_NM = 500
+_LOW_PFZ_SCORE = 50
+
+# 完整建議字串查表，索引為 等級 × 4 + 航程過遠 × 2 + PFZ 偏低
+_RECOMMENDATION_TABLE = tuple(
+    rec + far + low
+    for rec in _ROI_RECOMMENDATIONS
+    for far in ("", " 航程較遠，注意燃油儲備。")
+    for low in ("", " PFZ 分數偏低，漁況可能不佳。")
+)
+
+
 class ROICalculator:
     """
     ROI 計算器
@@ -194,7 +262,9 @@ class ROICalculator:
     def __init__(
         self,
         vessel_specs: Optional[VesselSpecs] = None,
-        fuel_price_usd_per_l: float = 0.8
+        fuel_price_usd_per_l: float = 0.8,
+        rng: Optional[random.Random] = None,
+        stochastic: bool = True
     ):
         """
         初始化 ROI 計算器
@@ -202,9 +272,16 @@ class ROICalculator:
         Args:
             vessel_specs: 船舶規格
             fuel_price_usd_per_l: 燃油價格 (USD/L)
+            rng: 漁獲變異用的亂數產生器 (預設為 random 模組全域實例)
+            stochastic: 是否加入漁獲隨機變異；False 時取期望值 (變異係數 1.0)
         """
         self.vessel = vessel_specs or VesselSpecs.default_longline()
         self.fuel_price = fuel_price_usd_per_l
+        self._rng = rng if rng is not None else random
+        self.stochastic = stochastic
+        
+        # 每海里燃油費用 (USD)
+        self._fuel_cost_per_nm = self.vessel.fuel_consumption_l_per_nm * self.fuel_price
     
     def calculate(
         self,
@@ -223,7 +300,7 @@ class ROICalculator:
             pfz_score: PFZ 分數 (0-100)
             target_species: 目標魚種
             operation_days: 作業天數
-            
+        
         Returns:
             ROIResult
         """
@@ -237,19 +314,19 @@ class ROICalculator:
         total_cost = fuel_cost.fuel_cost_usd + operating_cost
         
         # 3. 估算漁獲
-        expected_catches = self._estimate_catch(
+        expected_catch = self._estimate_catch(
             pfz_score, target_species, operation_days
         )
         
         # 4. 計算預期收入
-        expected_revenue = sum(c.estimated_value for c in expected_catches)
+        expected_revenue = expected_catch.estimated_value
         
         # 5. 計算淨利潤與 ROI
         net_profit = expected_revenue - total_cost
         roi_percentage = (net_profit / total_cost * 100) if total_cost > 0 else 0
         
         # 6. 計算損益平衡點
-        avg_price = self._get_market_price(target_species, "price_avg")
+        avg_price = AVG_PRICES.get(target_species, DEFAULT_PRICE)
         break_even_kg = total_cost / avg_price if avg_price > 0 else float('inf')
         
         # 7. 生成建議
@@ -264,7 +341,7 @@ class ROICalculator:
             roi_percentage=round(roi_percentage, 1),
             break_even_catch_kg=round(break_even_kg, 1),
             fuel_cost=fuel_cost,
-            expected_catches=expected_catches,
+            expected_catches=[expected_catch],
             recommendation=recommendation,
             details={
                 "distance_nm": distance,
@@ -274,28 +351,248 @@ class ROICalculator:
             }
         )
     
+    def calculate_many(
+        self,
+        origin: Tuple[float, float],
+        destinations: List[Tuple[float, float]],
+        pfz_scores: List[float],
+        target_species: str,
+        operation_days: int = 5
+    ) -> List[ROIResult]:
+        """
+        批次計算同一出發點至多個候選漁場的 ROI
+        
+        距離、成本與漁獲以陣列一次計算，結果與逐一呼叫 calculate 相同
+        (漁獲隨機變異各目的地獨立抽樣)。
+        
+        Args:
+            origin: 出發點 (lat, lon)
+            destinations: 候選漁場 (lat, lon) 列表
+            pfz_scores: 各漁場 PFZ 分數 (0-100)
+            target_species: 目標魚種
+            operation_days: 作業天數
+        
+        Returns:
+            與 destinations 順序相同的 ROIResult 列表
+        """
+        import numpy as np
+        
+        destinations = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+        pfz_scores = np.broadcast_to(
+            np.asarray(pfz_scores, dtype=np.float64), (len(destinations),)
+        )
+        
+        if len(destinations) == 0:
+            return []
+        
+        # 1. 燃油與營運成本
+        distance = self._calculate_distances_batch(origin, destinations)
+        total_distance = distance * 2  # 來回
+        consumption = total_distance * self.vessel.fuel_consumption_l_per_nm
+        fuel_cost_usd = np.round(total_distance * self._fuel_cost_per_nm, 2)
+        
+        operating_cost = self.vessel.operating_cost_per_day * operation_days
+        total_cost = fuel_cost_usd + operating_cost
+        
+        # 2. 漁獲估算 (同 _estimate_catch)
+        price = AVG_PRICES.get(target_species, DEFAULT_PRICE)
+        pfz_factor = 0.5 + (pfz_scores / 100) * 1.0
+        variability = np.array([self._catch_variability() for _ in range(len(destinations))])
+        
+        estimated_kg = (
+            BASE_CPUE.get(target_species, 50) * operation_days * pfz_factor * variability
+        )
+        expected_revenue = np.round(estimated_kg * price, 2)
+        confidence = np.minimum(0.9, 0.3 + pfz_scores / 150)
+        
+        # 3. 淨利潤、ROI 與損益平衡點
+        net_profit = expected_revenue - total_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi_percentage = np.where(total_cost > 0, net_profit / total_cost * 100, 0.0)
+        break_even_kg = total_cost / price if price > 0 else np.full(len(destinations), np.inf)
+        
+        recommendations = self._generate_recommendations_batch(
+            roi_percentage, pfz_scores, distance
+        )
+        
+        columns = zip(
+            distance.tolist(),
+            np.round(total_distance, 1).tolist(),
+            np.round(consumption, 1).tolist(),
+            fuel_cost_usd.tolist(),
+            np.round(estimated_kg, 1).tolist(),
+            expected_revenue.tolist(),
+            np.round(confidence, 2).tolist(),
+            np.round(total_cost, 2).tolist(),
+            np.round(net_profit, 2).tolist(),
+            roi_percentage.tolist(),
+            np.round(break_even_kg, 1).tolist(),
+            recommendations
+        )
+        
+        results = []
+        for (dist, trip_nm, fuel_l, fuel_usd, kg, revenue, conf,
+             cost, profit, roi, break_even, recommendation) in columns:
+            results.append(ROIResult(
+                expected_revenue=revenue,
+                total_cost=cost,
+                net_profit=profit,
+                roi_percentage=round(roi, 1),
+                break_even_catch_kg=break_even,
+                fuel_cost=FuelCost(
+                    distance_nm=trip_nm,
+                    fuel_consumption_l=fuel_l,
+                    fuel_cost_usd=fuel_usd,
+                    fuel_price_per_l=self.fuel_price
+                ),
+                expected_catches=[ExpectedCatch(
+                    species=target_species,
+                    estimated_kg=kg,
+                    price_per_kg=price,
+                    estimated_value=revenue,
+                    confidence=conf
+                )],
+                recommendation=recommendation,
+                details={
+                    "distance_nm": dist,
+                    "operation_days": operation_days,
+                    "operating_cost": operating_cost,
+                    "vessel": self.vessel.name
+                }
+            ))
+        
+        return results
+    
+    def score_destinations(
+        self,
+        origin: Tuple[float, float],
+        destinations: "np.ndarray",
+        pfz_scores: "np.ndarray",
+        target_species: Union[str, Sequence[str]],
+        operation_days: int = 5
+    ) -> "Dict[str, np.ndarray]":
+        """
+        大量候選漁場的 ROI 評分 (僅數值，不建立 ROIResult)
+        
+        距離、成本與收入於單次融合迴圈中計算 (安裝 numba 時 JIT 平行化)，
+        適合在數千個格點中篩選最佳漁場；需要完整結果時再對選出的
+        目的地呼叫 calculate / calculate_many。數值未四捨五入。
+        
+        Args:
+            origin: 出發點 (lat, lon)
+            destinations: (N, 2) 的 (lat, lon)
+            pfz_scores: 各漁場 PFZ 分數 (0-100)
+            target_species: 目標魚種，或與 destinations 等長的各目的地魚種
+            operation_days: 作業天數
+        
+        Returns:
+            含 distance_nm、total_cost、expected_revenue、net_profit、
+            roi_percentage 陣列的字典
+        """
+        import numpy as np
+        
+        try:
+            from ._roi_kernels import score_destinations
+        except ImportError:
+            from _roi_kernels import score_destinations
+        
+        destinations = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+        n = len(destinations)
+        pfz_scores = np.broadcast_to(np.asarray(pfz_scores, dtype=np.float64), (n,))
+        if self.stochastic:
+            bulk_rng = np.random.default_rng(self._rng.getrandbits(64))
+            variability = np.clip(bulk_rng.normal(1.0, 0.2, n), 0.5, 1.5)
+        else:
+            variability = np.ones(n)
+        
+        if isinstance(target_species, str):
+            species_id = SPECIES_IDS.get(target_species, _DEFAULT_SPECIES_ID)
+            cpue = _CPUE_COLUMN[species_id]
+            price = _PRICE_COLUMNS["price_avg"][species_id]
+        else:
+            # 各目的地魚種不同時以整數編號一次取出 CPUE 與價格
+            species_ids = np.fromiter(
+                (SPECIES_IDS.get(s, _DEFAULT_SPECIES_ID) for s in target_species),
+                dtype=np.intp, count=n
+            )
+            cpue = np.asarray(_CPUE_COLUMN, dtype=np.float64)[species_ids]
+            price = np.asarray(_PRICE_COLUMNS["price_avg"], dtype=np.float64)[species_ids]
+        
+        distance, total_cost, revenue = score_destinations(
+            origin[0], origin[1],
+            destinations[:, 0], destinations[:, 1],
+            pfz_scores, variability,
+            fuel_per_nm=self.vessel.fuel_consumption_l_per_nm,
+            fuel_price=self.fuel_price,
+            operating_cost=self.vessel.operating_cost_per_day * operation_days,
+            catch_kg_per_trip=cpue * operation_days,
+            price_avg=price
+        )
+        
+        net_profit = revenue - total_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi_percentage = np.where(total_cost > 0, net_profit / total_cost * 100, 0.0)
+        
+        return {
+            "distance_nm": distance,
+            "total_cost": total_cost,
+            "expected_revenue": revenue,
+            "net_profit": net_profit,
+            "roi_percentage": roi_percentage
+        }
+    
     def _calculate_distance(
         self,
         point1: Tuple[float, float],
         point2: Tuple[float, float]
     ) -> float:
         """計算兩點距離 (海里)"""
-        lat1, lon1 = np.radians(point1)
-        lat2, lon2 = np.radians(point2)
+        # 單點計算以 math 模組進行，避免 NumPy 純量的呼叫開銷
+        lat1 = point1[0] * _DEG2RAD
+        lat2 = point2[0] * _DEG2RAD
         
         dlat = lat2 - lat1
-        dlon = lon2 - lon1
+        dlon = (point2[1] - point1[1]) * _DEG2RAD
         
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+        c = 2 * atan2(sqrt(a), sqrt(1-a))
         
-        R_nm = 3440.065  # 地球半徑 (海里)
-        return R_nm * c
+        return EARTH_RADIUS_NM * c
+    
+    @staticmethod
+    def _calculate_distances_batch(
+        origins: "np.ndarray",
+        destinations: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        批次計算多組兩點距離 (海里)
+        
+        Args:
+            origins: (N, 2) 或單點 (2,) 的 (lat, lon)；單點時廣播至所有目的地
+            destinations: (N, 2) 的 (lat, lon)
+        
+        Returns:
+            (N,) 距離陣列
+        """
+        import numpy as np
+        
+        origins = np.radians(np.asarray(origins, dtype=np.float64))
+        destinations = np.radians(np.asarray(destinations, dtype=np.float64))
+        
+        lat1, lon1 = origins[..., 0], origins[..., 1]
+        lat2, lon2 = destinations[..., 0], destinations[..., 1]
+        
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        
+        return EARTH_RADIUS_NM * 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
     
     def _calculate_fuel_cost(self, distance_nm: float) -> FuelCost:
         """計算燃油成本"""
         consumption = distance_nm * self.vessel.fuel_consumption_l_per_nm
-        cost = consumption * self.fuel_price
+        cost = distance_nm * self._fuel_cost_per_nm
         
         return FuelCost(
             distance_nm=round(distance_nm, 1),
@@ -309,47 +606,43 @@ class ROICalculator:
         pfz_score: float,
         species: str,
         operation_days: int
-    ) -> List[ExpectedCatch]:
+    ) -> ExpectedCatch:
         """
-        估算漁獲量
+        估算目標魚種的漁獲量
         
         基於 PFZ 分數和歷史 CPUE 數據
         """
         # 基礎 CPUE (kg/天) 根據魚種
-        base_cpue = {
-            "bluefin_tuna": 30,
-            "yellowfin_tuna": 80,
-            "bigeye_tuna": 50,
-            "skipjack": 500,
-            "albacore": 100,
-            "swordfish": 40,
-            "mahi_mahi": 60
-        }
-        
-        cpue = base_cpue.get(species, 50)
+        cpue = BASE_CPUE.get(species, 50)
         
         # PFZ 分數調整 (分數越高，預期漁獲越多)
         pfz_factor = 0.5 + (pfz_score / 100) * 1.0  # 0.5-1.5
         
         # 隨機變異 (模擬)
-        variability = np.random.normal(1.0, 0.2)
-        variability = max(0.5, min(1.5, variability))
+        variability = self._catch_variability()
         
         estimated_kg = cpue * operation_days * pfz_factor * variability
         
-        price = self._get_market_price(species, "price_avg")
+        price = AVG_PRICES.get(species, DEFAULT_PRICE)
         estimated_value = estimated_kg * price
         
         # 信心度與 PFZ 分數相關
         confidence = min(0.9, 0.3 + pfz_score / 150)
         
-        return [ExpectedCatch(
+        return ExpectedCatch(
             species=species,
             estimated_kg=round(estimated_kg, 1),
             price_per_kg=price,
             estimated_value=round(estimated_value, 2),
             confidence=round(confidence, 2)
-        )]
+        )
+    
+    def _catch_variability(self) -> float:
+        """漁獲隨機變異係數 (常態分布，限制於 0.5-1.5)"""
+        if not self.stochastic:
+            return 1.0
+        v = self._rng.gauss(1.0, 0.2)
+        return 0.5 if v < 0.5 else 1.5 if v > 1.5 else v
     
     def _get_market_price(
         self,
@@ -357,8 +650,10 @@ class ROICalculator:
         price_type: str = "price_avg"
     ) -> float:
         """獲取市場價格"""
-        prices = MARKET_PRICES.get(species, {"price_avg": 5.0})
-        return prices.get(price_type, 5.0)
+        column = _PRICE_COLUMNS.get(price_type)
+        if column is None:
+            return DEFAULT_PRICE
+        return column[SPECIES_IDS.get(species, _DEFAULT_SPECIES_ID)]
     
     def _generate_recommendation(
         self,
@@ -368,44 +663,78 @@ class ROICalculator:
         distance: float
     ) -> str:
         """生成建議"""
-        if roi >= 100:
-            rec = "💰 極佳投資！預期回報優異，強烈建議出航。"
-        elif roi >= 50:
-            rec = "✅ 良好投資。預期有合理回報。"
-        elif roi >= 20:
-            rec = "⚠️ 中等投資。利潤有限，需評估風險。"
-        elif roi >= 0:
-            rec = "⚡ 邊際投資。可能接近損益平衡。"
-        else:
-            rec = "❌ 不建議。預期虧損，考慮其他漁場。"
-        
-        # 添加額外建議
-        if distance > 500:
-            rec += " 航程較遠，注意燃油儲備。"
-        
-        if pfz_score < 50:
-            rec += " PFZ 分數偏低，漁況可能不佳。"
+        return _RECOMMENDATION_TABLE[
+            bisect_right(_ROI_BOUNDS, roi) * 4
+            + (distance > _FAR_DISTANCE_NM) * 2
+            + (pfz_score < _LOW_PFZ_SCORE)
+        ]
+    
+    @staticmethod
+    def _generate_recommendations_batch(
+        roi: "np.ndarray",
+        pfz_scores: "np.ndarray",
+        distances: "np.ndarray"
+    ) -> List[str]:
+        """批次生成建議 (與 _generate_recommendation 共用查表)"""
+        import numpy as np
         
-        return rec
+        codes = (
+            np.digitize(roi, _ROI_BOUNDS) * 4
+            + (distances > _FAR_DISTANCE_NM) * 2
+            + (pfz_scores < _LOW_PFZ_SCORE)
+        )
+        return [_RECOMMENDATION_TABLE[code] for code in codes.tolist()]
+
+
+# 便捷函數共用的計算器 (預設船舶與燃油價格)
+_DEFAULT_CALC = ROICalculator(stochastic=False)
+_STOCHASTIC_CALC = ROICalculator()
+
+
+@lru_cache(maxsize=4096)
+def _calculate_roi_cached(
+    origin: Tuple[float, float],
+    destination: Tuple[float, float],
+    pfz_score: float,
+    target_species: str
+) -> ROIResult:
+    return _DEFAULT_CALC.calculate(origin, destination, pfz_score, target_species)
 
 
 def calculate_roi(
     origin: Tuple[float, float],
     destination: Tuple[float, float],
     pfz_score: float,
-    target_species: str = "yellowfin_tuna"
+    target_species: str = "yellowfin_tuna",
+    stochastic: bool = False
 ) -> ROIResult:
     """
     便捷函數：計算 ROI
     
+    預設以期望漁獲 (無隨機變異) 計算並快取；每次回傳快取結果的副本，
+    呼叫端修改回傳值不影響其他呼叫。
+    
     Args:
         origin: 出發點
         destination: 目標漁場
         pfz_score: PFZ 分數
         target_species: 目標魚種
-        
+        stochastic: 是否加入漁獲隨機變異 (不快取)
+    
     Returns:
         ROIResult
     """
-    calc = ROICalculator()
-    return calc.calculate(origin, destination, pfz_score, target_species)
+    if stochastic:
+        return _STOCHASTIC_CALC.calculate(origin, destination, pfz_score, target_species)
+    
+    result = _calculate_roi_cached(
+        tuple(origin), tuple(destination), float(pfz_score), target_species
+    )
+    
+    # 複製可變欄位 (details 的值皆為純量)
+    return replace(
+        result,
+        fuel_cost=replace(result.fuel_cost),
+        expected_catches=[replace(c) for c in result.expected_catches],
+        details=dict(result.details)
+    )
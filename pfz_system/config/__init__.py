@@ -13,6 +13,7 @@ try:
         FISHING_REGIONS,
         get_region,
         get_region_by_location,
+        get_regions_by_locations,
         get_regions_by_basin,
         list_all_regions
     )
@@ -22,7 +23,10 @@ try:
         SPECIES,
         get_species,
         get_species_by_category,
+        get_species_in_season,
         get_species_for_temperature,
+        score_all_species,
+        score_species_grid,
         list_all_species
     )
 except ImportError:
@@ -34,6 +38,7 @@ except ImportError:
         FISHING_REGIONS,
         get_region,
         get_region_by_location,
+        get_regions_by_locations,
         get_regions_by_basin,
         list_all_regions
     )
@@ -43,7 +48,10 @@ except ImportError:
         SPECIES,
         get_species,
         get_species_by_category,
+        get_species_in_season,
         get_species_for_temperature,
+        score_all_species,
+        score_species_grid,
         list_all_species
     )
 
@@ -59,6 +67,7 @@ __all__ = [
     "FISHING_REGIONS",
     "get_region",
     "get_region_by_location",
+    "get_regions_by_locations",
     "get_regions_by_basin",
     "list_all_regions",
     # Species
@@ -67,6 +76,9 @@ __all__ = [
     "SPECIES",
     "get_species",
     "get_species_by_category",
+    "get_species_in_season",
     "get_species_for_temperature",
+    "score_all_species",
+    "score_species_grid",
     "list_all_species",
 ]
@@ -0,0 +1,101 @@
+"""
+魚種棲息地評分數值核心
+
+對整個網格一次計算多個魚種的棲息地適宜度 (與 Species.get_habitat_score
+相同公式)，魚種偏好以 SoA 陣列傳入。
+
+安裝 numba 時以 JIT 編譯的平行迴圈執行，否則退回 NumPy 實作。
+"""
+
+import numpy as np
+
+# 嘗試載入 numba
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # 在主執行緒啟動平行執行緒層 (避免 TBB 層於程序結束時卡住)
+    numba.get_num_threads()
+
+try:
+    from .species import _habitat_score_array
+except ImportError:
+    from species import _habitat_score_array
+
+
+def score_grid(
+    sst: np.ndarray,
+    chla: np.ndarray,
+    temp_table: np.ndarray,
+    chla_table: np.ndarray
+) -> np.ndarray:
+    """
+    計算各魚種在每個網格點的棲息地適宜度
+    
+    Args:
+        sst: 海表溫度網格 (°C)，任意形狀
+        chla: 葉綠素濃度網格 (mg/m³)，形狀同 sst；NaN 視為無數據
+        temp_table: (N, 4) 溫度偏好 (最佳下限, 最佳上限, 容忍下限, 容忍上限)
+        chla_table: (N, 2) 葉綠素偏好 (下限, 上限)
+    
+    Returns:
+        (N, *sst.shape) 分數陣列 (0-100)
+    """
+    sst = np.asarray(sst, dtype=np.float64)
+    shape = sst.shape
+    sst_flat = np.ascontiguousarray(sst).ravel()
+    chla_flat = np.ascontiguousarray(np.broadcast_to(chla, shape), dtype=np.float64).ravel()
+    temp_table = np.ascontiguousarray(temp_table, dtype=np.float64)
+    chla_table = np.ascontiguousarray(chla_table, dtype=np.float64)
+    
+    if NUMBA_AVAILABLE:
+        out = np.empty((temp_table.shape[0], sst_flat.shape[0]), dtype=np.float64)
+        _score_grid(sst_flat, chla_flat, temp_table, chla_table, out)
+    else:
+        out = _habitat_score_array(
+            temp_table, chla_table, sst_flat[:, None], chla_flat[:, None]
+        ).T
+    
+    return out.reshape((temp_table.shape[0],) + shape)
+
+
+if NUMBA_AVAILABLE:
+    
+    # 不使用 fastmath：需保留 NaN 比較語意 (NaN 葉綠素 → 50 分)
+    @njit(parallel=True, cache=True)
+    def _score_grid(sst, chla, temp_table, chla_table, out):
+        """逐魚種、逐點計算棲息地適宜度，寫入 out (N, P)"""
+        for s in range(temp_table.shape[0]):
+            opt_lo = temp_table[s, 0]
+            opt_hi = temp_table[s, 1]
+            tol_lo = temp_table[s, 2]
+            tol_hi = temp_table[s, 3]
+            chla_lo = chla_table[s, 0]
+            chla_hi = chla_table[s, 1]
+            
+            for p in prange(sst.shape[0]):
+                t = sst[p]
+                if opt_lo <= t <= opt_hi:
+                    temp_score = 100.0
+                elif tol_lo <= t < opt_lo:
+                    temp_score = 100.0 * (t - tol_lo) / (opt_lo - tol_lo)
+                elif opt_hi < t <= tol_hi:
+                    temp_score = 100.0 * (tol_hi - t) / (tol_hi - opt_hi)
+                else:
+                    temp_score = 0.0
+                
+                c = chla[p]
+                if np.isnan(c):
+                    chla_score = 50.0
+                elif chla_lo <= c <= chla_hi:
+                    chla_score = 100.0
+                elif c < chla_lo:
+                    chla_score = max(0.0, 100.0 * c / chla_lo)
+                else:
+                    chla_score = max(0.0, 100.0 * (2.0 - c / chla_hi))
+                
+                out[s, p] = 0.7 * temp_score + 0.3 * chla_score
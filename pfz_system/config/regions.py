@@ -8,9 +8,16 @@
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
+from math import cos, pi
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
 
+import numpy as np
+
+# 度 → 弧度
+_DEG2RAD = pi / 180.0
+
 
 class OceanBasin(Enum):
     """海洋盆地"""
@@ -22,13 +29,25 @@ class OceanBasin(Enum):
     SOUTH_CHINA_SEA = "SCS"       # 南海
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RegionBounds:
-    """區域邊界定義"""
+    """區域邊界定義 (不可變，中心與面積於建構時計算一次)"""
     lat_min: float
     lat_max: float
     lon_min: float
     lon_max: float
+    _center: Tuple[float, float] = field(init=False, repr=False, compare=False)
+    _area_km2: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        lat_center = (self.lat_min + self.lat_max) / 2
+        lat_dist = 111.0 * (self.lat_max - self.lat_min)
+        lon_dist = 111.0 * cos(lat_center * _DEG2RAD) * (self.lon_max - self.lon_min)
+        # frozen dataclass 需透過 object.__setattr__ 寫入衍生欄位
+        object.__setattr__(
+            self, "_center", (lat_center, (self.lon_min + self.lon_max) / 2)
+        )
+        object.__setattr__(self, "_area_km2", lat_dist * lon_dist)
     
     def contains(self, lat: float, lon: float) -> bool:
         """檢查點是否在區域內"""
@@ -37,21 +56,14 @@ class RegionBounds:
     
     def center(self) -> Tuple[float, float]:
         """獲取區域中心"""
-        return (
-            (self.lat_min + self.lat_max) / 2,
-            (self.lon_min + self.lon_max) / 2
-        )
+        return self._center
     
     def area_km2(self) -> float:
         """估算面積 (平方公里)"""
-        import math
-        lat_center = (self.lat_min + self.lat_max) / 2
-        lat_dist = 111.0 * (self.lat_max - self.lat_min)
-        lon_dist = 111.0 * math.cos(math.radians(lat_center)) * (self.lon_max - self.lon_min)
-        return lat_dist * lon_dist
+        return self._area_km2
 
 
-@dataclass
+@dataclass(slots=True)
 class FishingRegion:
     """
     漁場區域定義
@@ -213,13 +225,38 @@ FISHING_REGIONS: Dict[str, FishingRegion] = {
 }
 
 
+# 區域邊界索引 (lat_min, lat_max, lon_min, lon_max, 區域)，查詢時免去屬性存取與方法呼叫
+_REGION_BOUNDS_INDEX: Tuple[Tuple[float, float, float, float, FishingRegion], ...] = tuple(
+    (r.bounds.lat_min, r.bounds.lat_max, r.bounds.lon_min, r.bounds.lon_max, r)
+    for r in FISHING_REGIONS.values()
+)
+
+
+# 魚種、海洋盆地 → 區域反向索引
+_SPECIES_TO_REGIONS: Dict[str, List[FishingRegion]] = {}
+_BASIN_TO_REGIONS: Dict[OceanBasin, List[FishingRegion]] = {}
+for _region in FISHING_REGIONS.values():
+    _BASIN_TO_REGIONS.setdefault(_region.basin, []).append(_region)
+    for _species in dict.fromkeys(_region.primary_species):
+        _SPECIES_TO_REGIONS.setdefault(_species, []).append(_region)
+del _region, _species
+
+
+# 批次查詢用的區域邊界陣列 (SoA，順序同 FISHING_REGIONS)
+_REGION_LIST: Tuple[FishingRegion, ...] = tuple(FISHING_REGIONS.values())
+_LAT_MIN = np.array([r.bounds.lat_min for r in _REGION_LIST])
+_LAT_MAX = np.array([r.bounds.lat_max for r in _REGION_LIST])
+_LON_MIN = np.array([r.bounds.lon_min for r in _REGION_LIST])
+_LON_MAX = np.array([r.bounds.lon_max for r in _REGION_LIST])
+
+
 def get_region(region_id: str) -> Optional[FishingRegion]:
     """
     根據 ID 獲取區域定義
     
     Args:
         region_id: 區域識別碼
-        
+    
     Returns:
         區域定義，不存在則返回 None
     """
@@ -233,15 +270,42 @@ def get_region_by_location(lat: float, lon: float) -> List[FishingRegion]:
     Args:
         lat: 緯度
         lon: 經度
-        
+    
     Returns:
         包含該位置的區域列表
     """
-    regions = []
-    for region in FISHING_REGIONS.values():
-        if region.bounds.contains(lat, lon):
-            regions.append(region)
-    return regions
+    return [
+        region
+        for lat_min, lat_max, lon_min, lon_max, region in _REGION_BOUNDS_INDEX
+        if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+    ]
+
+
+def get_regions_by_locations(
+    lats: np.ndarray,
+    lons: np.ndarray
+) -> List[List[FishingRegion]]:
+    """
+    批次獲取多個位置所屬的區域
+    
+    以 (位置 × 區域) 廣播比較一次完成所有包含判斷。
+    
+    Args:
+        lats: 緯度陣列
+        lons: 經度陣列
+    
+    Returns:
+        與輸入順序相同、各位置包含該點的區域列表
+    """
+    lats = np.asarray(lats, dtype=np.float64).reshape(-1, 1)
+    lons = np.asarray(lons, dtype=np.float64).reshape(-1, 1)
+    
+    mask = (
+        (_LAT_MIN <= lats) & (lats <= _LAT_MAX)
+        & (_LON_MIN <= lons) & (lons <= _LON_MAX)
+    )
+    
+    return [[_REGION_LIST[i] for i in np.flatnonzero(row)] for row in mask]
 
 
 def get_regions_by_basin(basin: OceanBasin) -> List[FishingRegion]:
@@ -250,11 +314,11 @@ def get_regions_by_basin(basin: OceanBasin) -> List[FishingRegion]:
     
     Args:
         basin: 海洋盆地
-        
+    
     Returns:
         該盆地的區域列表
     """
-    return [r for r in FISHING_REGIONS.values() if r.basin == basin]
+    return list(_BASIN_TO_REGIONS.get(basin, ()))
 
 
 def get_regions_for_species(species: str) -> List[FishingRegion]:
@@ -263,24 +327,29 @@ def get_regions_for_species(species: str) -> List[FishingRegion]:
     
     Args:
         species: 魚種名稱
-        
+    
     Returns:
         包含該魚種的區域列表
     """
-    return [
-        r for r in FISHING_REGIONS.values()
-        if species in r.primary_species
-    ]
+    return list(_SPECIES_TO_REGIONS.get(species, ()))
 
 
 def list_all_regions() -> List[Dict]:
     """
     列出所有區域摘要
     
+    區域定義為靜態資料，摘要只建立一次；每次返回淺拷貝。
+    
     Returns:
         區域摘要列表
     """
-    return [
+    return [dict(summary) for summary in _region_summaries()]
+
+
+@lru_cache(maxsize=1)
+def _region_summaries() -> Tuple[Dict, ...]:
+    """建立區域摘要 (快取)"""
+    return tuple(
         {
             "id": r.id,
             "name": r.name,
@@ -291,4 +360,4 @@ def list_all_regions() -> List[Dict]:
             "best_seasons": r.best_seasons
         }
         for r in FISHING_REGIONS.values()
-    ]
+    )
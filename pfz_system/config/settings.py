@@ -108,6 +108,19 @@ class AlgorithmConfig:
     # 熱點檢測參數
     hotspot_sst_range: tuple = (24.0, 30.0)  # °C
     hotspot_chla_min: float = 0.1  # mg/m³
+    
+    # 鄰近格點預取參數 (每次預取最多 8 格 × 4 項上游獲取，默認關閉)
+    prefetch_enabled: bool = field(
+        default_factory=lambda: os.getenv("PFZ_PREFETCH_NEIGHBORS", "false").lower() == "true"
+    )
+    prefetch_max_concurrent: int = 2  # 同時進行的預取上限，超過時略過
+    prefetch_resolution_deg: float = 0.5
+    prefetch_expansion_radius: int = 1  # 預取圈數 (1 = 周圍 8 格)
+    prefetch_cache_size: int = 4096
+    prefetch_cache_ttl_s: float = 900.0
+    
+    # 逐點網格預測的並行執行緒數
+    grid_workers: int = 16
 
 
 @dataclass
@@ -128,24 +141,27 @@ class NotificationConfig:
     daily_report_timezone: str = "Asia/Taipei"
 
 
-@dataclass
+# 頂層環境變數於載入時解析一次
+_PFZ_ENV = Environment(os.getenv("PFZ_ENV", "development"))
+_PFZ_DEBUG = os.getenv("PFZ_DEBUG", "false").lower() == "true"
+_PFZ_LOG_LEVEL = os.getenv("PFZ_LOG_LEVEL", "INFO")
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """
     主設定類
     
-    集中管理所有系統配置，支持環境變數覆蓋。
+    集中管理所有系統配置，支持環境變數覆蓋 (於模組載入時讀取)。
+    請透過 get_settings() 取得共用實例。
     
     Example:
-        >>> settings = Settings()
+        >>> settings = get_settings()
         >>> print(settings.api.open_meteo_base)
         >>> print(settings.algorithm.pfz_weights)
     """
-    environment: Environment = field(
-        default_factory=lambda: Environment(os.getenv("PFZ_ENV", "development"))
-    )
-    debug: bool = field(
-        default_factory=lambda: os.getenv("PFZ_DEBUG", "false").lower() == "true"
-    )
+    environment: Environment = _PFZ_ENV
+    debug: bool = _PFZ_DEBUG
     
     api: APIConfig = field(default_factory=APIConfig)
     data: DataConfig = field(default_factory=DataConfig)
@@ -153,9 +169,7 @@ class Settings:
     notification: NotificationConfig = field(default_factory=NotificationConfig)
     
     # 日誌設定
-    log_level: str = field(
-        default_factory=lambda: os.getenv("PFZ_LOG_LEVEL", "INFO")
-    )
+    log_level: str = _PFZ_LOG_LEVEL
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     def __post_init__(self):
@@ -8,9 +8,13 @@
 - 最佳捕捉條件
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
+import math
+
+import numpy as np
 
 
 class FishCategory(Enum):
@@ -30,7 +34,7 @@ class MigrationPattern(Enum):
     TRANS_OCEANIC = "trans_oceanic"  # 跨洋洄游
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TemperaturePreference:
     """溫度偏好"""
     optimal_min: float  # 最佳溫度下限 (°C)
@@ -50,18 +54,21 @@ class TemperaturePreference:
         """
         計算溫度偏好分數 (0-100)
         """
-        if self.is_optimal(temp):
+        # 直接比較欄位 (不經 is_optimal / is_tolerable 的方法呼叫)
+        opt_lo, opt_hi = self.optimal_min, self.optimal_max
+        if opt_lo <= temp <= opt_hi:
             return 100.0
-        elif self.is_tolerable(temp):
-            if temp < self.optimal_min:
-                return 100 * (temp - self.tolerance_min) / (self.optimal_min - self.tolerance_min)
-            else:
-                return 100 * (self.tolerance_max - temp) / (self.tolerance_max - self.optimal_max)
-        else:
-            return 0.0
+        
+        tol_lo, tol_hi = self.tolerance_min, self.tolerance_max
+        if tol_lo <= temp <= tol_hi:
+            if temp < opt_lo:
+                return 100 * (temp - tol_lo) / (opt_lo - tol_lo)
+            return 100 * (tol_hi - temp) / (tol_hi - opt_hi)
+        
+        return 0.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DepthPreference:
     """深度偏好"""
     day_min: float      # 白天最小深度 (m)
@@ -71,7 +78,56 @@ class DepthPreference:
     notes: str = ""
 
 
-@dataclass
+def _habitat_score_array(
+    temp_table: np.ndarray,
+    chla_table: np.ndarray,
+    sst: np.ndarray,
+    chla: np.ndarray
+) -> np.ndarray:
+    """
+    向量化的棲息地適宜度 (與 Species.get_habitat_score 相同公式)
+    
+    temp_table 末維為 (最佳下限, 最佳上限, 容忍下限, 容忍上限)，
+    chla_table 末維為 (下限, 上限)；與 sst、chla 依 NumPy 規則廣播。
+    chla 為 NaN 時葉綠素分數以 50 分計。
+    """
+    opt_lo, opt_hi, tol_lo, tol_hi = temp_table.T
+    chla_lo, chla_hi = chla_table.T
+    
+    # 溫度分數為梯形隸屬函數：兩側線性斜坡取較小者再截斷至 [0, 1]，
+    # 不需逐區段遮罩；NaN 溫度以 0 分計，與純量版相同
+    temp_scores = np.minimum(
+        (sst - tol_lo) / np.maximum(opt_lo - tol_lo, 1e-9),
+        (tol_hi - sst) / np.maximum(tol_hi - opt_hi, 1e-9)
+    )
+    # fmax 遇 NaN 取另一值，順帶將 NaN 轉為 0
+    temp_scores = np.minimum(np.fmax(temp_scores, 0.0), 1.0) * 100.0
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chla_scores = np.where(
+            (chla >= chla_lo) & (chla <= chla_hi), 100.0,
+            np.where(
+                chla < chla_lo,
+                np.maximum(0.0, 100 * chla / chla_lo),
+                np.maximum(0.0, 100 * (2 - chla / chla_hi))
+            )
+        )
+    chla_scores = np.where(np.isnan(chla), 50.0, chla_scores)
+    
+    return 0.7 * temp_scores + 0.3 * chla_scores
+
+
+# 魚種間共用的不可變子結構 (漁法、旺季、葉綠素範圍)
+_SHARED_TUPLES: Dict[tuple, tuple] = {}
+
+
+def _shared(values) -> tuple:
+    """轉為 tuple，內容相同者回傳同一物件"""
+    values = tuple(values)
+    return _SHARED_TUPLES.setdefault(values, values)
+
+
+@dataclass(frozen=True, slots=True)
 class Species:
     """
     魚種定義
@@ -99,10 +155,16 @@ class Species:
     depth: Optional[DepthPreference] = None
     chla_preference: Tuple[float, float] = (0.1, 1.0)  # mg/m³
     migration: MigrationPattern = MigrationPattern.SEASONAL
-    peak_seasons: List[int] = field(default_factory=list)
-    fishing_methods: List[str] = field(default_factory=list)
+    peak_seasons: Tuple[int, ...] = ()
+    fishing_methods: Tuple[str, ...] = ()
     notes: str = ""
     
+    def __post_init__(self):
+        # 轉為 tuple 並與其他魚種共用相同內容的物件
+        object.__setattr__(self, "chla_preference", _shared(self.chla_preference))
+        object.__setattr__(self, "peak_seasons", _shared(self.peak_seasons))
+        object.__setattr__(self, "fishing_methods", _shared(self.fishing_methods))
+    
     def get_habitat_score(
         self,
         sst: float,
@@ -113,16 +175,16 @@ class Species:
         
         Args:
             sst: 海表溫度 (°C)
-            chla: 葉綠素濃度 (mg/m³)
-            
+            chla: 葉綠素濃度 (mg/m³)，None 或 NaN 視為無數據
+        
         Returns:
             0-100 分數
         """
         # 溫度分數 (權重 70%)
         temp_score = self.temperature.preference_score(sst)
         
-        # 葉綠素分數 (權重 30%)
-        if chla is not None:
+        # 葉綠素分數 (權重 30%)；NaN 與向量版相同視為無數據
+        if chla is not None and not math.isnan(chla):
             chla_min, chla_max = self.chla_preference
             if chla_min <= chla <= chla_max:
                 chla_score = 100.0
@@ -134,6 +196,34 @@ class Species:
             chla_score = 50.0  # 無數據時給予中等分數
         
         return 0.7 * temp_score + 0.3 * chla_score
+    
+    def get_habitat_scores(
+        self,
+        sst: np.ndarray,
+        chla: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        批次計算多個點的棲息地適宜度分數 (get_habitat_score 的向量版)
+        
+        Args:
+            sst: 海表溫度陣列 (°C)
+            chla: 葉綠素濃度陣列 (mg/m³)，NaN 或 None 視為無數據
+        
+        Returns:
+            0-100 分數陣列
+        """
+        try:
+            from ._species_kernels import score_grid
+        except ImportError:
+            from _species_kernels import score_grid
+        
+        t = self.temperature
+        return score_grid(
+            sst,
+            np.nan if chla is None else chla,
+            np.array([[t.optimal_min, t.optimal_max, t.tolerance_min, t.tolerance_max]]),
+            np.array([self.chla_preference], dtype=np.float64)
+        )[0]
 
 
 # ============================================
@@ -159,8 +249,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.1, 0.5),
         migration=MigrationPattern.TRANS_OCEANIC,
-        peak_seasons=[4, 5, 6, 7],
-        fishing_methods=["延繩釣", "圍網"],
+        peak_seasons=(4, 5, 6, 7),
+        fishing_methods=("延繩釣", "圍網"),
         notes="高經濟價值，春季洄游至台灣東部"
     ),
     
@@ -180,8 +270,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.1, 0.8),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=list(range(1, 13)),  # 全年
-        fishing_methods=["延繩釣", "圍網", "竿釣"],
+        peak_seasons=tuple(range(1, 13)),  # 全年
+        fishing_methods=("延繩釣", "圍網", "竿釣"),
         notes="熱帶海域全年可捕獲"
     ),
     
@@ -202,8 +292,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.1, 0.5),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=[9, 10, 11, 12, 1, 2],
-        fishing_methods=["延繩釣"],
+        peak_seasons=(9, 10, 11, 12, 1, 2),
+        fishing_methods=("延繩釣",),
         notes="偏好較低溫深水層"
     ),
     
@@ -223,8 +313,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.1, 0.6),
         migration=MigrationPattern.TRANS_OCEANIC,
-        peak_seasons=[3, 4, 5, 9, 10, 11],
-        fishing_methods=["延繩釣", "曳繩釣"],
+        peak_seasons=(3, 4, 5, 9, 10, 11),
+        fishing_methods=("延繩釣", "曳繩釣"),
         notes="溫帶種，偏好鋒面區域"
     ),
     
@@ -244,8 +334,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.2, 1.0),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=list(range(1, 13)),
-        fishing_methods=["圍網", "竿釣"],
+        peak_seasons=tuple(range(1, 13)),
+        fishing_methods=("圍網", "竿釣"),
         notes="表層魚種，適合圍網作業"
     ),
     
@@ -266,8 +356,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.05, 0.3),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=[7, 8, 9, 10],
-        fishing_methods=["延繩釣", "鏢旗魚"],
+        peak_seasons=(7, 8, 9, 10),
+        fishing_methods=("延繩釣", "鏢旗魚"),
         notes="大型遊釣魚類"
     ),
     
@@ -288,8 +378,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.1, 0.5),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=[10, 11, 12, 1, 2, 3],
-        fishing_methods=["延繩釣", "鏢旗魚"],
+        peak_seasons=(10, 11, 12, 1, 2, 3),
+        fishing_methods=("延繩釣", "鏢旗魚"),
         notes="秋冬季較活躍"
     ),
     
@@ -310,8 +400,8 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.1, 0.8),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=[4, 5, 6, 7, 8, 9],
-        fishing_methods=["延繩釣", "曳繩釣", "竿釣"],
+        peak_seasons=(4, 5, 6, 7, 8, 9),
+        fishing_methods=("延繩釣", "曳繩釣", "竿釣"),
         notes="常聚集於漂流物下方"
     ),
     
@@ -333,20 +423,49 @@ SPECIES: Dict[str, Species] = {
         ),
         chla_preference=(0.3, 1.5),
         migration=MigrationPattern.SEASONAL,
-        peak_seasons=[6, 7, 8, 9, 10],
-        fishing_methods=["魷釣"],
+        peak_seasons=(6, 7, 8, 9, 10),
+        fishing_methods=("魷釣",),
         notes="使用集魚燈作業"
     ),
 }
 
 
+# SPECIES 於載入後不再變動；內部掃描一律走此 tuple
+_SPECIES_LIST: Tuple[Species, ...] = tuple(SPECIES.values())
+
+
+# 分類、旺季月份 → 魚種反向索引
+_BY_CATEGORY: Dict[FishCategory, List[Species]] = {}
+_BY_MONTH: Dict[int, List[Species]] = {}
+for _species in _SPECIES_LIST:
+    _BY_CATEGORY.setdefault(_species.category, []).append(_species)
+    for _month in dict.fromkeys(_species.peak_seasons):
+        _BY_MONTH.setdefault(_month, []).append(_species)
+del _species, _month
+
+
+# 魚種棲息偏好 SoA 陣列 (依 _SPECIES_LIST 順序)，供一次計算所有魚種
+_TEMP_TABLE = np.array([
+    [
+        s.temperature.optimal_min, s.temperature.optimal_max,
+        s.temperature.tolerance_min, s.temperature.tolerance_max
+    ]
+    for s in _SPECIES_LIST
+], dtype=np.float64)
+_CHLA_TABLE = np.array([s.chla_preference for s in _SPECIES_LIST], dtype=np.float64)
+_CATEGORY_CODES: Tuple[FishCategory, ...] = tuple(FishCategory)
+_CATEGORY_INDEX = np.array(
+    [_CATEGORY_CODES.index(s.category) for s in _SPECIES_LIST], dtype=np.int8
+)
+
+
 def get_species(species_id: str) -> Optional[Species]:
     """
     根據 ID 獲取魚種定義
     
     Args:
         species_id: 魚種識別碼
-        
+    
     Returns:
         魚種定義，不存在則返回 None
     """
@@ -359,11 +478,72 @@ def get_species_by_category(category: FishCategory) -> List[Species]:
     
     Args:
         category: 魚類分類
-        
+    
     Returns:
         該分類的魚種列表
     """
-    return [s for s in SPECIES.values() if s.category == category]
+    return list(_BY_CATEGORY.get(category, ()))
+
+
+def get_species_in_season(month: int) -> List[Species]:
+    """
+    獲取指定月份為旺季的魚種
+    
+    Args:
+        month: 月份 (1-12)
+    
+    Returns:
+        該月份為旺季的魚種列表
+    """
+    return list(_BY_MONTH.get(month, ()))
+
+
+def score_all_species(
+    sst: float,
+    chla: Optional[float] = None,
+    category: Optional[FishCategory] = None
+) -> np.ndarray:
+    """
+    一次計算所有魚種的棲息地適宜度
+    
+    Args:
+        sst: 海表溫度 (°C)
+        chla: 葉綠素濃度 (mg/m³)
+        category: 僅計算指定分類 (其餘魚種分數為 NaN)
+    
+    Returns:
+        (N,) 分數陣列，順序同 SPECIES
+    """
+    scores = _habitat_score_array(
+        _TEMP_TABLE, _CHLA_TABLE, sst, np.nan if chla is None else chla
+    )
+    if category is not None:
+        scores = np.where(
+            _CATEGORY_INDEX == _CATEGORY_CODES.index(category), scores, np.nan
+        )
+    return scores
+
+
+def score_species_grid(
+    sst: np.ndarray,
+    chla: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    一次計算所有魚種在整個網格的棲息地適宜度
+    
+    Args:
+        sst: 海表溫度網格 (°C)
+        chla: 葉綠素濃度網格 (mg/m³)，NaN 或 None 視為無數據
+    
+    Returns:
+        (N, *sst.shape) 分數陣列，魚種順序同 SPECIES
+    """
+    try:
+        from ._species_kernels import score_grid
+    except ImportError:
+        from _species_kernels import score_grid
+    
+    return score_grid(sst, np.nan if chla is None else chla, _TEMP_TABLE, _CHLA_TABLE)
 
 
 def get_species_for_temperature(sst: float, min_score: float = 50.0) -> List[Tuple[Species, float]]:
@@ -373,27 +553,33 @@ def get_species_for_temperature(sst: float, min_score: float = 50.0) -> List[Tup
     Args:
         sst: 海表溫度 (°C)
         min_score: 最低適宜度分數
-        
+    
     Returns:
         [(魚種, 分數), ...] 按分數降序排列
     """
-    results = []
-    for species in SPECIES.values():
-        score = species.get_habitat_score(sst)
-        if score >= min_score:
-            results.append((species, score))
+    scores = score_all_species(sst)
     
-    return sorted(results, key=lambda x: x[1], reverse=True)
+    idx = np.flatnonzero(scores >= min_score)
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return [(_SPECIES_LIST[i], score) for i, score in zip(idx.tolist(), scores[idx].tolist())]
 
 
 def list_all_species() -> List[Dict]:
     """
     列出所有魚種摘要
     
+    魚種定義為靜態資料，摘要只建立一次；每次返回淺拷貝。
+    
     Returns:
         魚種摘要列表
     """
-    return [
+    return [dict(summary) for summary in _species_summaries()]
+
+
+@lru_cache(maxsize=1)
+def _species_summaries() -> Tuple[Dict, ...]:
+    """建立魚種摘要 (快取)"""
+    return tuple(
         {
             "id": s.id,
             "name_zh": s.name_zh,
@@ -403,5 +589,5 @@ def list_all_species() -> List[Dict]:
             "peak_seasons": s.peak_seasons,
             "fishing_methods": s.fishing_methods
         }
-        for s in SPECIES.values()
-    ]
+        for s in _SPECIES_LIST
+    )
@@ -4,26 +4,23 @@ PFZ Data Module
 提供海洋數據獲取與處理功能。
 """
 
-try:
-    from .fetchers import (
-        BaseDataFetcher,
-        BoundingBox,
-        TimeRange,
-        FetchResult,
-        SSTFetcher,
-        ChlaFetcher,
-        SSHFetcher
-    )
-except ImportError:
-    from fetchers import (
-        BaseDataFetcher,
-        BoundingBox,
-        TimeRange,
-        FetchResult,
-        SSTFetcher,
-        ChlaFetcher,
-        SSHFetcher
-    )
+from .fetchers import (
+    BaseDataFetcher,
+    BoundingBox,
+    TimeRange,
+    FetchResult
+)
+
+
+def __getattr__(name: str):
+    # SSTFetcher 等獲取器由 data.fetchers 延遲載入
+    from . import fetchers
+    if name in fetchers._LAZY_FETCHERS:
+        value = getattr(fetchers, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseDataFetcher",
@@ -4,32 +4,35 @@ PFZ Data Fetchers Module
 提供海洋數據獲取功能。
 """
 
-try:
-    from .base import (
-        BaseDataFetcher,
-        BoundingBox,
-        TimeRange,
-        FetchResult,
-        CacheManager,
-        validate_coordinates,
-        haversine_distance
-    )
-    from .sst import SSTFetcher
-    from .chla import ChlaFetcher
-    from .ssh import SSHFetcher
-except ImportError:
-    from base import (
-        BaseDataFetcher,
-        BoundingBox,
-        TimeRange,
-        FetchResult,
-        CacheManager,
-        validate_coordinates,
-        haversine_distance
-    )
-    from sst import SSTFetcher
-    from chla import ChlaFetcher
-    from ssh import SSHFetcher
+from .base import (
+    BaseDataFetcher,
+    BoundingBox,
+    TimeRange,
+    FetchResult,
+    CacheManager,
+    validate_coordinates,
+    haversine_distance,
+    haversine_distance_many
+)
+
+# 各數據源獲取器依賴 pandas / requests，首次存取時才載入對應模組
+_LAZY_FETCHERS = {
+    "SSTFetcher": ".sst",
+    "ChlaFetcher": ".chla",
+    "SSHFetcher": ".ssh",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_FETCHERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Base
@@ -40,6 +43,7 @@ __all__ = [
     "CacheManager",
     "validate_coordinates",
     "haversine_distance",
+    "haversine_distance_many",
     # Fetchers
     "SSTFetcher",
     "ChlaFetcher",
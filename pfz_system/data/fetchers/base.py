@@ -9,25 +9,48 @@ Data Fetchers Base Module
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, TypeVar, Generic
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, TypeVar, Generic
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
+from math import asin, cos, pi, sin, sqrt
 import hashlib
-import json
+import importlib.util
 import logging
+import pickle
+import threading
 import time
 
-import requests
-import pandas as pd
 import numpy as np
 
+# requests / urllib3 延遲至建立獲取器時才載入，只用到 BoundingBox 或距離函數時不需付出載入成本
+if TYPE_CHECKING:
+    import requests
+
+# numba 載入約需 0.3 秒，僅檢查是否安裝；JIT 核心於首次批次距離計算時才編譯
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# 嘗試載入 zstandard (快取壓縮)
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 地球半徑 (km)
+EARTH_RADIUS_KM = 6371.0
+_DEG2RAD = pi / 180.0
+_HALF_DEG2RAD = _DEG2RAD / 2
+_EARTH_DIAMETER_KM = 2 * EARTH_RADIUS_KM
+
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundingBox:
     """
     地理邊界框
@@ -50,6 +73,56 @@ class BoundingBox:
         if not (-180 <= self.lon_min <= self.lon_max <= 180):
             raise ValueError(f"Invalid longitudes: {self.lon_min}, {self.lon_max}")
     
+    @classmethod
+    def from_arrays(
+        cls,
+        lat_min: np.ndarray,
+        lat_max: np.ndarray,
+        lon_min: np.ndarray,
+        lon_max: np.ndarray
+    ) -> List["BoundingBox"]:
+        """
+        批次建立邊界框 (網格切塊用)
+        
+        整批邊界以陣列一次驗證，個別實例不再重複執行 __post_init__。
+        
+        Args:
+            lat_min, lat_max, lon_min, lon_max: 等長的邊界陣列
+        
+        Returns:
+            BoundingBox 列表
+        
+        Raises:
+            ValueError: 任一邊界框無效
+        """
+        lat_min, lat_max, lon_min, lon_max = (
+            np.asarray(a, dtype=np.float64).ravel()
+            for a in (lat_min, lat_max, lon_min, lon_max)
+        )
+        
+        valid = (
+            (-90 <= lat_min) & (lat_min <= lat_max) & (lat_max <= 90)
+            & (-180 <= lon_min) & (lon_min <= lon_max) & (lon_max <= 180)
+        )
+        if not valid.all():
+            k = int(np.argmin(valid))
+            raise ValueError(
+                f"Invalid bounds at index {k}: "
+                f"lat {lat_min[k]}, {lat_max[k]}; lon {lon_min[k]}, {lon_max[k]}"
+            )
+        
+        boxes = []
+        for a, b, c, d in zip(
+            lat_min.tolist(), lat_max.tolist(), lon_min.tolist(), lon_max.tolist()
+        ):
+            box = cls.__new__(cls)
+            box.lat_min = a
+            box.lat_max = b
+            box.lon_min = c
+            box.lon_max = d
+            boxes.append(box)
+        return boxes
+    
     def center(self) -> tuple:
         """返回中心點"""
         return (
@@ -76,7 +149,7 @@ class BoundingBox:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeRange:
     """
     時間範圍
@@ -116,7 +189,7 @@ class TimeRange:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FetchResult(Generic[T]):
     """
     數據獲取結果
@@ -124,28 +197,54 @@ class FetchResult(Generic[T]):
     Attributes:
         data: 獲取的數據
         source: 數據來源
-        timestamp: 獲取時間
+        fetched_at: 獲取時間 (epoch 秒)
         is_cached: 是否來自快取
         metadata: 額外元數據
     """
     data: T
     source: str
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    fetched_at: float = field(default_factory=time.time)
     is_cached: bool = False
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    @property
+    def timestamp(self) -> datetime:
+        """獲取時間 (UTC)；建立結果時只記錄 epoch 秒，需要時才轉為 datetime"""
+        return datetime.utcfromtimestamp(self.fetched_at)
+    
     @property
     def is_valid(self) -> bool:
         """檢查數據是否有效"""
         return self.data is not None
 
 
+# 快取檔案樣式 (含舊版 JSON 快取，清除時一併移除)
+_CACHE_PATTERNS = ("*.pkl.zst", "*.pkl", "*.json")
+
+# 快取讀取失敗 (損毀、截斷或格式不符) 時視為未命中
+_CACHE_READ_ERRORS: tuple = (
+    pickle.UnpicklingError, EOFError, KeyError, TypeError, ValueError, OSError
+)
+if ZSTD_AVAILABLE:
+    _CACHE_READ_ERRORS += (zstd.ZstdError,)
+
+
+@lru_cache(maxsize=4096)
+def _cache_path(cache_dir: Path, key: str, suffix: str) -> Path:
+    """快取鍵 → 檔案路徑 (BLAKE2b-80 雜湊；重複查詢同一鍵時直接取用)"""
+    key_hash = hashlib.blake2b(key.encode("utf-8"), digest_size=10).hexdigest()
+    return cache_dir / f"{key_hash}{suffix}"
+
+
 class CacheManager:
     """
     快取管理器
     
     提供基於檔案的數據快取，支持 TTL 過期機制。
     
+    數據以 pickle (protocol 5) 二進位格式保存，可直接存放 NumPy 陣列與
+    datetime；安裝 zstandard 時另行壓縮。快取檔僅由本程式寫入與讀取。
+    
     Example:
         >>> cache = CacheManager(cache_dir=Path("./cache"), ttl_hours=6)
         >>> cache.set("my_key", {"data": [1, 2, 3]})
@@ -172,11 +271,34 @@ class CacheManager:
         
         if enabled:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        if ZSTD_AVAILABLE:
+            self._suffix = ".pkl.zst"
+        else:
+            self._suffix = ".pkl"
     
     def _get_cache_path(self, key: str) -> Path:
         """生成快取檔案路徑"""
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.json"
+        return _cache_path(self.cache_dir, key, self._suffix)
+    
+    def _dumps(self, payload: Dict[str, Any]) -> bytes:
+        """序列化 (並壓縮) 快取內容"""
+        raw = pickle.dumps(payload, protocol=5)
+        # zstd (解)壓縮器不可跨執行緒共用 (fetch_batch 會並行存取快取)，每次另建
+        return zstd.ZstdCompressor(level=3).compress(raw) if ZSTD_AVAILABLE else raw
+    
+    def _load(self, cache_path: Path) -> Dict[str, Any]:
+        """
+        自檔案串流解壓縮並還原快取內容
+        
+        直接由檔案物件反序列化，不先讀入整個檔案，大型網格快取的
+        記憶體峰值約為整檔讀取的一半。
+        """
+        with open(cache_path, "rb") as f:
+            if ZSTD_AVAILABLE:
+                with zstd.ZstdDecompressor().stream_reader(f) as reader:
+                    return pickle.load(reader)
+            return pickle.load(f)
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -184,7 +306,7 @@ class CacheManager:
         
         Args:
             key: 快取鍵
-            
+        
         Returns:
             快取數據，不存在或過期則返回 None
         """
@@ -193,22 +315,19 @@ class CacheManager:
         
         cache_path = self._get_cache_path(key)
         
-        if not cache_path.exists():
-            return None
-        
         try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                cached = json.load(f)
+            cached = self._load(cache_path)
             
-            # 檢查過期
-            cached_time = datetime.fromisoformat(cached["timestamp"])
-            if datetime.utcnow() - cached_time > timedelta(hours=self.ttl_hours):
+            # 檢查過期 (timestamp 為 Unix 時間)
+            if time.time() - cached["timestamp"] > self.ttl_hours * 3600:
                 cache_path.unlink()
                 return None
             
             return cached["data"]
-            
-        except (json.JSONDecodeError, KeyError) as e:
+        
+        except FileNotFoundError:
+            return None
+        except _CACHE_READ_ERRORS as e:
             logger.warning(f"Cache read error for {key}: {e}")
             return None
     
@@ -219,7 +338,7 @@ class CacheManager:
         Args:
             key: 快取鍵
             data: 要快取的數據
-            
+        
         Returns:
             是否成功
         """
@@ -229,14 +348,13 @@ class CacheManager:
         cache_path = self._get_cache_path(key)
         
         try:
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "key": key,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "data": data
-                }, f)
+            cache_path.write_bytes(self._dumps({
+                "key": key,
+                "timestamp": time.time(),
+                "data": data
+            }))
             return True
-            
+        
         except Exception as e:
             logger.warning(f"Cache write error for {key}: {e}")
             return False
@@ -249,9 +367,10 @@ class CacheManager:
             清除的檔案數量
         """
         count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
-            count += 1
+        for pattern in _CACHE_PATTERNS:
+            for cache_file in self.cache_dir.glob(pattern):
+                cache_file.unlink()
+                count += 1
         return count
 
 
@@ -265,6 +384,13 @@ class BaseDataFetcher(ABC):
         - fetch(): 實際的數據獲取邏輯
     """
     
+    # HTTP 連線池 (平行抓取多個區塊時避免排隊等待連線)
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+    
+    # 視為暫時性錯誤而重試的狀態碼
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    
     def __init__(
         self,
         timeout: int = 30,
@@ -287,11 +413,35 @@ class BaseDataFetcher(ABC):
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util import Retry, make_headers
+        
         self.session = requests.Session()
         self.session.headers.update({
-            "User-Agent": "PFZ-System/1.0"
+            "User-Agent": "PFZ-System/1.0",
+            # 依已安裝的解碼器 (brotli / zstandard) 宣告可接受的壓縮格式
+            "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"]
         })
         
+        # 重試由 urllib3 處理：連線錯誤與暫時性狀態碼以指數退避重試，
+        # 共嘗試 max_retries 次；重試用盡時回傳最後的響應交由 raise_for_status
+        retry = Retry(
+            total=max(max_retries - 1, 0),
+            backoff_factor=retry_delay,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         self.cache = CacheManager(
             cache_dir=Path("./cache") / self.__class__.__name__.lower(),
             ttl_hours=cache_ttl_hours,
@@ -303,43 +453,28 @@ class BaseDataFetcher(ABC):
         url: str,
         params: Optional[Dict] = None,
         method: str = "GET"
-    ) -> requests.Response:
+    ) -> "requests.Response":
         """
-        發送 HTTP 請求，帶自動重試
+        發送 HTTP 請求 (重試由 session 的 HTTPAdapter 處理)
         
         Args:
             url: 請求 URL
             params: 查詢參數
             method: HTTP 方法
-            
+        
         Returns:
             響應對象
-            
+        
         Raises:
             requests.RequestException: 所有重試失敗後
         """
-        last_exception = None
+        if method.upper() == "GET":
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        else:
+            response = self.session.post(url, json=params, timeout=self.timeout)
         
-        for attempt in range(self.max_retries):
-            try:
-                if method.upper() == "GET":
-                    response = self.session.get(url, params=params, timeout=self.timeout)
-                else:
-                    response = self.session.post(url, json=params, timeout=self.timeout)
-                
-                response.raise_for_status()
-                return response
-                
-            except requests.RequestException as e:
-                last_exception = e
-                wait_time = self.retry_delay * (2 ** attempt)
-                logger.warning(
-                    f"Request failed (attempt {attempt + 1}/{self.max_retries}): {e}. "
-                    f"Retrying in {wait_time:.1f}s..."
-                )
-                time.sleep(wait_time)
-        
-        raise last_exception or requests.RequestException("Unknown error")
+        response.raise_for_status()
+        return response
     
     def _generate_cache_key(self, *args, **kwargs) -> str:
         """
@@ -347,7 +482,7 @@ class BaseDataFetcher(ABC):
         
         Args:
             *args, **kwargs: 用於生成鍵的參數
-            
+        
         Returns:
             快取鍵字串
         """
@@ -368,12 +503,32 @@ class BaseDataFetcher(ABC):
         Args:
             bbox: 地理邊界框
             time_range: 時間範圍 (可選)
-            
+        
         Returns:
             FetchResult 數據結果
         """
         pass
     
+    def fetch_point_native(
+        self,
+        lat: float,
+        lon: float,
+        time_range: Optional[TimeRange] = None
+    ) -> Optional[FetchResult]:
+        """
+        以數據源的單點查詢獲取數據 (子類可覆寫)
+        
+        Args:
+            lat: 緯度
+            lon: 經度
+            time_range: 時間範圍
+        
+        Returns:
+            FetchResult 數據結果；不支援或查詢失敗時返回 None，
+            由 fetch_point 改以小邊界框獲取
+        """
+        return None
+    
     def fetch_point(
         self,
         lat: float,
@@ -387,11 +542,16 @@ class BaseDataFetcher(ABC):
             lat: 緯度
             lon: 經度
             time_range: 時間範圍
-            
+        
         Returns:
             FetchResult 數據結果
         """
-        # 創建一個小的邊界框
+        # 數據源支援單點查詢時只取一個像素
+        native = self.fetch_point_native(lat, lon, time_range)
+        if native is not None:
+            return native
+        
+        # 否則創建一個小的邊界框
         bbox = BoundingBox(
             lat_min=lat - 0.1,
             lat_max=lat + 0.1,
@@ -399,6 +559,41 @@ class BaseDataFetcher(ABC):
             lon_max=lon + 0.1
         )
         return self.fetch(bbox, time_range)
+    
+    def fetch_batch(
+        self,
+        bboxes: List[BoundingBox],
+        time_range: Optional[TimeRange] = None,
+        max_workers: Optional[int] = None
+    ) -> List[FetchResult]:
+        """
+        平行獲取多個區塊的數據
+        
+        各區塊以執行緒並行呼叫 fetch()，網路等待時間彼此重疊；
+        連線由 session 的連線池共用。
+        
+        Args:
+            bboxes: 地理邊界框列表
+            time_range: 時間範圍 (可選)
+            max_workers: 最大並行數，預設為 min(區塊數, POOL_MAXSIZE)
+        
+        Returns:
+            與 bboxes 順序相同的 FetchResult 列表；單一區塊失敗時
+            其結果 data 為 None，metadata 含錯誤訊息
+        """
+        if not bboxes:
+            return []
+        
+        def fetch_one(bbox: BoundingBox) -> FetchResult:
+            try:
+                return self.fetch(bbox, time_range)
+            except Exception as e:
+                logger.warning(f"Batch fetch failed for {bbox}: {e}")
+                return FetchResult(data=None, source="none", metadata={"error": str(e)})
+        
+        workers = max_workers or min(len(bboxes), self.POOL_MAXSIZE)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch_one, bboxes))
 
 
 def validate_coordinates(lat: float, lon: float) -> bool:
@@ -408,7 +603,7 @@ def validate_coordinates(lat: float, lon: float) -> bool:
     Args:
         lat: 緯度
         lon: 經度
-        
+    
     Returns:
         是否有效
     """
@@ -427,18 +622,103 @@ def haversine_distance(
     Args:
         lat1, lon1: 第一點座標
         lat2, lon2: 第二點座標
-        
+    
     Returns:
         距離 (公里)
     """
-    R = 6371.0  # 地球半徑 (km)
+    # 單點計算以 math 模組進行，避免 NumPy 純量的 ufunc 呼叫開銷；
+    # 陣列輸入請使用 haversine_distance_many
+    sin_dlat = sin((lat2 - lat1) * _HALF_DEG2RAD)
+    sin_dlon = sin((lon2 - lon1) * _HALF_DEG2RAD)
+    
+    a = sin_dlat * sin_dlat + cos(lat1 * _DEG2RAD) * cos(lat2 * _DEG2RAD) * sin_dlon * sin_dlon
+    # asin(sqrt(a)) 與 atan2(sqrt(a), sqrt(1 - a)) 等價，少一次 sqrt；
+    # 截斷避免捨入誤差使 a 略大於 1
+    if a > 1.0:
+        a = 1.0
+    return _EARTH_DIAMETER_KM * asin(sqrt(a))
+
+
+def haversine_distance_many(
+    lat1: float,
+    lon1: float,
+    lat2: np.ndarray,
+    lon2: np.ndarray
+) -> np.ndarray:
+    """
+    計算一點至多點的大圓距離 (公里)
+    
+    安裝 numba 時以 JIT 迴圈計算，否則使用 NumPy 向量運算；
+    兩者公式與 haversine_distance 相同 (截斷後的 asin)。
+    
+    Args:
+        lat1, lon1: 起點座標
+        lat2, lon2: 終點座標陣列 (任意形狀，可互相廣播)
+    
+    Returns:
+        距離陣列 (公里)，形狀同 lat2 與 lon2 廣播後的形狀
+    """
+    lat2, lon2 = np.broadcast_arrays(
+        np.asarray(lat2, dtype=np.float64), np.asarray(lon2, dtype=np.float64)
+    )
+    
+    kernel = _haversine_kernel()
+    if kernel is not None:
+        out = kernel(float(lat1), float(lon1), lat2.ravel(), lon2.ravel())
+        return out.reshape(lat2.shape)
+    
+    sin_dlat = np.sin((lat2 - lat1) * _HALF_DEG2RAD)
+    sin_dlon = np.sin((lon2 - lon1) * _HALF_DEG2RAD)
+    
+    a = sin_dlat * sin_dlat + cos(lat1 * _DEG2RAD) * np.cos(lat2 * _DEG2RAD) * sin_dlon * sin_dlon
+    return _EARTH_DIAMETER_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# 批次距離 JIT 核心 (首次由主執行緒呼叫時建立)
+_haversine_jit: Optional[Callable] = None
+
+
+def _haversine_kernel() -> Optional[Callable]:
+    """
+    取得批次距離 JIT 核心，尚未建立或未安裝 numba 時返回 None
     
-    lat1_rad = np.radians(lat1)
-    lat2_rad = np.radians(lat2)
-    dlat = np.radians(lat2 - lat1)
-    dlon = np.radians(lon2 - lon1)
+    numba 平行執行緒層須於主執行緒啟動，於工作執行緒首次啟動時
+    TBB 層會使程序結束時卡住；因此核心只由主執行緒建立，建立前
+    工作執行緒的呼叫使用 NumPy 版 (結果相同)。
+    """
+    global _haversine_jit
     
-    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
-    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    if (
+        _haversine_jit is None
+        and NUMBA_AVAILABLE
+        and threading.current_thread() is threading.main_thread()
+    ):
+        _haversine_jit = _build_haversine_kernel()
+    
+    return _haversine_jit
+
+
+def _build_haversine_kernel() -> Callable:
+    """載入 numba 並定義批次距離核心"""
+    import numba
+    from numba import njit, prange
+    
+    numba.get_num_threads()
+    
+    # 不使用 fastmath：NaN 座標與 NumPy 版同樣得到 NaN
+    @njit(parallel=True, cache=True)
+    def kernel(lat1, lon1, lat2, lon2):
+        """逐點計算大圓距離，起點三角函數只算一次"""
+        n = lat2.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        cos_lat1 = np.cos(lat1 * _DEG2RAD)
+        
+        for k in prange(n):
+            sin_dlat = np.sin((lat2[k] - lat1) * _HALF_DEG2RAD)
+            sin_dlon = np.sin((lon2[k] - lon1) * _HALF_DEG2RAD)
+            a = sin_dlat * sin_dlat + cos_lat1 * np.cos(lat2[k] * _DEG2RAD) * sin_dlon * sin_dlon
+            out[k] = _EARTH_DIAMETER_KM * np.arcsin(np.sqrt(min(a, 1.0)))
+        
+        return out
     
-    return R * c
+    return kernel
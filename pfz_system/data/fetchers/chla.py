@@ -46,6 +46,10 @@ class ChlaFetcher(BaseDataFetcher):
     # NOAA CoastWatch ERDDAP
     BASE_URL = "https://coastwatch.pfeg.noaa.gov/erddap"
     
+    # 生產力等級門檻 (mg/m³) 與對應等級
+    PRODUCTIVITY_THRESHOLDS = (0.1, 0.3, 1.0)
+    PRODUCTIVITY_CLASSES = ("oligotrophic", "mesotrophic", "eutrophic", "hypereutrophic")
+    
     # 可用數據集 (按優先順序)
     DATASETS = [
         {
@@ -72,6 +76,7 @@ class ChlaFetcher(BaseDataFetcher):
         self,
         dataset_id: Optional[str] = None,
         base_url: Optional[str] = None,
+        rng: Optional[np.random.Generator] = None,
         **kwargs
     ):
         """
@@ -80,10 +85,12 @@ class ChlaFetcher(BaseDataFetcher):
         Args:
             dataset_id: ERDDAP 數據集 ID
             base_url: ERDDAP 服務 URL
+            rng: 模擬數據用的亂數產生器 (預設為新建的 PCG64 產生器)
             **kwargs: 傳遞給 BaseDataFetcher 的參數
         """
         super().__init__(**kwargs)
         self.base_url = base_url or self.BASE_URL
+        self._rng = rng if rng is not None else np.random.default_rng()
         
         # 設定數據集
         if dataset_id:
@@ -105,7 +112,7 @@ class ChlaFetcher(BaseDataFetcher):
         Args:
             bbox: 地理邊界框
             time_range: 時間範圍，默認為最近 8 天
-            
+        
         Returns:
             包含 Chl-a 數據的 FetchResult
         """
@@ -133,7 +140,8 @@ class ChlaFetcher(BaseDataFetcher):
             try:
                 df = self._fetch_from_erddap(bbox, time_range, dataset)
                 if df is not None and not df.empty:
-                    self.cache.set(cache_key, df.to_dict("records"))
+                    # DataFrame 直接寫入快取 (pickle 保留欄式區塊與 dtype，讀回免逐列重建)
+                    self.cache.set(cache_key, df)
                     return FetchResult(
                         data=df,
                         source=f"erddap:{dataset['id']}",
@@ -153,6 +161,43 @@ class ChlaFetcher(BaseDataFetcher):
             metadata={"warning": "synthetic data for testing"}
         )
     
+    def fetch_point_native(
+        self,
+        lat: float,
+        lon: float,
+        time_range: Optional[TimeRange] = None
+    ) -> Optional[FetchResult[pd.DataFrame]]:
+        """
+        以 ERDDAP 單點查詢獲取 Chl-a (取最近網格點，只下載一個像素)
+        
+        Args:
+            lat: 緯度
+            lon: 經度
+            time_range: 時間範圍，默認為最近 8 天
+        
+        Returns:
+            包含 Chl-a 數據的 FetchResult，各數據集皆失敗時返回 None
+        """
+        if time_range is None:
+            time_range = TimeRange.last_n_days(8)
+        
+        point = BoundingBox(lat, lat, lon, lon)
+        for dataset in self.DATASETS:
+            try:
+                df = self._fetch_from_erddap(point, time_range, dataset)
+            except Exception as e:
+                logger.debug(f"Chl-a point fetch from {dataset['id']} failed: {e}")
+                continue
+            
+            if df is not None and not df.empty:
+                return FetchResult(
+                    data=df,
+                    source=f"erddap:{dataset['id']}",
+                    metadata={"resolution_km": dataset["resolution_km"]}
+                )
+        
+        return None
+    
     def _fetch_from_erddap(
         self,
         bbox: BoundingBox,
@@ -166,7 +211,7 @@ class ChlaFetcher(BaseDataFetcher):
             bbox: 邊界框
             time_range: 時間範圍
             dataset: 數據集配置
-            
+        
         Returns:
             Chl-a 數據 DataFrame
         """
@@ -198,21 +243,18 @@ class ChlaFetcher(BaseDataFetcher):
         if not rows:
             return None
         
-        df = pd.DataFrame(rows, columns=column_names)
+        # 建構時即使用標準化列名
+        names = {"latitude": "lat", "longitude": "lon", variable: "chla"}
+        df = pd.DataFrame(rows, columns=[names.get(c, c) for c in column_names])
         
-        # 標準化列名
-        df = df.rename(columns={
-            "time": "time",
-            "latitude": "lat",
-            "longitude": "lon",
-            variable: "chla"
-        })
-        
-        # 過濾無效值
-        df = df[df["chla"].notna()]
-        df = df[df["chla"] >= 0]  # Chl-a 不能為負
-        df = df[df["chla"] < 100]  # 過濾異常高值
+        # 過濾無效值 (單一遮罩只複製一次)：Chl-a 不能為負、過濾異常高值；
+        # NaN 的比較結果為 False，一併濾除
+        chla = df["chla"].to_numpy(dtype=np.float64)
         
+        # 座標與數值以 float32 儲存 (遠高於資料精度)，記憶體與快取減半
+        df = df[(chla >= 0) & (chla < 100)].astype(
+            {"lat": np.float32, "lon": np.float32, "chla": np.float32}
+        )
         df["time"] = pd.to_datetime(df["time"])
         
         return df
@@ -228,34 +270,29 @@ class ChlaFetcher(BaseDataFetcher):
         Args:
             bbox: 邊界框
             resolution: 網格分辨率 (度)
-            
+        
         Returns:
             模擬數據 DataFrame
         """
         lats = np.arange(bbox.lat_min, bbox.lat_max, resolution)
         lons = np.arange(bbox.lon_min, bbox.lon_max, resolution)
         
-        records = []
-        now = datetime.utcnow()
-        
-        for lat in lats:
-            for lon in lons:
-                # 模擬空間變異
-                base_chla = 0.3
-                lat_factor = 0.1 * np.sin(np.radians(lat * 10))
-                lon_factor = 0.1 * np.cos(np.radians(lon * 5))
-                noise = np.random.normal(0, 0.05)
-                
-                chla = max(0.01, base_chla + lat_factor + lon_factor + noise)
-                
-                records.append({
-                    "lat": lat,
-                    "lon": lon,
-                    "time": now,
-                    "chla": round(chla, 3)
-                })
-        
-        return pd.DataFrame(records)
+        lat_g, lon_g = np.meshgrid(lats, lons, indexing="ij")
+        
+        # 模擬空間變異 + 隨機噪聲 (整個網格一次計算)
+        base_chla = 0.3
+        lat_factor = 0.1 * np.sin(np.radians(lat_g * 10))
+        lon_factor = 0.1 * np.cos(np.radians(lon_g * 5))
+        noise = self._rng.normal(0, 0.05, lat_g.shape)
+        
+        chla = np.maximum(0.01, base_chla + lat_factor + lon_factor + noise)
+        
+        return pd.DataFrame({
+            "lat": lat_g.ravel(),
+            "lon": lon_g.ravel(),
+            "time": datetime.utcnow(),
+            "chla": np.round(chla.ravel(), 3)
+        })
     
     def get_productivity_class(
         self,
@@ -266,7 +303,7 @@ class ChlaFetcher(BaseDataFetcher):
         
         Args:
             chla: 葉綠素濃度 (mg/m³)
-            
+        
         Returns:
             生產力等級
         """
@@ -290,17 +327,21 @@ class ChlaFetcher(BaseDataFetcher):
         Args:
             chla_data: Chl-a 數據 DataFrame
             threshold: 藻華閾值 (mg/m³)
-            
+        
         Returns:
             添加 bloom_prob 列的 DataFrame
         """
         if chla_data.empty or "chla" not in chla_data.columns:
             return chla_data
         
-        df = chla_data.copy()
+        chla = chla_data["chla"].to_numpy()
         
-        # 簡化的藻華機率計算
-        df["bloom_prob"] = np.clip(df["chla"] / threshold, 0, 1) * 100
-        df["productivity_class"] = df["chla"].apply(self.get_productivity_class)
+        # 簡化的藻華機率計算；生產力等級以二分搜尋一次分級整欄
+        # (與 get_productivity_class 相同門檻，NaN 同樣歸入最高級)
+        codes = np.searchsorted(self.PRODUCTIVITY_THRESHOLDS, chla, side="right")
+        df = chla_data.assign(
+            bloom_prob=np.clip(chla / threshold, 0.0, 1.0) * 100,
+            productivity_class=pd.Categorical.from_codes(codes, self.PRODUCTIVITY_CLASSES)
+        )
         
         return df
@@ -59,9 +59,16 @@ class SSHFetcher(BaseDataFetcher):
         }
     ]
     
-    def __init__(self, **kwargs):
-        """初始化 SSH 獲取器"""
+    def __init__(self, rng: Optional[np.random.Generator] = None, **kwargs):
+        """
+        初始化 SSH 獲取器
+        
+        Args:
+            rng: 模擬數據用的亂數產生器 (預設為新建的 PCG64 產生器)
+            **kwargs: 傳遞給 BaseDataFetcher 的參數
+        """
         super().__init__(**kwargs)
+        self._rng = rng if rng is not None else np.random.default_rng()
         self.current_dataset = self.DATASETS[0]
     
     def fetch(
@@ -75,7 +82,7 @@ class SSHFetcher(BaseDataFetcher):
         Args:
             bbox: 地理邊界框
             time_range: 時間範圍
-            
+        
         Returns:
             包含 SSH 數據的 FetchResult
         """
@@ -102,7 +109,8 @@ class SSHFetcher(BaseDataFetcher):
             try:
                 df = self._fetch_from_erddap(bbox, time_range, dataset)
                 if df is not None and not df.empty:
-                    self.cache.set(cache_key, df.to_dict("records"))
+                    # DataFrame 直接寫入快取 (pickle 保留欄式區塊與 dtype，讀回免逐列重建)
+                    self.cache.set(cache_key, df)
                     return FetchResult(
                         data=df,
                         source=f"erddap:{dataset['id']}",
@@ -121,6 +129,43 @@ class SSHFetcher(BaseDataFetcher):
             metadata={"warning": "synthetic data"}
         )
     
+    def fetch_point_native(
+        self,
+        lat: float,
+        lon: float,
+        time_range: Optional[TimeRange] = None
+    ) -> Optional[FetchResult[pd.DataFrame]]:
+        """
+        以 ERDDAP 單點查詢獲取 SSH (取最近網格點，只下載一個像素)
+        
+        Args:
+            lat: 緯度
+            lon: 經度
+            time_range: 時間範圍，默認為最近 3 天
+        
+        Returns:
+            包含 SSH 數據的 FetchResult，各數據集皆失敗時返回 None
+        """
+        if time_range is None:
+            time_range = TimeRange.last_n_days(3)
+        
+        point = BoundingBox(lat, lat, lon, lon)
+        for dataset in self.DATASETS:
+            try:
+                df = self._fetch_from_erddap(point, time_range, dataset)
+            except Exception as e:
+                logger.debug(f"SSH point fetch from {dataset['id']} failed: {e}")
+                continue
+            
+            if df is not None and not df.empty:
+                return FetchResult(
+                    data=df,
+                    source=f"erddap:{dataset['id']}",
+                    metadata={"resolution_km": dataset["resolution_km"]}
+                )
+        
+        return None
+    
     def _fetch_from_erddap(
         self,
         bbox: BoundingBox,
@@ -153,17 +198,14 @@ class SSHFetcher(BaseDataFetcher):
         if not rows:
             return None
         
-        df = pd.DataFrame(rows, columns=column_names)
-        
-        df = df.rename(columns={
-            "time": "time",
-            "latitude": "lat",
-            "longitude": "lon",
-            variable: "ssh"
-        })
+        names = {"latitude": "lat", "longitude": "lon", variable: "ssh"}
+        df = pd.DataFrame(rows, columns=[names.get(c, c) for c in column_names])
         
+        # 座標與數值以 float32 儲存 (遠高於資料精度)，記憶體與快取減半
+        df = df.dropna(subset=["ssh"]).astype(
+            {"lat": np.float32, "lon": np.float32, "ssh": np.float32}
+        )
         df["time"] = pd.to_datetime(df["time"])
-        df = df.dropna(subset=["ssh"])
         
         return df
     
@@ -176,8 +218,7 @@ class SSHFetcher(BaseDataFetcher):
         lats = np.arange(bbox.lat_min, bbox.lat_max, resolution)
         lons = np.arange(bbox.lon_min, bbox.lon_max, resolution)
         
-        records = []
-        now = datetime.utcnow()
+        lat_g, lon_g = np.meshgrid(lats, lons, indexing="ij")
         
         # 模擬渦旋結構
         eddy_lat = (bbox.lat_min + bbox.lat_max) / 2
@@ -185,27 +226,17 @@ class SSHFetcher(BaseDataFetcher):
         eddy_radius = 1.0  # 度
         eddy_amplitude = 0.15  # 米
         
-        for lat in lats:
-            for lon in lons:
-                # 計算到渦旋中心距離
-                dist = np.sqrt((lat - eddy_lat)**2 + (lon - eddy_lon)**2)
-                
-                # 高斯型渦旋
-                ssh_eddy = eddy_amplitude * np.exp(-(dist / eddy_radius)**2)
-                
-                # 添加隨機噪聲
-                noise = np.random.normal(0, 0.02)
-                
-                ssh = ssh_eddy + noise
-                
-                records.append({
-                    "lat": lat,
-                    "lon": lon,
-                    "time": now,
-                    "ssh": round(ssh, 4)
-                })
-        
-        return pd.DataFrame(records)
+        # 高斯型渦旋 + 隨機噪聲 (整個網格一次計算)
+        dist = np.hypot(lat_g - eddy_lat, lon_g - eddy_lon)
+        ssh = eddy_amplitude * np.exp(-(dist / eddy_radius) ** 2)
+        ssh += self._rng.normal(0, 0.02, lat_g.shape)
+        
+        return pd.DataFrame({
+            "lat": lat_g.ravel(),
+            "lon": lon_g.ravel(),
+            "time": datetime.utcnow(),
+            "ssh": np.round(ssh.ravel(), 4)
+        })
     
     def calculate_sla(
         self,
@@ -218,7 +249,7 @@ class SSHFetcher(BaseDataFetcher):
         Args:
             ssh_data: SSH 數據 DataFrame
             reference_ssh: 參考 SSH 值，None 則使用平均值
-            
+        
         Returns:
             添加 sla 列的 DataFrame
         """
@@ -245,40 +276,44 @@ class SSHFetcher(BaseDataFetcher):
         Args:
             ssh_data: SSH 數據 DataFrame
             threshold_m: SLA 閾值 (米)
-            
+        
         Returns:
             渦旋列表 [{"type": "cyclonic/anticyclonic", "center": (lat, lon), ...}]
         """
         if ssh_data.empty or "ssh" not in ssh_data.columns:
             return []
         
-        df = self.calculate_sla(ssh_data)
+        # 直接在陣列上計算 SLA 與極值位置，不複製 DataFrame
+        ssh = ssh_data["ssh"].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(ssh)
+        if not valid.any():
+            return []
+        
+        sla = ssh - ssh[valid].mean()
+        lat = ssh_data["lat"].to_numpy()
+        lon = ssh_data["lon"].to_numpy()
         
         eddies = []
         
         # 識別強正異常 (反氣旋渦旋)
-        anticyclonic = df[df["sla"] > threshold_m]
-        if not anticyclonic.empty:
-            max_idx = anticyclonic["sla"].idxmax()
-            center = anticyclonic.loc[max_idx]
+        i_max = int(np.nanargmax(sla))
+        if sla[i_max] > threshold_m:
             eddies.append({
                 "type": "anticyclonic",
-                "center_lat": center["lat"],
-                "center_lon": center["lon"],
-                "max_sla": center["sla"],
+                "center_lat": float(lat[i_max]),
+                "center_lon": float(lon[i_max]),
+                "max_sla": float(sla[i_max]),
                 "description": "暖心渦旋，下沉區"
             })
         
         # 識別強負異常 (氣旋渦旋)
-        cyclonic = df[df["sla"] < -threshold_m]
-        if not cyclonic.empty:
-            min_idx = cyclonic["sla"].idxmin()
-            center = cyclonic.loc[min_idx]
+        i_min = int(np.nanargmin(sla))
+        if sla[i_min] < -threshold_m:
             eddies.append({
                 "type": "cyclonic",
-                "center_lat": center["lat"],
-                "center_lon": center["lon"],
-                "min_sla": center["sla"],
+                "center_lat": float(lat[i_min]),
+                "center_lon": float(lon[i_min]),
+                "min_sla": float(sla[i_min]),
                 "description": "冷心渦旋，上升流區"
             })
         
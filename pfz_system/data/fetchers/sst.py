@@ -7,9 +7,11 @@ SST (Sea Surface Temperature) 數據獲取器
 - Open-Meteo Marine API
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
+from itertools import chain
 import logging
 
 import requests
@@ -21,7 +23,7 @@ from .base import (
     BoundingBox,
     TimeRange,
     FetchResult,
-    haversine_distance
+    EARTH_RADIUS_KM
 )
 
 logger = logging.getLogger(__name__)
@@ -61,6 +63,13 @@ class SSTFetcher(BaseDataFetcher):
     # 備用：Open-Meteo Marine API (較低分辨率但更穩定)
     BACKUP_URL = "https://marine-api.open-meteo.com/v1/marine"
     
+    # Open-Meteo 每個請求合併的座標數 (URL 約 1 KB) 與並行請求數
+    OPENMETEO_BATCH_SIZE = 50
+    OPENMETEO_CONCURRENCY = 16
+    
+    # calculate_gradient 每次查詢鄰近點的資料點數
+    GRADIENT_CHUNK = 1024
+    
     def __init__(
         self,
         dataset_id: Optional[str] = None,
@@ -90,7 +99,7 @@ class SSTFetcher(BaseDataFetcher):
         Args:
             bbox: 地理邊界框
             time_range: 時間範圍，默認為最近 3 天
-            
+        
         Returns:
             包含 SST 數據的 FetchResult
         """
@@ -117,7 +126,8 @@ class SSTFetcher(BaseDataFetcher):
         try:
             df = self._fetch_from_erddap(bbox, time_range)
             if df is not None and not df.empty:
-                self.cache.set(cache_key, df.to_dict("records"))
+                # DataFrame 直接寫入快取 (pickle 保留欄式區塊與 dtype，讀回免逐列重建)
+                self.cache.set(cache_key, df)
                 return FetchResult(
                     data=df,
                     source=f"erddap:{self.dataset_id}",
@@ -145,6 +155,41 @@ class SSTFetcher(BaseDataFetcher):
             metadata={"error": "All data sources failed"}
         )
     
+    def fetch_point_native(
+        self,
+        lat: float,
+        lon: float,
+        time_range: Optional[TimeRange] = None
+    ) -> Optional[FetchResult[pd.DataFrame]]:
+        """
+        以 ERDDAP 單點查詢獲取 SST (取最近網格點，只下載一個像素)
+        
+        Args:
+            lat: 緯度
+            lon: 經度
+            time_range: 時間範圍，默認為最近 3 天
+        
+        Returns:
+            包含 SST 數據的 FetchResult，失敗時返回 None
+        """
+        if time_range is None:
+            time_range = TimeRange.last_n_days(3)
+        
+        try:
+            df = self._fetch_from_erddap(BoundingBox(lat, lat, lon, lon), time_range)
+        except Exception as e:
+            logger.debug(f"ERDDAP point fetch failed ({lat}, {lon}): {e}")
+            return None
+        
+        if df is None or df.empty:
+            return None
+        
+        return FetchResult(
+            data=df,
+            source=f"erddap:{self.dataset_id}",
+            metadata={"resolution_km": 1.0}
+        )
+    
     def _fetch_from_erddap(
         self,
         bbox: BoundingBox,
@@ -156,7 +201,7 @@ class SSTFetcher(BaseDataFetcher):
         Args:
             bbox: 邊界框
             time_range: 時間範圍
-            
+        
         Returns:
             SST 數據 DataFrame
         """
@@ -187,20 +232,16 @@ class SSTFetcher(BaseDataFetcher):
         if not rows:
             return None
         
-        df = pd.DataFrame(rows, columns=column_names)
-        
-        # 標準化列名
-        df = df.rename(columns={
-            "time": "time",
-            "latitude": "lat",
-            "longitude": "lon",
-            "analysed_sst": "sst"
-        })
+        # 建構時即使用標準化列名
+        names = {"latitude": "lat", "longitude": "lon", "analysed_sst": "sst"}
+        df = pd.DataFrame(rows, columns=[names.get(c, c) for c in column_names])
         
         # 轉換溫度單位 (Kelvin -> Celsius)
         if df["sst"].mean() > 200:  # 可能是 Kelvin
             df["sst"] = df["sst"] - 273.15
         
+        # 座標與數值以 float32 儲存 (遠高於資料精度)，記憶體與快取減半
+        df = df.astype({"lat": np.float32, "lon": np.float32, "sst": np.float32})
         df["time"] = pd.to_datetime(df["time"])
         
         return df
@@ -214,7 +255,7 @@ class SSTFetcher(BaseDataFetcher):
         
         Args:
             bbox: 邊界框
-            
+        
         Returns:
             SST 數據 DataFrame
         """
@@ -234,43 +275,59 @@ class SSTFetcher(BaseDataFetcher):
             lats = np.linspace(bbox.lat_min, bbox.lat_max, 10)
             lons = np.linspace(bbox.lon_min, bbox.lon_max, 10)
         
-        records = []
-        
-        for lat in lats:
-            for lon in lons:
-                try:
-                    params = {
-                        "latitude": lat,
-                        "longitude": lon,
-                        "hourly": "sea_surface_temperature",
-                        "forecast_days": 1,
-                        "timezone": "UTC"
-                    }
-                    
-                    response = self.session.get(
-                        self.BACKUP_URL,
-                        params=params,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        hourly = data.get("hourly", {})
-                        times = hourly.get("time", [])
-                        sst_values = hourly.get("sea_surface_temperature", [])
-                        
-                        if times and sst_values:
-                            # 取最新值
-                            records.append({
-                                "lat": lat,
-                                "lon": lon,
-                                "time": times[-1],
-                                "sst": sst_values[-1]
-                            })
-                            
-                except Exception as e:
-                    logger.debug(f"Point fetch failed ({lat}, {lon}): {e}")
-                    continue
+        def fetch_chunk(chunk: List[Tuple[float, float]]) -> List[Dict[str, Any]]:
+            # 多點以逗號分隔合併為單一請求，響應為各點結果的陣列
+            try:
+                params = {
+                    "latitude": ",".join(f"{lat:.4f}" for lat, _ in chunk),
+                    "longitude": ",".join(f"{lon:.4f}" for _, lon in chunk),
+                    "hourly": "sea_surface_temperature",
+                    "forecast_days": 1,
+                    "timezone": "UTC"
+                }
+                
+                response = self.session.get(
+                    self.BACKUP_URL,
+                    params=params,
+                    timeout=10
+                )
+                
+                if response.status_code != 200:
+                    return []
+                
+                data = response.json()
+                # 單點查詢時響應為單一物件
+                if isinstance(data, dict):
+                    data = [data]
+            
+            except Exception as e:
+                logger.debug(f"Batch point fetch failed ({len(chunk)} points): {e}")
+                return []
+            
+            records = []
+            for (lat, lon), location in zip(chunk, data):
+                hourly = location.get("hourly", {})
+                times = hourly.get("time", [])
+                sst_values = hourly.get("sea_surface_temperature", [])
+                
+                if times and sst_values:
+                    # 取最新值
+                    records.append({
+                        "lat": lat,
+                        "lon": lon,
+                        "time": times[-1],
+                        "sst": sst_values[-1]
+                    })
+            
+            return records
+        
+        # 依 URL 長度上限分批，各批以執行緒池並行送出 (共用 session 連線池)
+        points = [(lat, lon) for lat in lats for lon in lons]
+        size = self.OPENMETEO_BATCH_SIZE
+        chunks = [points[i:i + size] for i in range(0, len(points), size)]
+        workers = min(len(chunks), self.OPENMETEO_CONCURRENCY) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            records = list(chain.from_iterable(executor.map(fetch_chunk, chunks)))
         
         if not records:
             return None
@@ -291,7 +348,7 @@ class SSTFetcher(BaseDataFetcher):
         Args:
             lat: 緯度
             lon: 經度
-            
+        
         Returns:
             SST 值 (°C)，失敗則返回 None
         """
@@ -319,7 +376,7 @@ class SSTFetcher(BaseDataFetcher):
                 valid = [v for v in sst_values if v is not None]
                 if valid:
                     return sum(valid) / len(valid)
-            
+        
         except Exception as e:
             logger.debug(f"SST point fetch failed: {e}")
         
@@ -336,40 +393,67 @@ class SSTFetcher(BaseDataFetcher):
         Args:
             sst_data: SST 數據 DataFrame (需有 lat, lon, sst 列)
             resolution_km: 數據分辨率 (km)
-            
+        
         Returns:
             添加 gradient 列的 DataFrame
         """
         if sst_data.empty or "sst" not in sst_data.columns:
             return sst_data
         
-        df = sst_data.copy()
-        gradients = []
+        # 僅在計算梯度時才需要空間索引，延遲載入 scipy.spatial
+        from scipy.spatial import cKDTree
         
-        for idx, row in df.iterrows():
-            lat, lon, sst = row["lat"], row["lon"], row["sst"]
+        df = sst_data.copy()
+        lat = df["lat"].to_numpy(dtype=np.float64)
+        lon = df["lon"].to_numpy(dtype=np.float64)
+        
+        # 座標無效的點不參與鄰近搜尋，梯度記為 0
+        located = np.isfinite(lat) & np.isfinite(lon)
+        lat, lon = lat[located], lon[located]
+        sst = df["sst"].to_numpy(dtype=np.float64)[located]
+        n = len(lat)
+        
+        # 鄰近點為經緯度各 ±0.5° 的方框 (Chebyshev 距離)；
+        # 容許 1e-9 的浮點誤差，網格恰落在邊界上的點不致漏算
+        tree = cKDTree(np.column_stack([lat, lon]))
+        gradients = np.empty(n)
+        
+        # 逐點三角函數只算一次，鄰點對直接取用
+        lat_rad = np.radians(lat)
+        lon_rad = np.radians(lon)
+        cos_lat = np.cos(lat_rad)
+        
+        # 分塊查詢，限制鄰點對陣列的記憶體用量
+        for start in range(0, n, self.GRADIENT_CHUNK):
+            stop = min(start + self.GRADIENT_CHUNK, n)
+            neighbors = tree.query_ball_point(
+                tree.data[start:stop], r=0.5 + 1e-9, p=np.inf, return_sorted=False
+            )
+            counts = np.fromiter(map(len, neighbors), dtype=np.intp, count=stop - start)
+            j = np.fromiter(chain.from_iterable(neighbors), dtype=np.intp, count=counts.sum())
+            i = np.repeat(np.arange(start, stop), counts)
             
-            # 找鄰近點
-            neighbors = df[
-                (df["lat"].between(lat - 0.5, lat + 0.5)) &
-                (df["lon"].between(lon - 0.5, lon + 0.5)) &
-                (df.index != idx)
-            ]
+            # 逐對 Haversine 距離 (km)；每個點的鄰點清單都含自身 (距離 0)
+            a = (
+                np.sin((lat_rad[j] - lat_rad[i]) / 2) ** 2
+                + cos_lat[i] * cos_lat[j] * np.sin((lon_rad[j] - lon_rad[i]) / 2) ** 2
+            )
+            dist = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
             
-            if len(neighbors) < 2:
-                gradients.append(0.0)
-                continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = np.abs(sst[i] - sst[j]) / dist
+            ratio[dist == 0] = 0.0
             
-            # 計算與鄰近點的溫度差
-            max_gradient = 0.0
-            for _, neighbor in neighbors.iterrows():
-                dist = haversine_distance(lat, lon, neighbor["lat"], neighbor["lon"])
-                if dist > 0:
-                    gradient = abs(sst - neighbor["sst"]) / dist
-                    max_gradient = max(max_gradient, gradient)
+            # 各點的鄰點在 i 中連續排列，以 reduceat 分段取最大值；
+            # fmax 略過 NaN，與逐點 max 比較的行為一致
+            offsets = np.concatenate(([0], np.cumsum(counts[:-1])))
+            chunk = np.fmax.reduceat(ratio, offsets)
             
-            gradients.append(max_gradient)
+            # 鄰近點少於 2 個 (不含自身) 時梯度為 0
+            chunk[counts - 1 < 2] = 0.0
+            gradients[start:stop] = chunk
         
-        df["gradient"] = gradients
+        df["gradient"] = 0.0
+        df.loc[located, "gradient"] = gradients
         
         return df
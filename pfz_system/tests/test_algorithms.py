@@ -0,0 +1,245 @@
+"""
+鋒面與渦旋檢測單元測試
+
+測試 algorithms 模組的檢測流程：
+- 散點資料網格化
+- 鋒面檢測
+- 渦旋檢測
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# 確保可以導入主模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.fronts import FrontDetector, FrontSegment
+from algorithms.eddies import EddyDetector, Eddy, EddyType
+from algorithms.kernels import bilinear_grid, grid_axis, normalize_grid, regular_grid
+from data.fetchers import base as fetcher_base
+
+
+def _regular_frame(column, field_fn, step=0.1):
+    """建立規則網格 DataFrame (打亂列順序)"""
+    lats = np.round(np.arange(20.0, 24.0 + step / 2, step), 4)
+    lons = np.round(np.arange(119.0, 123.0 + step / 2, step), 4)
+    grid_lat, grid_lon = np.meshgrid(lats, lons, indexing="ij")
+    df = pd.DataFrame({
+        "lat": grid_lat.ravel(),
+        "lon": grid_lon.ravel(),
+        column: field_fn(grid_lat, grid_lon).ravel()
+    })
+    return df.sample(frac=1, random_state=0)
+
+
+class TestBilinearGrid:
+    """反向雙線性網格化測試"""
+    
+    def test_points_on_nodes(self):
+        """測試格點上的樣本完整還原"""
+        lat_axis = np.array([0.0, 1.0, 2.0])
+        lon_axis = np.array([10.0, 11.0])
+        lat, lon = [a.ravel() for a in np.meshgrid(lat_axis, lon_axis, indexing="ij")]
+        values = np.arange(6, dtype=float)
+        
+        grid, wsum = bilinear_grid(lat, lon, values, lat_axis, lon_axis)
+        
+        assert np.allclose(wsum, 1.0)
+        assert np.allclose(grid, values.reshape(3, 2))
+    
+    def test_point_between_nodes(self):
+        """測試格點間樣本按距離分配權重"""
+        lat_axis = np.array([0.0, 1.0])
+        lon_axis = np.array([0.0, 1.0])
+        
+        grid, wsum = bilinear_grid(
+            np.array([0.25]), np.array([0.5]), np.array([8.0]),
+            lat_axis, lon_axis
+        )
+        
+        assert wsum.sum() == pytest.approx(1.0)
+        assert np.allclose(wsum, [[0.375, 0.375], [0.125, 0.125]])
+        assert grid.sum() == pytest.approx(8.0)
+    
+    def test_normalize_fills_empty_cells(self):
+        """測試無樣本格點填入加權平均"""
+        lat_axis = np.array([0.0, 1.0, 2.0])
+        lon_axis = np.array([0.0, 1.0])
+        
+        grid_sum, wsum = bilinear_grid(
+            np.array([0.0, 0.0]), np.array([0.0, 1.0]), np.array([2.0, 4.0]),
+            lat_axis, lon_axis
+        )
+        grid = normalize_grid(grid_sum, wsum)
+        
+        assert not np.isnan(grid).any()
+        assert np.allclose(grid, [[2.0, 4.0], [3.0, 3.0], [3.0, 3.0]])
+        assert np.allclose(normalize_grid(grid_sum, wsum, fill_value=0.0)[1:], 0.0)
+
+
+class TestRegularGrid:
+    """規則網格重排測試"""
+    
+    def test_complete_grid_is_reshaped(self):
+        """測試完整規則網格直接重排"""
+        lat_axis = np.array([0.0, 1.0])
+        lon_axis = np.array([10.0, 11.0, 12.0])
+        lat = np.array([1.0, 0.0, 1.0, 0.0, 1.0, 0.0])
+        lon = np.array([12.0, 10.0, 10.0, 11.0, 11.0, 12.0])
+        values = np.array([5.0, 0.0, 3.0, 1.0, 4.0, 2.0])
+        
+        grid = regular_grid(lat, lon, values, lat_axis, lon_axis)
+        
+        assert np.array_equal(grid, [[0, 1, 2], [3, 4, 5]])
+    
+    def test_duplicate_points_fall_back(self):
+        """測試重複樣本時不使用重排"""
+        lat_axis = np.array([0.0, 1.0])
+        lon_axis = np.array([10.0, 11.0])
+        lat = np.array([0.0, 0.0, 1.0, 1.0])
+        lon = np.array([10.0, 10.0, 10.0, 11.0])
+        
+        assert regular_grid(lat, lon, np.ones(4), lat_axis, lon_axis) is None
+    
+    def test_grid_axis_has_deterministic_length(self):
+        """測試座標軸含端點且不因浮點誤差多出一格"""
+        axis = grid_axis(20.0, 22.0, 0.1)
+        
+        assert len(axis) == 21
+        assert axis[-1] == pytest.approx(22.0)
+        assert len(grid_axis(0.0, 1.2, 0.5)) == 3
+        assert len(grid_axis(5.0, 5.0, 0.5)) == 1
+
+
+class TestHaversineMany:
+    """批次大圓距離測試"""
+    
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_grid_input_matches_scalar(self, monkeypatch, use_numba):
+        """測試二維輸入保留形狀，且與單點函數一致 (含 numba 與 NumPy 版)"""
+        if not use_numba:
+            monkeypatch.setattr(fetcher_base, "_haversine_jit", None)
+            monkeypatch.setattr(fetcher_base, "NUMBA_AVAILABLE", False)
+        elif not fetcher_base.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        
+        lats = np.array([[22.5, 23.0, 90.0], [-10.0, 0.0, 45.0]])
+        lons = np.array([[121.0, 122.5, 0.0], [-59.0, 180.0, 301.0]])
+        
+        distances = fetcher_base.haversine_distance_many(22.5, 121.0, lats, lons)
+        
+        assert distances.shape == (2, 3)
+        assert np.allclose(distances, [
+            [fetcher_base.haversine_distance(22.5, 121.0, la, lo) for la, lo in zip(row_lat, row_lon)]
+            for row_lat, row_lon in zip(lats, lons)
+        ])
+
+
+class TestFrontDetector:
+    """FrontDetector 測試"""
+    
+    def test_detects_temperature_front(self):
+        """測試檢測溫度鋒面"""
+        df = _regular_frame(
+            "sst", lambda la, lo: 25 + 3 * np.tanh((la - 22) * 5)
+        )
+        
+        result = FrontDetector().detect_from_dataframe(df)
+        
+        assert result.front_count >= 1
+        assert result.gradient_field.shape == (41, 41)
+    
+    def test_front_score_batch_matches_scalar(self):
+        """測試批次鋒面分數與逐點計算一致"""
+        detector = FrontDetector()
+        fronts = [
+            FrontSegment(
+                coordinates=[(22.0, 121.0), (22.0, 121.1), (22.0, 121.2)],
+                gradient_mean=0.8, gradient_max=1.2, length_km=20.0
+            )
+        ]
+        lats = np.array([22.0, 22.2, 23.5])
+        lons = np.array([121.1, 121.1, 121.1])
+        
+        batch = detector.get_front_score(lats, lons, fronts)
+        single = [detector.get_front_score(la, lo, fronts) for la, lo in zip(lats, lons)]
+        
+        assert np.allclose(batch, single)
+        assert batch[0] == pytest.approx(100.0)
+        assert batch[2] == 0.0
+    
+    def test_empty_dataframe(self):
+        """測試空資料"""
+        result = FrontDetector().detect_from_dataframe(
+            pd.DataFrame(columns=["lat", "lon", "sst"])
+        )
+        
+        assert result.front_count == 0
+
+
+class TestEddyDetector:
+    """EddyDetector 測試"""
+    
+    def test_detects_both_polarities(self):
+        """測試檢測氣旋與反氣旋渦旋"""
+        df = _regular_frame(
+            "ssh",
+            lambda la, lo: (
+                0.3 * np.exp(-((la - 21) ** 2 + (lo - 120) ** 2) / 0.5)
+                - 0.3 * np.exp(-((la - 23) ** 2 + (lo - 122) ** 2) / 0.4)
+            )
+        )
+        
+        result = EddyDetector(min_radius_km=10).detect_from_dataframe(df)
+        
+        assert result.cyclonic_count == 1
+        assert result.anticyclonic_count == 1
+        
+        anticyclonic = next(
+            e for e in result.eddies if e.eddy_type == EddyType.ANTICYCLONIC
+        )
+        assert anticyclonic.center_lat == pytest.approx(21.0, abs=0.05)
+        assert anticyclonic.center_lon == pytest.approx(120.0, abs=0.05)
+    
+    def test_top_k_keeps_strongest(self):
+        """測試只保留強度最高的前 K 個渦旋"""
+        df = _regular_frame(
+            "ssh",
+            lambda la, lo: (
+                0.3 * np.exp(-((la - 21) ** 2 + (lo - 120) ** 2) / 0.5)
+                - 0.3 * np.exp(-((la - 23) ** 2 + (lo - 122) ** 2) / 0.4)
+            )
+        )
+        
+        full = EddyDetector(min_radius_km=10).detect_from_dataframe(df)
+        top = EddyDetector(min_radius_km=10, top_k=1).detect_from_dataframe(df)
+        
+        assert len(top.eddies) == 1
+        assert top.eddies[0] == full.eddies[0]
+        assert top.metadata["detected_count"] == 2
+    
+    def test_eddy_score_batch_matches_scalar(self):
+        """測試批次渦旋分數與逐點計算一致"""
+        detector = EddyDetector()
+        eddies = [
+            Eddy(EddyType.CYCLONIC, 22.0, 121.0, radius_km=80.0,
+                 ssh_anomaly=-0.2, intensity=90.0),
+            Eddy(EddyType.ANTICYCLONIC, 24.0, 123.0, radius_km=60.0,
+                 ssh_anomaly=0.15, intensity=70.0),
+        ]
+        lats = np.array([[22.0, 22.7], [24.0, 23.0]])
+        lons = np.array([[121.0, 121.0], [123.5, 122.0]])
+        
+        for preference in ["edge", "center", "cyclonic", "anticyclonic"]:
+            batch = detector.get_eddy_score(lats, lons, eddies, preference)
+            single = [
+                detector.get_eddy_score(la, lo, eddies, preference)
+                for la, lo in zip(lats.ravel(), lons.ravel())
+            ]
+            
+            assert batch.shape == lats.shape
+            assert np.allclose(batch.ravel(), single)
@@ -0,0 +1,80 @@
+"""
+API 請求合併器單元測試
+
+測試 AsyncPFZBatcher 的核心功能：
+- 分組計算互不阻塞
+- 停止時結束未完成的請求
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+from unittest.mock import MagicMock, patch
+
+# 確保可以導入主模組
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("fastapi")
+
+import api
+from api import AsyncPFZBatcher
+
+
+class _SlowCalculator:
+    """lat >= 40 的請求等待 release 後才完成的模擬計算器"""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+    
+    async def predict_async(self, lat, lon, forecast_days=3):
+        if lat >= 40:
+            await self.release.wait()
+        return MagicMock(lat=lat, lon=lon)
+    
+    def predict_batch(self, lats, lons, forecast_days=3):
+        return [MagicMock(lat=lat, lon=lon) for lat, lon in zip(lats, lons)]
+
+
+class TestAsyncPFZBatcher:
+    """請求合併器測試"""
+    
+    def test_slow_group_does_not_block_later_requests(self):
+        """測試緩慢分組計算中，後續請求仍可完成"""
+        calculator = _SlowCalculator()
+        
+        async def scenario():
+            batcher = AsyncPFZBatcher(max_wait_ms=1.0)
+            await batcher.start()
+            
+            slow = asyncio.ensure_future(batcher.process(45.0, 150.0))
+            await asyncio.sleep(0.01)
+            
+            fast = await asyncio.wait_for(batcher.process(22.5, 121.0), timeout=1.0)
+            assert fast.lat == 22.5
+            assert not slow.done()
+            
+            calculator.release.set()
+            assert (await asyncio.wait_for(slow, timeout=1.0)).lat == 45.0
+            await batcher.stop()
+        
+        with patch.object(api, "get_calculator", return_value=calculator):
+            asyncio.run(scenario())
+    
+    def test_stop_fails_pending_requests(self):
+        """測試停止時計算中的請求以例外結束而非無限等待"""
+        calculator = _SlowCalculator()
+        
+        async def scenario():
+            batcher = AsyncPFZBatcher(max_wait_ms=1.0)
+            await batcher.start()
+            
+            slow = asyncio.ensure_future(batcher.process(45.0, 150.0))
+            await asyncio.sleep(0.01)
+            await batcher.stop()
+            
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(slow, timeout=1.0)
+        
+        with patch.object(api, "get_calculator", return_value=calculator):
+            asyncio.run(scenario())
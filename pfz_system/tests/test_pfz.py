@@ -10,14 +10,22 @@ PFZ 核心算法單元測試
 
 import pytest
 import sys
+import asyncio
 import os
+import threading
 from unittest.mock import MagicMock, patch
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 # 確保可以導入主模組
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from algorithms import kernels
 from algorithms.pfz import PFZCalculator, PFZScore, PFZPrediction
+from config.species import SPECIES, get_species, score_all_species, score_species_grid
+from data.fetchers import BoundingBox
 
 
 class TestPFZScore:
@@ -208,6 +216,235 @@ class TestPFZCalculator:
         # 無數據
         no_data_score = calc._calculate_generic_habitat(sst=None, chla=None)
         assert no_data_score == 50, "No data should yield neutral score"
+    
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_generic_habitat_array_matches_scalar(self, monkeypatch, use_numba):
+        """測試陣列版通用棲息地分數與逐點計算一致 (含分段邊界與缺值)"""
+        if not use_numba:
+            monkeypatch.setattr(kernels, "NUMBA_AVAILABLE", False)
+        elif not kernels.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        
+        calc = PFZCalculator()
+        sst = np.array([15.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 35.0, np.nan])
+        chla = np.array([0.0, 0.1, 0.2, 0.6, 1.0, 2.0, 7.0, np.nan, 0.4, 0.3])
+        
+        expected = [
+            calc._calculate_generic_habitat(
+                None if np.isnan(s) else s, None if np.isnan(c) else c
+            )
+            for s, c in zip(sst, chla)
+        ]
+        
+        assert np.allclose(kernels.generic_habitat_score(sst, chla), expected)
+    
+    def test_species_habitat_scores_match_scalar(self):
+        """測試魚種棲息地分數的向量版與逐點計算一致"""
+        species = get_species("yellowfin_tuna")
+        sst = np.array([15.0, 18.0, 20.0, 24.0, 26.0, 30.0, 31.0, 33.0])
+        chla = np.array([0.05, 0.1, 0.3, np.nan, 0.6, 1.5, 3.0, 0.2])
+        
+        expected = [
+            species.get_habitat_score(s, None if np.isnan(c) else c)
+            for s, c in zip(sst, chla)
+        ]
+        
+        assert np.allclose(species.get_habitat_scores(sst, chla), expected)
+        # NaN 與 None 同樣視為無數據
+        assert species.get_habitat_score(20.0, np.nan) == species.get_habitat_score(20.0, None)
+        assert species.get_habitat_scores(np.array([20.0]), np.array([np.nan]))[0] == (
+            pytest.approx(species.get_habitat_score(20.0, np.nan))
+        )
+        assert np.allclose(
+            score_all_species(26.0, 0.6),
+            [s.get_habitat_score(26.0, 0.6) for s in SPECIES.values()]
+        )
+        
+        grid = score_species_grid(sst.reshape(2, 4), chla.reshape(2, 4))
+        assert grid.shape == (len(SPECIES), 2, 4)
+        assert np.allclose(grid[1].ravel(), expected)
+
+
+class TestPFZGrid:
+    """網格批次預測測試"""
+    
+    @staticmethod
+    def _field_result(column, value_fn):
+        """建立 0.1° 規則網格的模擬獲取結果"""
+        lats, lons = np.meshgrid(
+            np.round(np.arange(17.0, 28.01, 0.1), 2),
+            np.round(np.arange(116.0, 127.01, 0.1), 2),
+            indexing="ij"
+        )
+        return MagicMock(data=pd.DataFrame({
+            "lat": lats.ravel(),
+            "lon": lons.ravel(),
+            column: value_fn(lats, lons).ravel()
+        }))
+    
+    @staticmethod
+    def _weather_frame(wind_speed, wave_height):
+        """建立 _score_weather 使用欄位的氣象預報"""
+        return pd.DataFrame({
+            "wind_speed_10m_mean": [wind_speed],
+            "wave_height": [wave_height],
+            "visibility_mean": [10000.0],
+            "precipitation_mean": [0.0]
+        })
+    
+    def _mock_fetchers(self, calc):
+        """以模擬數據取代海洋數據獲取"""
+        calc.sst_fetcher.fetch = MagicMock(
+            return_value=self._field_result("sst", lambda la, lo: 22 + 0.5 * (la - 17))
+        )
+        calc.chla_fetcher.fetch = MagicMock(
+            return_value=self._field_result("chla", lambda la, lo: 0.3 + 0 * la)
+        )
+        calc.ssh_fetcher.fetch = MagicMock(
+            return_value=self._field_result("ssh", lambda la, lo: 0 * la)
+        )
+    
+    def test_predict_grid_vectorized(self):
+        """測試批次網格預測欄位與分數範圍"""
+        calc = PFZCalculator()
+        self._mock_fetchers(calc)
+        
+        bbox = BoundingBox(20.0, 25.0, 119.0, 124.0)
+        weather = self._weather_frame(wind_speed=25.0, wave_height=2.5)
+        with patch.object(calc, '_get_weather', return_value=weather) as mock_weather:
+            grid = calc.predict_grid_vectorized(bbox, resolution=1.0)
+        
+        assert len(grid) == 36
+        # 氣象以區域中心點預報代表整個區域
+        assert mock_weather.call_count == 1
+        assert grid["weather"].tolist() == [round(calc._score_weather(weather)[0], 1)] * 36
+        assert grid["weather"].iloc[0] < 70.0
+        assert calc.sst_fetcher.fetch.call_count == 1
+        assert calc.ssh_fetcher.fetch.call_count == 1
+        assert grid["pfz_score"].between(0, 100).all()
+        
+        # SST 24°C 處 (lat=21) 棲息地分數: 100 * 0.7 + 100 * 0.3
+        assert grid.loc[grid["lat"] == 21.0, "habitat"].iloc[0] == pytest.approx(100.0)
+        assert grid.loc[grid["lat"] == 20.0, "habitat"].iloc[0] == pytest.approx(
+            calc._calculate_generic_habitat(sst=23.5, chla=0.3), abs=0.1
+        )
+    
+    def test_predict_batch_matches_predict(self):
+        """測試批次預測與單點 predict_async 結果一致，重複座標只計算一次"""
+        lats = [21.0, 22.5, 24.0, 22.5]
+        lons = [120.0, 121.0, 122.5, 121.0]
+        
+        def make_calculator():
+            calc = PFZCalculator(target_species="yellowfin_tuna")
+            calc.prefetch_cache.clear()
+            self._mock_fetchers(calc)
+            # 非均勻的 Chl-a 與 SSH，區分點位取樣與區域平均
+            calc.chla_fetcher.fetch = MagicMock(return_value=self._field_result(
+                "chla", lambda la, lo: 0.1 + 0.05 * (la - 17) + 0.02 * (lo - 116)
+            ))
+            calc.ssh_fetcher.fetch = MagicMock(return_value=self._field_result(
+                "ssh", lambda la, lo: 0.3 * np.exp(-((la - 23) ** 2 + (lo - 121) ** 2) / 2)
+            ))
+            # 南側風浪小、北側風浪大，逐點氣象分數不同
+            calc._get_weather = MagicMock(
+                side_effect=lambda lat, lon, days: (
+                    self._weather_frame(8.0, 1.0) if lat < 22 else self._weather_frame(25.0, 2.5)
+                )
+            )
+            return calc
+        
+        batch_calc = make_calculator()
+        predictions = batch_calc.predict_batch(lats, lons)
+        
+        assert [p.lat for p in predictions] == lats
+        assert predictions[1] is predictions[3]
+        assert batch_calc._get_weather.call_count == 3
+        assert predictions[0].score.weather_score == 100.0
+        assert predictions[2].score.weather_score == pytest.approx(48.3)
+        assert predictions[2].score.details["operability"] == "marginal"
+        
+        single_calc = make_calculator()
+        for prediction, lat, lon in zip(predictions, lats, lons):
+            expected = asyncio.run(single_calc.predict_async(lat, lon))
+            assert prediction.score.total_score == expected.score.total_score
+            assert prediction.score.habitat_score == expected.score.habitat_score
+            assert prediction.score.eddy_score == expected.score.eddy_score
+            assert prediction.score.weather_score == expected.score.weather_score
+            assert prediction.score.details == expected.score.details
+    
+    def test_predict_fetches_each_region_once(self):
+        """測試單次預測中 SST 區域數據只獲取一次並供點位取樣"""
+        calc = PFZCalculator()
+        calc.prefetch_cache.clear()
+        self._mock_fetchers(calc)
+        calc.sst_fetcher.get_latest_sst = MagicMock(return_value=None)
+        calc._get_weather = MagicMock(return_value=None)
+        
+        prediction = calc.predict(lat=22.5, lon=121.0)
+        
+        assert calc.sst_fetcher.fetch.call_count == 1
+        assert calc.sst_fetcher.get_latest_sst.call_count == 0
+        assert prediction.score.details["sst"] == pytest.approx(24.75)
+
+
+class TestPrefetch:
+    """鄰近格點預取測試"""
+    
+    def test_prefetch_warms_neighbors(self):
+        """測試預取後鄰近格點不再重複獲取"""
+        calc = PFZCalculator()
+        calc.sst_fetcher.get_latest_sst = MagicMock(return_value=26.0)
+        empty = MagicMock(data=None)
+        calc.sst_fetcher.fetch = MagicMock(return_value=empty)
+        calc.chla_fetcher.fetch = MagicMock(return_value=empty)
+        calc.ssh_fetcher.fetch = MagicMock(return_value=empty)
+        
+        assert calc.prefetch_neighbors(22.5, 121.0, resolution=0.5) == 8
+        assert calc.sst_fetcher.get_latest_sst.call_count == 8
+        
+        assert calc._get_sst(23.0, 121.5) == 26.0
+        assert calc.sst_fetcher.get_latest_sst.call_count == 8
+    
+    def test_prefetch_skips_running_duplicate(self):
+        """測試相同位置的預取進行中時，重複預取直接略過"""
+        calc = PFZCalculator()
+        calc.prefetch_cache.clear()
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_sst(lat, lon):
+            started.set()
+            release.wait(5)
+        
+        calc._get_sst = slow_sst
+        calc._get_chla = MagicMock(return_value=None)
+        calc._detect_fronts = MagicMock(return_value=None)
+        calc._detect_eddies = MagicMock(return_value=None)
+        
+        worker = threading.Thread(
+            target=calc.prefetch_neighbors, args=(22.5, 121.0), kwargs={"resolution": 0.5}
+        )
+        worker.start()
+        assert started.wait(5)
+        
+        assert calc.prefetch_neighbors(22.5, 121.0, resolution=0.5) == 0
+        
+        release.set()
+        worker.join()
+        assert calc.prefetch_neighbors(22.5, 121.0, resolution=0.5) == 8
+    
+    def test_prefetched_sst_matches_prediction(self):
+        """測試預取的 SST 與預測中的區域取樣相同，不因先後順序而異"""
+        calc = PFZCalculator()
+        calc.prefetch_cache.clear()
+        TestPFZGrid()._mock_fetchers(calc)
+        calc.sst_fetcher.get_latest_sst = MagicMock(return_value=99.0)
+        calc._get_weather = MagicMock(return_value=pd.DataFrame())
+        
+        calc.prefetch_neighbors(22.0, 121.0, resolution=0.5)
+        prediction = calc.predict(lat=22.5, lon=121.0)
+        
+        assert calc.sst_fetcher.get_latest_sst.call_count == 0
+        assert prediction.score.details["sst"] == pytest.approx(24.75)
 
 
 class TestPFZPrediction:
@@ -12,6 +12,7 @@ import pytest
 import sys
 import os
 import math
+import random
 from unittest.mock import MagicMock, patch
 
 # 確保可以導入主模組
@@ -24,7 +25,8 @@ from business.roi import (
     ExpectedCatch,
     VesselSpecs,
     MARKET_PRICES,
-    calculate_roi
+    calculate_roi,
+    _calculate_roi_cached
 )
 
 
@@ -125,6 +127,46 @@ class TestROICalculator:
         
         assert 1300 < distance < 1700
     
+    def test_calculate_many_matches_calculate(self):
+        """測試批次 ROI 與逐一計算一致"""
+        origin = (22.6, 120.3)
+        destinations = [(24.0, 122.0), (13.4, 144.8), (22.6, 120.3)]
+        scores = [75.0, 90.0, 10.0]
+        
+        calc = ROICalculator(rng=random.Random(0))
+        single = [
+            calc.calculate(origin, dest, score, "yellowfin_tuna")
+            for dest, score in zip(destinations, scores)
+        ]
+        calc = ROICalculator(rng=random.Random(0))
+        batch = calc.calculate_many(origin, destinations, scores, "yellowfin_tuna")
+        
+        assert len(batch) == 3
+        for one, many in zip(single, batch):
+            assert many.details["distance_nm"] == pytest.approx(one.details["distance_nm"])
+            assert many.total_cost == one.total_cost
+            assert many.net_profit == pytest.approx(one.net_profit)
+            assert many.expected_revenue == one.expected_revenue
+            assert many.recommendation == one.recommendation
+    
+    def test_score_destinations_mixed_species(self):
+        """測試各目的地魚種不同時依魚種取 CPUE 與價格"""
+        calc = ROICalculator(stochastic=False)
+        
+        scores = calc.score_destinations(
+            (22.6, 120.3),
+            [(24.0, 122.0), (24.0, 122.0), (24.0, 122.0)],
+            [75.0, 75.0, 75.0],
+            ["yellowfin_tuna", "skipjack", "unknown_species"]
+        )
+        
+        # CPUE × 5 天 × (0.5 + 0.75) × 平均價格
+        assert scores["expected_revenue"].tolist() == pytest.approx([
+            80 * 5 * 1.25 * 10.0,
+            500 * 5 * 1.25 * 2.5,
+            50 * 5 * 1.25 * 5.0,
+        ])
+    
     def test_fuel_cost_calculation(self):
         """測試燃油成本計算"""
         calc = ROICalculator(fuel_price_usd_per_l=0.8)
@@ -140,30 +182,29 @@ class TestROICalculator:
         """測試高 PFZ 分數的漁獲估算"""
         calc = ROICalculator()
         
-        catches = calc._estimate_catch(
+        catch = calc._estimate_catch(
             pfz_score=90,
             species="yellowfin_tuna",
             operation_days=5
         )
         
-        assert len(catches) > 0
-        assert catches[0].species == "yellowfin_tuna"
+        assert isinstance(catch, ExpectedCatch)
+        assert catch.species == "yellowfin_tuna"
         # 高 PFZ 分數應該有較高的預估漁獲
-        assert catches[0].estimated_kg > 200
+        assert catch.estimated_kg > 200
     
     def test_estimate_catch_low_pfz(self):
         """測試低 PFZ 分數的漁獲估算"""
         calc = ROICalculator()
         
-        catches = calc._estimate_catch(
+        catch = calc._estimate_catch(
             pfz_score=20,
             species="yellowfin_tuna",
             operation_days=5
         )
         
-        assert len(catches) > 0
         # 低 PFZ 分數應該有較低的預估漁獲
-        assert catches[0].estimated_kg < 400
+        assert catch.estimated_kg < 400
     
     def test_market_price_valid_species(self):
         """測試有效魚種的市場價格"""
@@ -285,6 +326,24 @@ class TestConvenienceFunction:
         
         assert isinstance(result, ROIResult)
         assert result.total_cost > 0
+    
+    def test_calculate_roi_is_cached_and_deterministic(self):
+        """測試預設路徑取期望值並快取，回傳值可安全修改"""
+        first = calculate_roi((22.6, 120.3), (24.0, 122.0), 75)
+        hits = _calculate_roi_cached.cache_info().hits
+        
+        first.details["vessel"] = "modified"
+        first.expected_catches.clear()
+        first.fuel_cost.fuel_cost_usd = 0.0
+        
+        second = calculate_roi([22.6, 120.3], [24.0, 122.0], 75.0)
+        
+        assert _calculate_roi_cached.cache_info().hits == hits + 1
+        assert second.details["vessel"] != "modified"
+        assert len(second.expected_catches) == 1
+        assert second.fuel_cost.fuel_cost_usd > 0
+        # 無隨機變異時：CPUE 80 × 5 天 × (0.5 + 0.75) × 10 USD/kg
+        assert first.expected_revenue == 5000.0
 
 
 class TestMarketPrices: